@@ -0,0 +1,192 @@
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from tasks.services import AssignmentInput, create_task_and_assign, task_cards_queryset, visible_reports_for
+from users.constants import (
+    ROLE_CHAT_MANAGER, ROLE_CURATOR_STANDARD, ROLE_LEADER, ROLE_MENTOR_STANDARD, ROLE_OKK,
+)
+from users.models import Curator
+from users.views import AdminUserListView
+
+# Роль -> метка пользователя, от лица которого гоняются сценарии
+REPRESENTATIVE_ROLES = {
+    'admin': ROLE_LEADER,
+    'okk': ROLE_OKK,
+    'mentor': ROLE_MENTOR_STANDARD,
+    'chat_manager': ROLE_CHAT_MANAGER,
+}
+
+
+class _Rollback(Exception):
+    pass
+
+
+@dataclass
+class BenchContext:
+    users: dict[str, Curator]
+    factory: APIRequestFactory = field(default_factory=APIRequestFactory)
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[BenchContext, str], object]
+    roles: tuple[str, ...] = ()
+
+
+CASES: list[Case] = []
+
+
+def case(name: str, roles: tuple[str, ...] = ()):
+    def decorator(fn):
+        CASES.append(Case(name=name, fn=fn, roles=roles))
+        return fn
+    return decorator
+
+
+def representative_users() -> dict[str, Curator]:
+    users = {}
+    for label, role_id in REPRESENTATIVE_ROLES.items():
+        # Самый «нагруженный» представитель роли: у наставника — больше всего подопечных
+        qs = Curator.objects.select_related('role', 'subject', 'department').filter(role_id=role_id, confirm=True)
+        if role_id == ROLE_MENTOR_STANDARD:
+            top = (Curator.objects
+                   .filter(mail_mg__in=qs.values('email'))
+                   .values('mail_mg')
+                   .annotate(n=Count('pk'))
+                   .order_by('-n', 'mail_mg')
+                   .values_list('mail_mg', flat=True)[:1])
+            qs = qs.filter(email__in=list(top))
+        user = qs.order_by('subject_id', 'email').first()
+        if user is not None:
+            users[label] = user
+    return users
+
+
+def _rolled_back(fn):
+    try:
+        with transaction.atomic():
+            fn()
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+@case('task_cards_queryset', roles=('admin', 'okk', 'mentor', 'chat_manager'))
+def bench_task_cards(ctx: BenchContext, role: str):
+    return list(task_cards_queryset(ctx.users[role]).order_by('-deadline', '-id_task'))
+
+
+@case('visible_reports_for', roles=('admin', 'mentor', 'chat_manager'))
+def bench_visible_reports(ctx: BenchContext, role: str):
+    return list(visible_reports_for(ctx.users[role]))
+
+
+@case('create_task_and_assign.group', roles=('admin',))
+def bench_create_group(ctx: BenchContext, role: str):
+    author = ctx.users[role]
+
+    def run():
+        create_task_and_assign(
+            author=author,
+            deadline=timezone.now() + timedelta(days=7),
+            name='bench', description='bench', report_template='bench',
+            recipients=AssignmentInput(subject_id=author.subject_id, department_ids=[1, 2, 3],
+                                       role_ids=[ROLE_CURATOR_STANDARD]),
+        )
+    _rolled_back(run)
+
+
+@case('create_task_and_assign.individual', roles=('mentor',))
+def bench_create_individual(ctx: BenchContext, role: str):
+    author = ctx.users[role]
+    emails = list(Curator.objects.filter(mail_mg=author.email).values_list('email', flat=True)[:10])
+
+    def run():
+        create_task_and_assign(
+            author=author,
+            deadline=timezone.now() + timedelta(days=7),
+            name='bench', description='bench', report_template='bench',
+            recipients=AssignmentInput(emails=emails),
+        )
+    _rolled_back(run)
+
+
+@case('admin_user_list', roles=('admin',))
+def bench_admin_list(ctx: BenchContext, role: str):
+    request = ctx.factory.get('/api/users/admin-list/')
+    force_authenticate(request, user=ctx.users[role])
+    response = AdminUserListView.as_view()(request)
+    response.render()
+    return response
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_case(fn: Callable[[], object], *, repeat: int, warmup: int = 1) -> dict:
+    for _ in range(warmup):
+        fn()
+
+    timings: list[float] = []
+    queries = 0
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries = len(captured.captured_queries)
+
+    return {
+        'runs': repeat,
+        'queries': queries,
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(_percentile(timings, 95), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+
+def run_suite(*, repeat: int, only: list[str] | None = None) -> dict:
+    ctx = BenchContext(users=representative_users())
+    results = {}
+    for c in CASES:
+        if only and c.name not in only:
+            continue
+        for role in c.roles:
+            if role not in ctx.users:
+                continue
+            results[f'{c.name}[{role}]'] = run_case(lambda: c.fn(ctx, role), repeat=repeat)
+    return results
+
+
+def compare(baseline: dict, current: dict, *, threshold: float) -> list[str]:
+    lines = []
+    for scale, cases in current.items():
+        for name, row in cases.items():
+            old = baseline.get(scale, {}).get(name)
+            if not old:
+                continue
+            ratio = row['median_ms'] / old['median_ms'] if old['median_ms'] else 1.0
+            marker = ''
+            if ratio > 1 + threshold:
+                marker = '  REGRESSION'
+            elif ratio < 1 - threshold:
+                marker = '  faster'
+            lines.append(
+                f'{scale:>8} {name:<45} {old["median_ms"]:>10.2f} -> {row["median_ms"]:>10.2f} ms'
+                f' (x{ratio:.2f}, queries {old["queries"]} -> {row["queries"]}){marker}'
+            )
+    return lines
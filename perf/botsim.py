@@ -0,0 +1,226 @@
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.db import close_old_connections
+
+from tasks.bot_client import BOT_BATCH_SEND_PATH, BOT_HEALTH_PATH, BOT_REMINDERS_PATH, BOT_SEND_PATH
+from tasks.models import Assignment
+from users.models import Curator
+
+STATS_PATH = '/stats'
+
+
+@dataclass
+class SimulatorConfig:
+    latency: str = 'lognormal'
+    latency_ms: float = 80.0
+    latency_sigma: float = 0.5
+    per_message_ms: float = 0.0
+    failure_rate: float = 0.0
+    partial_rate: float = 0.0
+    undelivered_share: float = 0.3
+    downtime: list[tuple[float, float]] = field(default_factory=list)
+    downtime_every: float = 0.0
+    downtime_for: float = 0.0
+    seed: int | None = None
+
+
+def parse_window(value: str) -> tuple[float, float]:
+    start, _, end = value.partition(':')
+    start_s, end_s = float(start), float(end)
+    if end_s <= start_s:
+        raise ValueError(f'Окно простоя должно быть вида START:END, END > START: {value}')
+    return start_s, end_s
+
+
+class BotSimulator:
+    def __init__(self, config: SimulatorConfig):
+        self.config = config
+        self.started = time.monotonic()
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'health': 0,
+            'assignments': 0,
+            'sent': 0,
+            'partial': 0,
+            'failed': 0,
+            'unavailable': 0,
+            'reminders': 0,
+            'reminders_failed': 0,
+        }
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self.stats[key] = self.stats.get(key, 0) + value
+
+    def sample_latency(self) -> float:
+        cfg = self.config
+        with self._lock:
+            if cfg.latency == 'fixed':
+                ms = cfg.latency_ms
+            elif cfg.latency == 'uniform':
+                ms = self._rng.uniform(0, 2 * cfg.latency_ms)
+            elif cfg.latency == 'exponential':
+                ms = self._rng.expovariate(1 / cfg.latency_ms) if cfg.latency_ms else 0.0
+            else:
+                # latency_ms — медиана, хвост задаётся sigma
+                ms = self._rng.lognormvariate(math.log(max(cfg.latency_ms, 0.001)), cfg.latency_sigma)
+        return ms / 1000
+
+    def is_down(self) -> bool:
+        elapsed = time.monotonic() - self.started
+        if any(start <= elapsed < end for start, end in self.config.downtime):
+            return True
+        every = self.config.downtime_every
+        return bool(every and (elapsed % every) >= every - self.config.downtime_for)
+
+    def recipients_tg(self, assignment_id: int, only_tg: list[int] | None = None) -> list[int] | None:
+        a = Assignment.objects.filter(pk=assignment_id).first()
+        if a is None:
+            return None
+        if a.curator_id:
+            qs = Curator.objects.filter(email=a.curator_id)
+        else:
+            qs = Curator.objects.filter(subject_id=a.subject_id, department_id=a.department_id, role_id=a.role_id)
+        qs = qs.exclude(id_tg__isnull=True)
+        if only_tg:
+            qs = qs.filter(id_tg__in=only_tg)
+        return list(qs.values_list('id_tg', flat=True))
+
+    def deliver(self, assignment_id: int, only_tg: list[int] | None = None) -> tuple[int, dict]:
+        recipients = self.recipients_tg(assignment_id, only_tg)
+        if recipients is None:
+            self._count(assignments=1, failed=1)
+            return 404, {'detail': 'assignment not found'}
+        if self.config.per_message_ms:
+            time.sleep(self.config.per_message_ms * len(recipients) / 1000)
+
+        if self._random() < self.config.failure_rate:
+            self._count(assignments=1, failed=1)
+            return 500, {'detail': 'simulated failure'}
+
+        errors: list[int] = []
+        if recipients and self._random() < self.config.partial_rate:
+            k = max(1, round(len(recipients) * self.config.undelivered_share))
+            with self._lock:
+                errors = self._rng.sample(recipients, k=min(k, len(recipients)))
+
+        self._count(assignments=1, **({'partial': 1} if errors else {'sent': 1}))
+        return 200, {'ok': True, 'errors': errors}
+
+    def remind(self, reminders: list[dict]) -> tuple[int, dict]:
+        if self.config.per_message_ms:
+            time.sleep(self.config.per_message_ms * len(reminders) / 1000)
+        if self._random() < self.config.failure_rate:
+            self._count(reminders_failed=len(reminders))
+            return 500, {'detail': 'simulated failure'}
+
+        errors = [
+            {'id_tg': r.get('id_tg'), 'id_task': r.get('id_task'), 'detail': 'undelivered (simulated)'}
+            for r in reminders if self._random() < self.config.partial_rate
+        ]
+        self._count(reminders=len(reminders) - len(errors), reminders_failed=len(errors))
+        return 200, {'ok': True, 'errors': errors}
+
+
+def make_handler(sim: BotSimulator):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status: int, payload: dict):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self) -> dict:
+            length = int(self.headers.get('Content-Length') or 0)
+            if not length:
+                return {}
+            try:
+                return json.loads(self.rfile.read(length))
+            except ValueError:
+                return {}
+
+        def _unavailable(self) -> bool:
+            if not sim.is_down():
+                return False
+            sim._count(unavailable=1)
+            self._reply(503, {'detail': 'bot is down (simulated)', 'bot_available': False})
+            return True
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            sim._count(requests=1)
+            if url.path == STATS_PATH:
+                with sim._lock:
+                    self._reply(200, dict(sim.stats))
+                return
+            if url.path != BOT_HEALTH_PATH:
+                self._reply(404, {'detail': 'not found'})
+                return
+            sim._count(health=1)
+            if self._unavailable():
+                return
+            self._reply(200, {'bot_available': True})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            sim._count(requests=1)
+            if url.path not in (BOT_SEND_PATH, BOT_BATCH_SEND_PATH, BOT_REMINDERS_PATH):
+                self._reply(404, {'detail': 'not found'})
+                return
+
+            body = self._read_json()
+            time.sleep(sim.sample_latency())
+            if self._unavailable():
+                return
+            if url.path == BOT_REMINDERS_PATH:
+                self._reply(*sim.remind(body.get('reminders') or []))
+                return
+
+            close_old_connections()
+            try:
+                if url.path == BOT_SEND_PATH:
+                    try:
+                        assignment_id = int(parse_qs(url.query).get('argument', [''])[0])
+                    except ValueError:
+                        self._reply(400, {'detail': 'argument must be an integer'})
+                        return
+                    self._reply(*sim.deliver(assignment_id, body.get('tg_ids')))
+                    return
+
+                results = []
+                only_tg = body.get('tg_ids') or {}
+                for raw_id in body.get('assignment_ids') or []:
+                    status, payload = sim.deliver(int(raw_id), only_tg.get(str(raw_id)))
+                    results.append({'assignment_id': int(raw_id), 'http_status': status, **payload})
+                self._reply(200, {'results': results})
+            finally:
+                close_old_connections()
+
+    return Handler
+
+
+def serve(sim: BotSimulator, host: str, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(sim))
+    server.daemon_threads = True
+    return server
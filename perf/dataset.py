@@ -0,0 +1,288 @@
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from catalogs.models import Department, Role, Status, Subject
+from tasks.constants import (
+    ASSIGNMENT_ERROR_STATUS, CANCELLED_STATUS, COMPLETED_LATE_STATUS,
+    COMPLETED_STATUS, NOT_COMPLETED_STATUS,
+)
+from tasks.models import Assignment, Report, Task
+from users.constants import (
+    ROLE_CHAT_MANAGER, ROLE_CURATOR_PERSONAL, ROLE_CURATOR_SENIOR,
+    ROLE_CURATOR_STANDARD, ROLE_LEADER, ROLE_MENTOR_PERSONAL, ROLE_MENTOR_STANDARD,
+    ROLE_OKK, ROLE_SENIOR_MANAGER,
+)
+from users.models import Curator
+from users.policies import ADMIN_ROLE_IDS, role_policy
+
+SCHEMA_SQL = Path(__file__).resolve().parent / 'sql' / 'schema.sql'
+
+BENCH_PASSWORD = 'bench-password'
+BENCH_EMAIL_DOMAIN = 'bench.local'
+
+ROLES = {
+    ROLE_CURATOR_STANDARD: 'Куратор Стандартов',
+    ROLE_CURATOR_SENIOR: 'Старший куратор',
+    ROLE_CURATOR_PERSONAL: 'Куратор Личных',
+    ROLE_CHAT_MANAGER: 'Менеджер чата',
+    ROLE_MENTOR_STANDARD: 'Наставник Стандартов',
+    ROLE_MENTOR_PERSONAL: 'Наставник Личных',
+    ROLE_LEADER: 'Руководитель предмета',
+    ROLE_OKK: 'Асессор ОКК',
+    ROLE_SENIOR_MANAGER: 'Старший наставник',
+}
+
+STATUSES = {
+    COMPLETED_STATUS: 'Выполнено',
+    COMPLETED_LATE_STATUS: 'Выполнено с опозданием',
+    NOT_COMPLETED_STATUS: 'Не выполнено',
+    CANCELLED_STATUS: 'Отменено',
+    ASSIGNMENT_ERROR_STATUS: 'Ошибка назначения',
+}
+
+SUBJECTS = ('Математика', 'Физика', 'Информатика', 'Русский язык',
+            'Обществознание', 'Химия', 'Биология', 'Английский язык')
+
+DEPARTMENTS = ('ЕГЭ', 'ОГЭ', '10 класс', 'Мастер', 'Флагман')
+
+# Доли ролей среди рядовых сотрудников; руководители и старшие наставники
+# добавляются отдельно — по одному на предмет.
+ROLE_WEIGHTS = {
+    ROLE_CURATOR_STANDARD: 60,
+    ROLE_CURATOR_SENIOR: 8,
+    ROLE_CURATOR_PERSONAL: 15,
+    ROLE_CHAT_MANAGER: 5,
+    ROLE_MENTOR_STANDARD: 6,
+    ROLE_MENTOR_PERSONAL: 4,
+    ROLE_OKK: 2,
+}
+
+# Крупные предметы и отделения заметно больше мелких
+SUBJECT_WEIGHTS = (30, 12, 14, 20, 12, 5, 4, 3)
+DEPARTMENT_WEIGHTS = (45, 30, 10, 10, 5)
+
+REPORT_STATUS_WEIGHTS = {
+    COMPLETED_STATUS: 55,
+    COMPLETED_LATE_STATUS: 10,
+    NOT_COMPLETED_STATUS: 30,
+    CANCELLED_STATUS: 3,
+    ASSIGNMENT_ERROR_STATUS: 2,
+}
+
+AUTHOR_ROLE_IDS = (ROLE_LEADER, ROLE_SENIOR_MANAGER, ROLE_MENTOR_STANDARD,
+                   ROLE_MENTOR_PERSONAL, ROLE_CHAT_MANAGER)
+
+DATASET_TABLES = ('assignment_delivery', 'report_archive', 'assignment_archive', 'task_archive',
+                  'report', 'assignment', 'task', 'curator', 'status', 'subject', 'department', 'role')
+
+
+@dataclass
+class DatasetSpec:
+    curators: int = 1000
+    tasks: int = 500
+    seed: int = 42
+    group_share: float = 0.6
+    history_days: int = 365
+
+
+@dataclass
+class DatasetStats:
+    curators: int = 0
+    tasks: int = 0
+    assignments: int = 0
+    reports: int = 0
+
+
+def is_local_database() -> bool:
+    host = connection.settings_dict.get('HOST') or ''
+    return host in ('', 'localhost', '127.0.0.1', '::1') or host.startswith('/')
+
+
+def create_schema():
+    with connection.cursor() as cursor:
+        cursor.execute(SCHEMA_SQL.read_text(encoding='utf-8'))
+
+
+def pending_migrations() -> list[str]:
+    # Индексы горячих путей (tasks 0002/0004/0006) — миграции; без них замеры не о том
+    from django.db.migrations.executor import MigrationExecutor
+
+    executor = MigrationExecutor(connection)
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return [f'{m.app_label}.{m.name}' for m, _ in plan]
+
+
+def reset_dataset():
+    with connection.cursor() as cursor:
+        cursor.execute(f'TRUNCATE {", ".join(DATASET_TABLES)} RESTART IDENTITY CASCADE;')
+
+
+def _weighted(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _seed_catalogs():
+    Role.objects.bulk_create([Role(id_role=k, role=v) for k, v in ROLES.items()])
+    Status.objects.bulk_create([Status(id_status=k, status=v) for k, v in STATUSES.items()])
+    Subject.objects.bulk_create(
+        [Subject(id_subject=i, subject=s) for i, s in enumerate(SUBJECTS, start=1)])
+    Department.objects.bulk_create(
+        [Department(id_department=i, department=d) for i, d in enumerate(DEPARTMENTS, start=1)])
+    with connection.cursor() as cursor:
+        for table, pk in (('role', 'id_role'), ('status', 'id_status'),
+                          ('subject', 'id_subject'), ('department', 'id_department')):
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', '{pk}'), (SELECT max({pk}) FROM {table}));")
+
+
+def _build_curators(spec: DatasetSpec, rng: random.Random) -> list[Curator]:
+    password = make_password(BENCH_PASSWORD)
+    subject_ids = list(range(1, len(SUBJECTS) + 1))
+    department_ids = list(range(1, len(DEPARTMENTS) + 1))
+
+    people: list[tuple[int, int, int]] = []
+    for subject_id in subject_ids:
+        people.append((subject_id, 1, ROLE_LEADER))
+        people.append((subject_id, 1, ROLE_SENIOR_MANAGER))
+    while len(people) < spec.curators:
+        people.append((
+            rng.choices(subject_ids, weights=SUBJECT_WEIGHTS)[0],
+            rng.choices(department_ids, weights=DEPARTMENT_WEIGHTS)[0],
+            _weighted(rng, ROLE_WEIGHTS),
+        ))
+
+    curators = []
+    for i, (subject_id, department_id, role_id) in enumerate(people[:spec.curators], start=1):
+        curators.append(Curator(
+            email=f'c{i:06d}@{BENCH_EMAIL_DOMAIN}',
+            id_tg=100_000_000 + i if rng.random() < 0.95 else None,
+            name=f'Куратор {i:06d}',
+            subject_id=subject_id,
+            department_id=department_id,
+            role_id=role_id,
+            password=password,
+            confirm=rng.random() < 0.97 or role_id in ADMIN_ROLE_IDS,
+        ))
+
+    # Наставники подбираются по тем же правилам, что и в AssignMentorView
+    mentors: dict[tuple[int, int, int], list[str]] = {}
+    for c in curators:
+        mentors.setdefault((c.subject_id, c.department_id, c.role_id), []).append(c.email)
+    for c in curators:
+        candidates = [
+            email
+            for mentor_role in role_policy(c.role_id).mentor_role_ids
+            for email in mentors.get((c.subject_id, c.department_id, mentor_role), ())
+        ]
+        if candidates and rng.random() < 0.9:
+            c.mail_mg = rng.choice(candidates)
+    return curators
+
+
+def _report_for(rng: random.Random, task: Task, curator_email: str, created) -> Report:
+    status_id = _weighted(rng, REPORT_STATUS_WEIGHTS)
+    timestamp_end = None
+    if status_id == COMPLETED_STATUS:
+        timestamp_end = created + (task.deadline - created) * rng.random()
+    elif status_id == COMPLETED_LATE_STATUS:
+        timestamp_end = task.deadline + timedelta(hours=rng.randint(1, 72))
+    return Report(
+        curator_id=curator_email,
+        task=task,
+        status_id=status_id,
+        timestamp_start=created,
+        timestamp_end=timestamp_end,
+        report_text='Готово' if timestamp_end else None,
+        report_url=f'https://example.org/r/{task.id_task}/{curator_email}' if timestamp_end else None,
+    )
+
+
+def _build_tasks(spec: DatasetSpec, rng: random.Random, curators: list[Curator]):
+    by_cell: dict[tuple[int, int, int], list[Curator]] = {}
+    by_mentor: dict[str, list[Curator]] = {}
+    by_subject_role: dict[tuple[int, int], list[Curator]] = {}
+    for c in curators:
+        by_cell.setdefault((c.subject_id, c.department_id, c.role_id), []).append(c)
+        by_subject_role.setdefault((c.subject_id, c.role_id), []).append(c)
+        if c.mail_mg:
+            by_mentor.setdefault(c.mail_mg, []).append(c)
+
+    authors = [c for c in curators if c.role_id in AUTHOR_ROLE_IDS and c.confirm]
+    counters: dict[str, int] = {}
+    now = timezone.now()
+
+    tasks: list[Task] = []
+    assignments: list[Assignment] = []
+    reports: list[Report] = []
+
+    for _ in range(spec.tasks):
+        author = rng.choice(authors)
+        prefix = SUBJECTS[author.subject_id - 1].lower()[:3]
+        counters[prefix] = counters.get(prefix, 0) + 1
+
+        created = now - timedelta(days=rng.uniform(0, spec.history_days))
+        task = Task(
+            id_task=f'{prefix}-{counters[prefix]}',
+            deadline=created + timedelta(days=rng.randint(1, 14)),
+            name=f'Задача {prefix}-{counters[prefix]}',
+            description='Синтетическая задача для нагрузочного стенда',
+            report='Ссылка на отчёт',
+            author=author,
+        )
+        tasks.append(task)
+
+        if author.role_id in (ROLE_LEADER, ROLE_SENIOR_MANAGER) and rng.random() < spec.group_share:
+            department_ids = rng.sample(range(1, len(DEPARTMENTS) + 1), k=rng.randint(1, 3))
+            role_ids = rng.sample((ROLE_CURATOR_STANDARD, ROLE_CURATOR_SENIOR, ROLE_CURATOR_PERSONAL),
+                                  k=rng.randint(1, 2))
+            for department_id in department_ids:
+                for role_id in role_ids:
+                    assignments.append(Assignment(
+                        task=task, subject_id=author.subject_id, department_id=department_id,
+                        role_id=role_id, curator=None, author=author))
+                    for c in by_cell.get((author.subject_id, department_id, role_id), ()):
+                        reports.append(_report_for(rng, task, c.email, created))
+            continue
+
+        if author.role_id in (ROLE_MENTOR_STANDARD, ROLE_MENTOR_PERSONAL):
+            pool = by_mentor.get(author.email, [])
+        elif author.role_id == ROLE_CHAT_MANAGER:
+            pool = by_subject_role.get((author.subject_id, ROLE_CURATOR_STANDARD), [])
+        else:
+            pool = [c for key, cs in by_subject_role.items() if key[0] == author.subject_id for c in cs]
+        if not pool:
+            pool = by_subject_role.get((author.subject_id, ROLE_CURATOR_STANDARD), []) or curators
+
+        for c in rng.sample(pool, k=min(len(pool), rng.randint(1, 10))):
+            assignments.append(Assignment(
+                task=task, subject_id=c.subject_id, department_id=c.department_id,
+                role_id=c.role_id, curator=c, author=author))
+            reports.append(_report_for(rng, task, c.email, created))
+
+    return tasks, assignments, reports
+
+
+def seed_dataset(spec: DatasetSpec, *, batch_size: int = 5000) -> DatasetStats:
+    rng = random.Random(spec.seed)
+    with transaction.atomic():
+        _seed_catalogs()
+        curators = _build_curators(spec, rng)
+        Curator.objects.bulk_create(curators, batch_size=batch_size)
+        tasks, assignments, reports = _build_tasks(spec, rng, curators)
+        Task.objects.bulk_create(tasks, batch_size=batch_size)
+        Assignment.objects.bulk_create(assignments, batch_size=batch_size)
+        Report.objects.bulk_create(reports, batch_size=batch_size)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'ANALYZE {", ".join(DATASET_TABLES)};')
+
+    return DatasetStats(
+        curators=len(curators), tasks=len(tasks),
+        assignments=len(assignments), reports=len(reports),
+    )
@@ -0,0 +1,136 @@
+import json
+from dataclasses import dataclass
+
+from django.db.models import QuerySet
+
+from perf.benchmarks import representative_users
+from tasks.constants import EXCLUDE_FROM_TOTAL_STATUSES
+from tasks.services import (
+    AssignmentInput, build_targets_qs, recipients_typeahead, task_cards_queryset, visible_reports_for
+)
+from users.models import Curator
+
+INDEX_SCANS = {'Index Scan', 'Index Only Scan', 'Bitmap Index Scan', 'Bitmap Heap Scan'}
+
+
+def hot_querysets(users: dict[str, Curator]) -> dict[str, tuple[str, QuerySet]]:
+    plans: dict[str, tuple[str, QuerySet]] = {}
+    for role, user in users.items():
+        plans[f'task_cards_queryset[{role}]'] = (
+            user.email, task_cards_queryset(user).order_by('-deadline', '-id_task'))
+        plans[f'visible_reports_for[{role}]'] = (user.email, visible_reports_for(user))
+        plans[f'build_targets_qs[{role}]'] = (
+            user.email,
+            build_targets_qs(user, AssignmentInput(subject_id=user.subject_id)).order_by('name'))
+        plans[f'recipients_typeahead[{role}]'] = (
+            user.email,
+            recipients_typeahead(user, AssignmentInput(), q=user.name[:3], limit=21))
+
+        task_id = visible_reports_for(user).values_list('task_id', flat=True).order_by('task_id').first()
+        if task_id:
+            plans[f'task_detail[{role}]'] = (
+                user.email,
+                visible_reports_for(user).filter(task_id=task_id).exclude(status_id__in=EXCLUDE_FROM_TOTAL_STATUSES))
+
+    admin = users.get('admin')
+    if admin is not None:
+        plans['admin_user_list[admin]'] = (
+            admin.email,
+            Curator.objects.select_related('subject', 'department', 'role')
+            .filter(subject_id=admin.subject_id).order_by('confirm', 'name'))
+    return plans
+
+
+def explain(qs: QuerySet) -> dict:
+    raw = qs.explain(format='json', analyze=True, buffers=True)
+    return json.loads(raw)[0]
+
+
+def flatten(plan: dict) -> dict[str, dict]:
+    nodes: dict[str, dict] = {}
+
+    def walk(node: dict, path: str):
+        loops = node.get('Actual Loops', 1) or 1
+        info = {
+            'type': node['Node Type'],
+            'total_cost': node.get('Total Cost', 0.0),
+            'plan_rows': node.get('Plan Rows', 0),
+            'actual_time_ms': round(node.get('Actual Total Time', 0.0) * loops, 3),
+            'actual_rows': node.get('Actual Rows', 0) * loops,
+            'relation': node.get('Relation Name'),
+            'index': node.get('Index Name'),
+        }
+        # Сканы сопоставляются по алиасу таблицы, остальные узлы — по позиции в дереве
+        alias = node.get('Alias')
+        key = f'scan:{alias}' if alias and info['relation'] else path
+        if key in nodes:
+            key = f'{key}@{path}'
+        nodes[key] = info
+        for i, child in enumerate(node.get('Plans', ())):
+            walk(child, f'{path}.{i}')
+
+    walk(plan['Plan'], '0')
+    return nodes
+
+
+def summarize(plan: dict) -> dict:
+    root = plan['Plan']
+    return {
+        'total_cost': root.get('Total Cost', 0.0),
+        'execution_ms': round(plan.get('Execution Time', 0.0), 3),
+        'planning_ms': round(plan.get('Planning Time', 0.0), 3),
+        'shared_hit': root.get('Shared Hit Blocks', 0),
+        'shared_read': root.get('Shared Read Blocks', 0),
+        'nodes': flatten(plan),
+    }
+
+
+@dataclass
+class Thresholds:
+    cost_ratio: float = 1.5
+    time_ratio: float = 2.0
+    min_time_ms: float = 5.0
+
+
+def _is_index_scan(node_type: str) -> bool:
+    return node_type in INDEX_SCANS
+
+
+def compare_plans(name: str, old: dict, new: dict, th: Thresholds) -> list[str]:
+    problems = []
+
+    if old['total_cost'] and new['total_cost'] / old['total_cost'] > th.cost_ratio:
+        problems.append(f'{name}: оценка стоимости {old["total_cost"]:.0f} -> {new["total_cost"]:.0f}')
+    if (new['execution_ms'] >= th.min_time_ms and old['execution_ms']
+            and new['execution_ms'] / old['execution_ms'] > th.time_ratio):
+        problems.append(f'{name}: время выполнения {old["execution_ms"]:.1f} -> {new["execution_ms"]:.1f} ms')
+
+    for key, node in new['nodes'].items():
+        before = old['nodes'].get(key)
+        if before is None:
+            continue
+        where = f'{name} [{key}]'
+        if before['type'] != node['type']:
+            if _is_index_scan(before['type']) and node['type'] == 'Seq Scan':
+                problems.append(f'{where}: {before["type"]} ({before["index"]}) -> Seq Scan по {node["relation"]}')
+            elif node['type'] == 'Nested Loop' and before['type'] in ('Hash Join', 'Merge Join'):
+                problems.append(f'{where}: {before["type"]} -> Nested Loop')
+            elif before['type'] != 'Seq Scan' or not _is_index_scan(node['type']):
+                problems.append(f'{where}: {before["type"]} -> {node["type"]}')
+            continue
+        if before['total_cost'] and node['total_cost'] / before['total_cost'] > th.cost_ratio:
+            problems.append(f'{where} {node["type"]}: стоимость {before["total_cost"]:.0f} -> {node["total_cost"]:.0f}')
+        if (node['actual_time_ms'] >= th.min_time_ms and before['actual_time_ms']
+                and node['actual_time_ms'] / before['actual_time_ms'] > th.time_ratio):
+            problems.append(f'{where} {node["type"]}: время '
+                            f'{before["actual_time_ms"]:.1f} -> {node["actual_time_ms"]:.1f} ms')
+    return problems
+
+
+def collect(only: list[str] | None = None) -> dict[str, dict]:
+    result = {}
+    for name, (email, qs) in hot_querysets(representative_users()).items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        result[name] = {'user': email, **summarize(explain(qs))}
+    return result
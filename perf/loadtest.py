@@ -0,0 +1,217 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+import requests
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.constants import (
+    ROLE_CHAT_MANAGER, ROLE_CURATOR_STANDARD, ROLE_LEADER, ROLE_MENTOR_PERSONAL,
+    ROLE_MENTOR_STANDARD, ROLE_SENIOR_MANAGER,
+)
+from users.models import Curator
+
+PERSONAS = {
+    'admin': (ROLE_LEADER, ROLE_SENIOR_MANAGER),
+    'mentor': (ROLE_MENTOR_STANDARD, ROLE_MENTOR_PERSONAL),
+    'chat_manager': (ROLE_CHAT_MANAGER,),
+}
+
+# Доля действий каждой персоны: список задач открывают намного чаще, чем создают
+ACTION_WEIGHTS = {
+    'tasks.list': 70,
+    'tasks.recipients': 25,
+    'tasks.create': 5,
+}
+
+
+@dataclass
+class VirtualUser:
+    persona: str
+    user: Curator
+    token: str
+    mentee_emails: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    status: int | None
+    latency_ms: float
+    error: str | None = None
+    # time.monotonic() в момент отправки — чтобы отделить запросы периода разгона
+    started_at: float = 0.0
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in PERSONAS:
+            raise ValueError(f'Неизвестная персона: {name}')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def build_virtual_users(mix: dict[str, float], per_persona: int, rng: random.Random) -> dict[str, list[VirtualUser]]:
+    pools: dict[str, list[VirtualUser]] = {}
+    for persona in mix:
+        users = list(
+            Curator.objects
+            .select_related('role')
+            .filter(role_id__in=PERSONAS[persona], confirm=True)
+            .order_by('email')
+        )
+        if not users:
+            continue
+        pool = []
+        for user in rng.sample(users, k=min(per_persona, len(users))):
+            mentees = []
+            if persona == 'mentor':
+                mentees = list(Curator.objects.filter(mail_mg=user.email).values_list('email', flat=True)[:20])
+            pool.append(VirtualUser(
+                persona=persona,
+                user=user,
+                token=str(RefreshToken.for_user(user).access_token),
+                mentee_emails=mentees,
+            ))
+        pools[persona] = pool
+    return pools
+
+
+def _create_payload(vu: VirtualUser, rng: random.Random) -> dict:
+    payload = {
+        'deadline': (timezone.now() + timedelta(days=7)).isoformat(),
+        'name': f'loadtest {rng.randint(0, 10 ** 9)}',
+        'description': 'Создано нагрузочным тестом',
+        'report': 'Ссылка на отчёт',
+    }
+    if vu.persona == 'mentor' and vu.mentee_emails:
+        payload['emails'] = rng.sample(vu.mentee_emails, k=min(len(vu.mentee_emails), rng.randint(1, 3)))
+    else:
+        payload.update({
+            'subject_id': vu.user.subject_id,
+            'department_ids': [vu.user.department_id],
+            'role_ids': [ROLE_CURATOR_STANDARD],
+        })
+    return payload
+
+
+class LoadTest:
+    def __init__(self, *, base_url: str, pools: dict[str, list[VirtualUser]], mix: dict[str, float],
+                 concurrency: int, duration: float, ramp_up: float, think_ms: float,
+                 actions: dict[str, float], timeout: float, seed: int):
+        self.base_url = base_url.rstrip('/')
+        self.pools = pools
+        self.mix = {k: v for k, v in mix.items() if k in pools}
+        self.concurrency = concurrency
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.think_ms = think_ms
+        self.actions = actions
+        self.timeout = timeout
+        self.seed = seed
+        self.samples: list[Sample] = []
+        # Окно после разгона (monotonic): по нему считается установившийся req/s
+        self.steady_window: tuple[float, float] = (0.0, 0.0)
+        self._lock = threading.Lock()
+
+    def _request(self, session: requests.Session, vu: VirtualUser, action: str, rng: random.Random) -> Sample:
+        headers = {'Authorization': f'Bearer {vu.token}'}
+        if action == 'tasks.list':
+            method, path, kwargs = 'GET', '/api/tasks/', {}
+        elif action == 'tasks.recipients':
+            params = {}
+            if vu.persona != 'mentor':
+                params = {'subject_id': vu.user.subject_id, 'department_ids': vu.user.department_id}
+            method, path, kwargs = 'GET', '/api/tasks/recipients/', {'params': params}
+        else:
+            method, path, kwargs = 'POST', '/api/tasks/', {'json': _create_payload(vu, rng)}
+
+        started_at = time.monotonic()
+        start = time.perf_counter()
+        try:
+            resp = session.request(method, f'{self.base_url}{path}', headers=headers,
+                                   timeout=self.timeout, **kwargs)
+            resp.content
+            return Sample(action, resp.status_code, (time.perf_counter() - start) * 1000,
+                          started_at=started_at)
+        except requests.RequestException as e:
+            return Sample(action, None, (time.perf_counter() - start) * 1000, error=type(e).__name__,
+                          started_at=started_at)
+
+    def _worker(self, index: int, deadline: float):
+        rng = random.Random(self.seed + index)
+        time.sleep(self.ramp_up * index / max(self.concurrency, 1))
+        persona = rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        vu = rng.choice(self.pools[persona])
+        session = requests.Session()
+        local: list[Sample] = []
+
+        while time.monotonic() < deadline:
+            action = rng.choices(list(self.actions), weights=list(self.actions.values()))[0]
+            local.append(self._request(session, vu, action, rng))
+            if self.think_ms:
+                time.sleep(rng.expovariate(1000 / self.think_ms))
+
+        with self._lock:
+            self.samples.extend(local)
+
+    def run(self) -> float:
+        started = time.monotonic()
+        deadline = started + self.ramp_up + self.duration
+        threads = [threading.Thread(target=self._worker, args=(i, deadline), daemon=True)
+                   for i in range(self.concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        finished = time.monotonic()
+        self.steady_window = (started + self.ramp_up, finished)
+        return finished - started
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples: list[Sample], elapsed: float,
+              steady_window: tuple[float, float] | None = None) -> dict[str, dict]:
+    # throughput_rps — за всё время вместе с разгоном, steady_rps — только по запросам,
+    # отправленным после разгона, на длину этого окна
+    steady_from, steady_to = steady_window or (0.0, 0.0)
+    steady_elapsed = steady_to - steady_from
+    by_endpoint: dict[str, list[Sample]] = {}
+    for s in samples:
+        by_endpoint.setdefault(s.endpoint, []).append(s)
+
+    summary = {}
+    for endpoint, rows in sorted(by_endpoint.items()):
+        latencies = sorted(r.latency_ms for r in rows)
+        statuses: dict[str, int] = {}
+        errors = 0
+        for r in rows:
+            key = str(r.status) if r.status is not None else (r.error or 'error')
+            statuses[key] = statuses.get(key, 0) + 1
+            if r.status is None or r.status >= 400:
+                errors += 1
+        summary[endpoint] = {
+            'requests': len(rows),
+            'throughput_rps': round(len(rows) / elapsed, 2) if elapsed else 0.0,
+            'steady_rps': round(sum(1 for r in rows if r.started_at >= steady_from) / steady_elapsed, 2)
+            if steady_elapsed > 0 else 0.0,
+            'error_rate': round(errors / len(rows), 4),
+            'p50_ms': round(_percentile(latencies, 50), 2),
+            'p95_ms': round(_percentile(latencies, 95), 2),
+            'p99_ms': round(_percentile(latencies, 99), 2),
+            'max_ms': round(latencies[-1], 2),
+            'statuses': statuses,
+        }
+    return summary
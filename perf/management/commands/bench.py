@@ -0,0 +1,112 @@
+import json
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from perf.benchmarks import compare, representative_users, run_suite
+from perf.dataset import (
+    DatasetSpec, create_schema, is_local_database, pending_migrations, reset_dataset, seed_dataset,
+)
+from tasks.models import Task
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Замеряет горячие запросы на синтетических данных нескольких масштабов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='1000,5000,20000',
+                            help='Число кураторов для каждого прогона, через запятую')
+        parser.add_argument('--tasks-per-curator', type=float, default=0.5)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--case', action='append', dest='cases',
+                            help='Запустить только указанный сценарий (можно несколько раз)')
+        parser.add_argument('--no-reseed', action='store_true',
+                            help='Не пересоздавать данные, а мерить текущую БД (один прогон)')
+        parser.add_argument('--output', default=None,
+                            help='Куда сохранить JSON (по умолчанию bench-results/<время>.json)')
+        parser.add_argument('--compare', default=None, help='JSON прошлого прогона для сравнения')
+        parser.add_argument('--threshold', type=float, default=0.15,
+                            help='Относительное изменение медианы, считающееся значимым')
+        parser.add_argument('--allow-remote', action='store_true')
+
+    def handle(self, *args, **opts):
+        if not is_local_database() and not opts['allow_remote']:
+            raise CommandError('bench пересоздаёт данные; для нелокальной БД нужен --allow-remote')
+
+        results: dict[str, dict] = {}
+        datasets: dict[str, dict] = {}
+
+        if opts['no_reseed']:
+            # Текущую БД не трогаем: без миграций или данных лучше не мерить вовсе
+            pending = pending_migrations()
+            if pending:
+                raise CommandError(
+                    f'Не применены миграции: {", ".join(pending)}. '
+                    f'Запустите python manage.py migrate или bench без --no-reseed'
+                )
+            if not representative_users() or not Task.objects.exists():
+                raise CommandError('В БД нет синтетических данных; запустите seed_dataset '
+                                   'или bench без --no-reseed')
+            self.stdout.write('scale=current')
+            results['current'] = run_suite(repeat=opts['repeat'], only=opts['cases'])
+        else:
+            create_schema()
+            call_command('migrate', verbosity=0)
+            for scale in [int(s) for s in opts['scales'].split(',') if s.strip()]:
+                reset_dataset()
+                stats = seed_dataset(DatasetSpec(
+                    curators=scale,
+                    tasks=max(1, int(scale * opts['tasks_per_curator'])),
+                    seed=opts['seed'],
+                ))
+                datasets[str(scale)] = stats.__dict__
+                self.stdout.write(f'scale={scale} {stats.__dict__}')
+                results[str(scale)] = run_suite(repeat=opts['repeat'], only=opts['cases'])
+
+        for scale, cases in results.items():
+            for name, row in cases.items():
+                self.stdout.write(
+                    f'{scale:>8} {name:<45} median={row["median_ms"]:>10.2f} ms '
+                    f'p95={row["p95_ms"]:>10.2f} ms queries={row["queries"]}'
+                )
+
+        with connection.cursor() as cursor:
+            cursor.execute('SHOW server_version;')
+            server_version = cursor.fetchone()[0]
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'git_revision': _git_revision(),
+                'postgres': server_version,
+                'repeat': opts['repeat'],
+                'seed': opts['seed'],
+                'datasets': datasets,
+            },
+            'results': results,
+        }
+
+        output = Path(opts['output'] or Path('bench-results') / f'{timezone.now():%Y%m%d-%H%M%S}.json')
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(f'Результаты сохранены в {output}'))
+
+        if opts['compare']:
+            baseline = json.loads(Path(opts['compare']).read_text(encoding='utf-8'))
+            for line in compare(baseline['results'], results, threshold=opts['threshold']):
+                self.stdout.write(line)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from perf.serialization import run
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает DRF-сериализаторы списков с быстрым путём (values() + orjson): '
+            'совпадение JSON и медианное время')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **opts):
+        results = run(opts['repeat'])
+        self.stdout.write(f'{"shape":<28} {"rows":>7} {"drf ms":>10} {"fast ms":>10} {"x":>6}  parity')
+        for r in results:
+            self.stdout.write(
+                f'{r["name"]:<28} {r["rows"]:>7} {r["drf_ms"]:>10.2f} {r["fast_ms"]:>10.2f} '
+                f'{r["speedup"] or 0:>6.2f}  {"ok" if r["parity"] is None else r["parity"]}'
+            )
+
+        broken = [r['name'] for r in results if r['parity'] is not None]
+        if broken:
+            raise CommandError(f'JSON быстрого пути расходится с DRF: {", ".join(broken)}')
@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from perf.explain import Thresholds, collect, compare_plans
+
+DEFAULT_BASELINE = Path('perf') / 'baselines' / 'explain.json'
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN (ANALYZE, BUFFERS) горячих запросов и сравнение с сохранёнными планами'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+        parser.add_argument('--update', action='store_true', help='Перезаписать базовые планы текущими')
+        parser.add_argument('--only', action='append', help='Префикс имени плана (можно несколько раз)')
+        parser.add_argument('--cost-ratio', type=float, default=Thresholds.cost_ratio)
+        parser.add_argument('--time-ratio', type=float, default=Thresholds.time_ratio)
+        parser.add_argument('--min-time-ms', type=float, default=Thresholds.min_time_ms,
+                            help='Не сравнивать время узлов быстрее этого порога')
+        parser.add_argument('--dump', default=None, help='Сохранить текущие планы в отдельный файл')
+
+    def handle(self, *args, **opts):
+        current = collect(opts['only'])
+        if not current:
+            raise CommandError('Нет ни одного плана: запустите seed_dataset')
+
+        baseline_path = Path(opts['baseline'])
+        if opts['dump']:
+            Path(opts['dump']).write_text(json.dumps(current, ensure_ascii=False, indent=2), encoding='utf-8')
+
+        if opts['update'] or not baseline_path.exists():
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            merged = current
+            if opts['only'] and baseline_path.exists():
+                merged = {**json.loads(baseline_path.read_text(encoding='utf-8')), **current}
+            baseline_path.write_text(json.dumps(merged, ensure_ascii=False, indent=2), encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f'Базовые планы ({len(current)}) сохранены в {baseline_path}'))
+            return
+
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+        thresholds = Thresholds(cost_ratio=opts['cost_ratio'], time_ratio=opts['time_ratio'],
+                                min_time_ms=opts['min_time_ms'])
+
+        problems: list[str] = []
+        for name, plan in current.items():
+            old = baseline.get(name)
+            if old is None:
+                self.stdout.write(f'{name}: нет базового плана, пропущен')
+                continue
+            if old.get('user') != plan['user']:
+                self.stdout.write(f'{name}: базовый план снят для {old.get("user")}, сейчас {plan["user"]}')
+            found = compare_plans(name, old, plan, thresholds)
+            problems.extend(found)
+            status = self.style.ERROR('REGRESSION') if found else self.style.SUCCESS('ok')
+            self.stdout.write(f'{status:<10} {name}: cost {old["total_cost"]:.0f} -> {plan["total_cost"]:.0f}, '
+                              f'time {old["execution_ms"]:.1f} -> {plan["execution_ms"]:.1f} ms')
+
+        for line in problems:
+            self.stdout.write(self.style.ERROR(f'  {line}'))
+        if problems:
+            raise CommandError(f'Регрессий в планах: {len(problems)}')
@@ -0,0 +1,73 @@
+import json
+import random
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from perf.loadtest import ACTION_WEIGHTS, LoadTest, build_virtual_users, parse_mix, summarize
+
+
+class Command(BaseCommand):
+    help = 'HTTP-нагрузка на запущенный сервер от имени пользователей из синтетических данных'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--duration', type=float, default=30.0, help='Секунды после разгона')
+        parser.add_argument('--ramp-up', type=float, default=5.0)
+        parser.add_argument('--think-ms', type=float, default=200.0,
+                            help='Средняя пауза между запросами одного пользователя')
+        parser.add_argument('--mix', default='admin=2,mentor=5,chat_manager=3',
+                            help='Доли персон: admin, mentor, chat_manager')
+        parser.add_argument('--users-per-persona', type=int, default=20)
+        parser.add_argument('--create-share', type=float, default=None,
+                            help='Доля запросов на создание задач (по умолчанию 5%%)')
+        parser.add_argument('--timeout', type=float, default=30.0)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', default=None, help='Сохранить сводку в JSON')
+
+    def handle(self, *args, **opts):
+        try:
+            mix = parse_mix(opts['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        actions = dict(ACTION_WEIGHTS)
+        if opts['create_share'] is not None:
+            rest = sum(v for k, v in actions.items() if k != 'tasks.create')
+            share = min(max(opts['create_share'], 0.0), 0.99)
+            actions['tasks.create'] = rest * share / (1 - share)
+
+        pools = build_virtual_users(mix, opts['users_per_persona'], random.Random(opts['seed']))
+        if not pools:
+            raise CommandError('Нет подтверждённых пользователей нужных ролей; запустите seed_dataset')
+
+        test = LoadTest(
+            base_url=opts['base_url'], pools=pools, mix=mix,
+            concurrency=opts['concurrency'], duration=opts['duration'],
+            ramp_up=opts['ramp_up'], think_ms=opts['think_ms'],
+            actions=actions, timeout=opts['timeout'], seed=opts['seed'],
+        )
+        elapsed = test.run()
+        summary = summarize(test.samples, elapsed, test.steady_window)
+
+        # rps — за всё время с разгоном, steady — после разгона
+        self.stdout.write(f'{"endpoint":<18} {"req":>7} {"rps":>8} {"steady":>8} {"err%":>6} '
+                          f'{"p50":>9} {"p95":>9} {"p99":>9}  statuses')
+        for endpoint, row in summary.items():
+            self.stdout.write(
+                f'{endpoint:<18} {row["requests"]:>7} {row["throughput_rps"]:>8.1f} '
+                f'{row["steady_rps"]:>8.1f} {row["error_rate"] * 100:>6.1f} {row["p50_ms"]:>9.1f} {row["p95_ms"]:>9.1f} '
+                f'{row["p99_ms"]:>9.1f}  {row["statuses"]}'
+            )
+
+        if opts['output']:
+            report = {
+                'config': {k: opts[k] for k in ('base_url', 'concurrency', 'duration', 'ramp_up',
+                                                'think_ms', 'mix', 'users_per_persona', 'seed')},
+                'elapsed_s': round(elapsed, 2),
+                'steady_s': round(test.steady_window[1] - test.steady_window[0], 2),
+                'endpoints': summary,
+            }
+            Path(opts['output']).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f'Сводка сохранена в {opts["output"]}'))
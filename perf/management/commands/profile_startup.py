@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from perf.startup import run
+
+
+class Command(BaseCommand):
+    help = ('Холодный старт воркера по профилям настроек: время импорта по модулям, '
+            'django.setup/urlconf, время до первого ответа uvicorn и стоимость запроса через middleware')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--settings-modules', default='umtracker.settings,umtracker.settings_production',
+                            help='Профили через запятую')
+        parser.add_argument('--path', default='/api/tasks/',
+                            help='Запрос без токена: 401 проходит весь стек middleware и DRF без БД')
+        parser.add_argument('--requests', type=int, default=3000)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument('--output', default=None, help='Сохранить результат в JSON')
+
+    def handle(self, *args, **opts):
+        modules = [m.strip() for m in opts['settings_modules'].split(',') if m.strip()]
+        try:
+            results = run(modules, path=opts['path'], requests=opts['requests'], repeat=opts['repeat'])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        for module, r in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(module))
+            self.stdout.write(
+                f'  импорт: {r["import_us"] / 1000:.1f} ms, модулей {r["modules"]}; '
+                f'setup {r["setup"] * 1000:.1f} ms, urlconf {r["urlconf"] * 1000:.1f} ms, '
+                f'asgi {r["asgi"] * 1000:.1f} ms'
+            )
+            self.stdout.write(
+                f'  до первого ответа uvicorn: {r["ttfr"] * 1000:.0f} ms; первый запрос '
+                f'{r["first_request"] * 1000:.2f} ms, дальше {r["request"] * 1e6:.0f} us'
+            )
+            packages = list(r['packages'].items())[:opts['top']]
+            self.stdout.write('  пакеты: ' + ', '.join(f'{name} {us / 1000:.1f}' for name, us in packages))
+            for name, self_us, cumulative_us in r['top_modules'][:opts['top']]:
+                self.stdout.write(f'    {self_us / 1000:>7.1f} ms  {name}')
+
+        if len(results) > 1:
+            (base_name, base), *others = results.items()
+            for name, r in others:
+                self.stdout.write(
+                    f'{name} против {base_name}: импорт {(r["import_us"] - base["import_us"]) / 1000:+.1f} ms, '
+                    f'до первого ответа {(r["ttfr"] - base["ttfr"]) * 1000:+.0f} ms, '
+                    f'запрос {(r["request"] - base["request"]) * 1e6:+.0f} us'
+                )
+
+        if opts['output']:
+            Path(opts['output']).write_text(json.dumps(results, ensure_ascii=False, indent=2))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from perf.botsim import BotSimulator, SimulatorConfig, parse_window, serve
+
+
+class Command(BaseCommand):
+    help = 'Локальный симулятор Telegram-бота (/health, /send-assignment, /send-assignments)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8081)
+        parser.add_argument('--latency', choices=('fixed', 'uniform', 'exponential', 'lognormal'),
+                            default='lognormal')
+        parser.add_argument('--latency-ms', type=float, default=80.0,
+                            help='Медиана (lognormal) или среднее задержки ответа')
+        parser.add_argument('--latency-sigma', type=float, default=0.5)
+        parser.add_argument('--per-message-ms', type=float, default=0.0,
+                            help='Дополнительная задержка на каждого получателя')
+        parser.add_argument('--failure-rate', type=float, default=0.0)
+        parser.add_argument('--partial-rate', type=float, default=0.0,
+                            help='Доля рассылок, где часть получателей попадёт в errors')
+        parser.add_argument('--undelivered-share', type=float, default=0.3)
+        parser.add_argument('--downtime', action='append', default=[], metavar='START:END',
+                            help='Окно простоя в секундах от запуска (можно несколько раз)')
+        parser.add_argument('--downtime-every', type=float, default=0.0,
+                            help='Периодический простой: длина периода в секундах')
+        parser.add_argument('--downtime-for', type=float, default=0.0)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **opts):
+        try:
+            downtime = [parse_window(w) for w in opts['downtime']]
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        sim = BotSimulator(SimulatorConfig(
+            latency=opts['latency'],
+            latency_ms=opts['latency_ms'],
+            latency_sigma=opts['latency_sigma'],
+            per_message_ms=opts['per_message_ms'],
+            failure_rate=opts['failure_rate'],
+            partial_rate=opts['partial_rate'],
+            undelivered_share=opts['undelivered_share'],
+            downtime=downtime,
+            downtime_every=opts['downtime_every'],
+            downtime_for=opts['downtime_for'],
+            seed=opts['seed'],
+        ))
+        server = serve(sim, opts['host'], opts['port'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Симулятор бота слушает http://{opts["host"]}:{opts["port"]} '
+            f'(TASK_BOT_BASE_URL для бэкенда)'
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f'stats: {sim.stats}')
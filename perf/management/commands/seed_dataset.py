@@ -0,0 +1,43 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from perf.dataset import (
+    DatasetSpec, create_schema, is_local_database, reset_dataset, seed_dataset,
+)
+
+
+class Command(BaseCommand):
+    help = 'Создаёт схему в локальной Postgres и заполняет её синтетическими данными'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--curators', type=int, default=1000)
+        parser.add_argument('--tasks', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--group-share', type=float, default=0.6,
+                            help='Доля групповых задач среди задач руководителей')
+        parser.add_argument('--history-days', type=int, default=365)
+        parser.add_argument('--no-reset', action='store_true',
+                            help='Не очищать таблицы перед заполнением')
+        parser.add_argument('--allow-remote', action='store_true',
+                            help='Разрешить запуск против нелокальной БД')
+
+    def handle(self, *args, **opts):
+        if not is_local_database() and not opts['allow_remote']:
+            raise CommandError('seed_dataset очищает таблицы; для нелокальной БД нужен --allow-remote')
+
+        create_schema()
+        call_command('migrate', verbosity=0)
+        if not opts['no_reset']:
+            reset_dataset()
+
+        stats = seed_dataset(DatasetSpec(
+            curators=opts['curators'],
+            tasks=opts['tasks'],
+            seed=opts['seed'],
+            group_share=opts['group_share'],
+            history_days=opts['history_days'],
+        ))
+        self.stdout.write(self.style.SUCCESS(
+            f'curators={stats.curators} tasks={stats.tasks} '
+            f'assignments={stats.assignments} reports={stats.reports}'
+        ))
@@ -0,0 +1,119 @@
+import json
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from django.db.models import Count
+from rest_framework.renderers import JSONRenderer
+
+from perf.benchmarks import representative_users
+from tasks.constants import EXCLUDE_FROM_TOTAL_STATUSES
+from tasks.fast_serializers import recipient_curators, task_cards, task_details
+from tasks.serializers import RecipientCuratorSerializer, TaskCardSerializer, TaskDetailSerializer
+from tasks.services import AssignmentInput, build_targets_qs, task_cards_queryset, visible_reports_for
+from umtracker.renderers import ORJSONRenderer
+from users.fast_serializers import admin_users
+from users.models import Curator
+from users.serializers import AdminUserSerializer
+
+
+@dataclass
+class Shape:
+    name: str
+    rows: int
+    drf: Callable[[], bytes]
+    fast: Callable[[], bytes]
+
+
+def _drf(serializer_class, qs_factory) -> Callable[[], bytes]:
+    return lambda: JSONRenderer().render(serializer_class(qs_factory(), many=True).data)
+
+
+def _fast(mapper, qs_factory) -> Callable[[], bytes]:
+    return lambda: ORJSONRenderer().render(mapper(qs_factory()))
+
+
+def shapes() -> list[Shape]:
+    out = []
+    for role, user in representative_users().items():
+        def cards_qs(user=user):
+            return task_cards_queryset(user).order_by('-deadline', '-id_task')
+        out.append(Shape(f'task_cards[{role}]', cards_qs().count(),
+                         _drf(TaskCardSerializer, cards_qs), _fast(task_cards, cards_qs)))
+
+        def recipients_qs(user=user):
+            return (build_targets_qs(user, AssignmentInput())
+                    .select_related('role', 'subject', 'department').order_by('name'))
+        out.append(Shape(f'recipients[{role}]', recipients_qs().count(),
+                         _drf(RecipientCuratorSerializer, recipients_qs),
+                         _fast(recipient_curators, recipients_qs)))
+
+        # Самая «широкая» задача из видимых пользователю
+        task_id = (visible_reports_for(user).values('task_id')
+                   .annotate(n=Count('pk')).order_by('-n', 'task_id')
+                   .values_list('task_id', flat=True).first())
+        if task_id:
+            def detail_qs(user=user, task_id=task_id):
+                return (visible_reports_for(user).filter(task_id=task_id)
+                        .exclude(status_id__in=EXCLUDE_FROM_TOTAL_STATUSES)
+                        .select_related('curator', 'curator__role'))
+            out.append(Shape(f'task_detail[{role}]', detail_qs().count(),
+                             _drf(TaskDetailSerializer, detail_qs), _fast(task_details, detail_qs)))
+
+    admin = representative_users().get('admin')
+    if admin is not None:
+        def admin_qs(admin=admin):
+            return (Curator.objects.select_related('subject', 'department', 'role')
+                    .filter(subject_id=admin.subject_id).order_by('confirm', 'name'))
+        out.append(Shape('admin_users[admin]', admin_qs().count(),
+                         _drf(AdminUserSerializer, admin_qs), _fast(admin_users, admin_qs)))
+    return out
+
+
+def _median_ms(fn: Callable[[], bytes], repeat: int) -> float:
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def first_difference(a, b, path: str = '$') -> str | None:
+    if type(a) is not type(b):
+        return f'{path}: {a!r} != {b!r}'
+    if isinstance(a, dict):
+        for key in sorted(set(a) | set(b)):
+            if key not in a or key not in b:
+                return f'{path}.{key}: есть только с одной стороны'
+            diff = first_difference(a[key], b[key], f'{path}.{key}')
+            if diff:
+                return diff
+        return None
+    if isinstance(a, list):
+        if len(a) != len(b):
+            return f'{path}: длина {len(a)} != {len(b)}'
+        for i, (x, y) in enumerate(zip(a, b)):
+            diff = first_difference(x, y, f'{path}[{i}]')
+            if diff:
+                return diff
+        return None
+    return None if a == b else f'{path}: {a!r} != {b!r}'
+
+
+def run(repeat: int) -> list[dict]:
+    results = []
+    for shape in shapes():
+        drf_out, fast_out = json.loads(shape.drf()), json.loads(shape.fast())
+        drf_ms, fast_ms = _median_ms(shape.drf, repeat), _median_ms(shape.fast, repeat)
+        results.append({
+            'name': shape.name,
+            'rows': shape.rows,
+            'parity': first_difference(drf_out, fast_out),
+            'drf_ms': drf_ms,
+            'fast_ms': fast_ms,
+            'speedup': round(drf_ms / fast_ms, 2) if fast_ms else None,
+        })
+    return results
@@ -0,0 +1,65 @@
+-- Схема основной БД в том виде, в каком её видят unmanaged-модели.
+-- Используется только для локальных стендов (seed_dataset): индексов здесь
+-- намеренно нет, они поставляются миграциями.
+
+CREATE TABLE IF NOT EXISTS role (
+    id_role serial PRIMARY KEY,
+    role varchar(100) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS department (
+    id_department serial PRIMARY KEY,
+    department varchar(10) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS subject (
+    id_subject serial PRIMARY KEY,
+    subject varchar(15) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS status (
+    id_status serial PRIMARY KEY,
+    status varchar(100) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS curator (
+    mail varchar(100) PRIMARY KEY,
+    id_tg bigint,
+    name varchar(100) NOT NULL,
+    id_subject integer NOT NULL REFERENCES subject (id_subject),
+    id_department integer NOT NULL REFERENCES department (id_department),
+    id_role integer NOT NULL REFERENCES role (id_role),
+    password text NOT NULL,
+    mail_mg varchar(100),
+    confirm boolean NOT NULL DEFAULT false
+);
+
+CREATE TABLE IF NOT EXISTS task (
+    id_task varchar(100) PRIMARY KEY,
+    deadline timestamptz NOT NULL,
+    name varchar(200) NOT NULL,
+    description text NOT NULL,
+    report text NOT NULL,
+    mail_author varchar(100) NOT NULL REFERENCES curator (mail)
+);
+
+CREATE TABLE IF NOT EXISTS assignment (
+    id_assignment serial PRIMARY KEY,
+    id_task varchar(100) NOT NULL REFERENCES task (id_task) ON DELETE CASCADE,
+    id_subject integer REFERENCES subject (id_subject),
+    id_department integer REFERENCES department (id_department),
+    id_role integer REFERENCES role (id_role),
+    mail varchar(100) REFERENCES curator (mail) ON DELETE CASCADE,
+    mail_author varchar(100) NOT NULL REFERENCES curator (mail) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS report (
+    id_report serial PRIMARY KEY,
+    mail varchar(100) NOT NULL REFERENCES curator (mail) ON DELETE CASCADE,
+    id_task varchar(100) NOT NULL REFERENCES task (id_task) ON DELETE CASCADE,
+    id_status integer NOT NULL REFERENCES status (id_status),
+    timestamp_start timestamptz NOT NULL,
+    timestamp_end timestamptz,
+    report_text text,
+    report_url text
+);
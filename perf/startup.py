@@ -0,0 +1,145 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+from django.conf import settings
+
+# Запускается в отдельном интерпретаторе под -X importtime: поднимает Django так же,
+# как воркер (setup + urlconf + ASGI-приложение), и гоняет запросы через весь стек
+# middleware без сети. Печатает JSON с замерами последней строкой stdout.
+# Стоимость запроса — лучшее среднее по пачкам: на общей машине медиана отдельных
+# запросов шумит сильнее, чем разница между профилями.
+BATCH_SIZE = 100
+CHILD_SCRIPT = '''
+import json, logging, sys, time
+t0 = time.perf_counter()
+import django
+django.setup()
+t1 = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+t2 = time.perf_counter()
+from django.core.asgi import get_asgi_application
+get_asgi_application()
+t3 = time.perf_counter()
+
+from django.test import Client
+logging.getLogger("umtracker.requests").disabled = True
+client = Client(raise_request_exception=False)
+path, batches, batch_size = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+start = time.perf_counter()
+client.get(path)
+first = time.perf_counter() - start
+samples = []
+for _ in range(batches):
+    start = time.perf_counter()
+    for _ in range(batch_size):
+        client.get(path)
+    samples.append((time.perf_counter() - start) / batch_size)
+print(json.dumps({"setup": t1 - t0, "urlconf": t2 - t1, "asgi": t3 - t2,
+                  "first_request": first, "request": min(samples)}))
+'''
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    # Строки вида "import time:       123 |        456 |   package.module"
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def by_package(modules: list[tuple[str, int, int]]) -> dict[str, int]:
+    totals: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in modules:
+        totals[name.split('.')[0]] += self_us
+    return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def _env(settings_module: str) -> dict:
+    env = dict(os.environ)
+    env['DJANGO_SETTINGS_MODULE'] = settings_module
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env
+
+
+def profile_imports(settings_module: str, path: str, requests: int) -> dict:
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD_SCRIPT,
+         path, str(max(requests // BATCH_SIZE, 1)), str(BATCH_SIZE)],
+        cwd=settings.BASE_DIR, env=_env(settings_module), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else 'child failed')
+
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    modules = parse_importtime(proc.stderr)
+    return {
+        **timings,
+        'modules': len(modules),
+        'import_us': sum(m[1] for m in modules),
+        'packages': by_package(modules),
+        'top_modules': sorted(modules, key=lambda m: m[1], reverse=True)[:15],
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_response(settings_module: str, path: str, timeout: float = 60.0) -> float:
+    # От запуска процесса uvicorn до первого HTTP-ответа (любого статуса)
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'umtracker.asgi:application',
+         '--host', '127.0.0.1', '--port', str(port), '--workers', '1', '--log-level', 'warning'],
+        cwd=settings.BASE_DIR, env=_env(settings_module),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f'uvicorn завершился с кодом {proc.returncode}')
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=timeout)
+            except urllib.error.HTTPError:
+                pass
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+                continue
+            return time.perf_counter() - started
+        raise RuntimeError(f'нет ответа за {timeout:.0f}s')
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def run(settings_modules: list[str], *, path: str, requests: int, repeat: int) -> dict[str, dict]:
+    # Профили чередуются, чтобы прогрев дискового кэша и фоновая нагрузка
+    # не доставались одному из них; по старту берётся лучший прогон
+    runs: dict[str, list[dict]] = {m: [] for m in settings_modules}
+    ttfr: dict[str, list[float]] = {m: [] for m in settings_modules}
+    for _ in range(repeat):
+        for module in settings_modules:
+            runs[module].append(profile_imports(module, path, requests))
+            ttfr[module].append(time_to_first_response(module, path))
+
+    results = {}
+    for module in settings_modules:
+        best = min(runs[module], key=lambda r: r['setup'] + r['urlconf'] + r['asgi'])
+        best['ttfr'] = min(ttfr[module])
+        best['request'] = min(r['request'] for r in runs[module])
+        results[module] = best
+    return results
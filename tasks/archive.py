@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from .models import Assignment, AssignmentDelivery, Report, Task, TaskReminder
+
+# Задачи с дедлайном старше порога переезжают в *_archive пачками: каждая пачка —
+# отдельная транзакция, поэтому блокировки держатся недолго, а прерванный запуск
+# просто продолжается со следующей пачки.
+SELECT_CHUNK_SQL = '''
+SELECT id_task FROM task
+WHERE deadline < %s
+ORDER BY deadline
+LIMIT %s
+FOR UPDATE SKIP LOCKED
+'''
+
+
+def _move_sql(model: type[models.Model]) -> str:
+    # DELETE ... RETURNING сразу в INSERT архива: строки читаются один раз
+    table = model._meta.db_table
+    columns = ', '.join(f.column for f in model._meta.concrete_fields)
+    return (f'WITH moved AS (DELETE FROM {table} WHERE id_task = ANY(%s) RETURNING {columns}) '
+            f'INSERT INTO {table}_archive ({columns}) SELECT {columns} FROM moved')
+
+
+# Сначала дочерние таблицы: удаление задачи каскадом снесло бы их раньше копирования
+MOVE_STEPS = (
+    ('reports', _move_sql(Report)),
+    ('assignments', _move_sql(Assignment)),
+    ('tasks', _move_sql(Task)),
+)
+
+
+@dataclass
+class ArchiveResult:
+    tasks: int = 0
+    assignments: int = 0
+    reports: int = 0
+    chunks: int = 0
+
+
+def archive_chunk(cutoff, chunk_size: int) -> ArchiveResult | None:
+    result = ArchiveResult(chunks=1)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(SELECT_CHUNK_SQL, [cutoff, chunk_size])
+        task_ids = [row[0] for row in cursor.fetchall()]
+        if not task_ids:
+            return None
+
+        for name, sql in MOVE_STEPS:
+            cursor.execute(sql, [task_ids])
+            setattr(result, name, cursor.rowcount)
+        # Напоминания и итоги доставки по давно прошедшим дедлайнам больше не нужны
+        TaskReminder.objects.filter(task_id__in=task_ids).delete()
+        AssignmentDelivery.objects.filter(task_id__in=task_ids).delete()
+    return result
+
+
+def archive_tasks(*, older_than_days: int, chunk_size: int, max_chunks: int | None = None) -> ArchiveResult:
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    total = ArchiveResult()
+    while max_chunks is None or total.chunks < max_chunks:
+        chunk = archive_chunk(cutoff, chunk_size)
+        if chunk is None:
+            break
+        total.tasks += chunk.tasks
+        total.assignments += chunk.assignments
+        total.reports += chunk.reports
+        total.chunks += 1
+    return total
+
+
+def archivable_count(older_than_days: int) -> int:
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return Task.objects.filter(deadline__lt=cutoff).count()
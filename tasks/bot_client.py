@@ -1,18 +1,69 @@
 from __future__ import annotations
 
-import requests
 import os
 from tasks.models import Assignment, Task
+from umtracker.instrumentation import span
+from umtracker.metrics import bot_call
 
+# requests (urllib3, charset_normalizer, idna) импортируется внутри функций —
+# при первом обращении к боту, а не при старте воркера: модуль тянут views
 
 BOT_BASE_URL: str | None = os.environ.get('TASK_BOT_BASE_URL')
 BOT_SEND_PATH: str = '/send-assignment'
+BOT_BATCH_SEND_PATH: str = '/send-assignments'
 BOT_HEALTH_PATH: str = '/health'
+BOT_REMINDERS_PATH: str = '/send-reminders'
+
+# Пакетная отправка включается, только если бот поддерживает /send-assignments
+BOT_BATCH_SEND: bool = os.environ.get('TASK_BOT_BATCH_SEND', '0') == '1'
+BOT_BATCH_SIZE: int = int(os.environ.get('TASK_BOT_BATCH_SIZE', '100'))
+
+# Напоминания о дедлайне (tasks.reminders) включаются, только если бот поддерживает
+# /send-reminders — контракт описан в README
+BOT_REMINDERS: bool = os.environ.get('TASK_BOT_REMINDERS', '0') == '1'
+
+# Повтор части получателей (tg_ids: {id_assignment: [id_tg]}) включается, только если бот
+# понимает тело {"tg_ids": [...]} в /send-assignment и {"tg_ids": {"<id>": [...]}} в пакете —
+# контракт описан в README. Без флага tg_ids боту не передаются.
+BOT_PARTIAL_RESEND: bool = os.environ.get('TASK_BOT_PARTIAL_RESEND', '0') == '1'
+
+
+def _undelivered_ids(errors) -> list[int] | None:
+    # errors из ответа бота уходят в bigint[] assignment_delivery.undelivered_tg;
+    # None — список не разобрать
+    if errors is None:
+        return []
+    if not isinstance(errors, list):
+        return None
+    ids = []
+    for tg_id in errors:
+        if isinstance(tg_id, bool):
+            return None
+        try:
+            ids.append(int(tg_id))
+        except (TypeError, ValueError):
+            return None
+    return ids
+
+
+def _bad_payload(assignment_id: int) -> dict:
+    # Неразборчивый ответ считаем недоступностью бота, а не ошибкой запроса
+    return {
+        'assignment_id': assignment_id,
+        'status': 'failed',
+        'undelivered_tg': [],
+        'error': 'bot_unavailable',
+        'http_status': 200,
+    }
 
 
 def bot_ping() -> bool:
+    import requests
+
     try:
-        r = requests.get(f'{BOT_BASE_URL}{BOT_HEALTH_PATH}', timeout=5)
+        with span('bot'), bot_call('health') as call:
+            r = requests.get(f'{BOT_BASE_URL}{BOT_HEALTH_PATH}', timeout=5)
+            call.status = r.status_code
         if r.status_code == 200:
             data = r.json()
             return bool(data.get('bot_available', True))
@@ -21,7 +72,7 @@ def bot_ping() -> bool:
         return False
 
 
-def bot_send_assignment(assignment_id: int) -> dict:
+def bot_send_assignment(assignment_id: int, tg_ids: list[int] | None = None) -> dict:
     if not Assignment.objects.filter(pk=assignment_id).exists():
         return {
             'assignment_id': assignment_id,
@@ -31,16 +82,26 @@ def bot_send_assignment(assignment_id: int) -> dict:
             'http_status': 404,
         }
 
+    import requests
+
     try:
-        resp = requests.post(
-            f'{BOT_BASE_URL}{BOT_SEND_PATH}',
-            params={'argument': assignment_id},
-            timeout=15,
-        )
+        with span('bot'), bot_call('send-assignment') as call:
+            resp = requests.post(
+                f'{BOT_BASE_URL}{BOT_SEND_PATH}',
+                params={'argument': assignment_id},
+                json={'tg_ids': tg_ids} if tg_ids and BOT_PARTIAL_RESEND else None,
+                timeout=15,
+            )
+            call.status = resp.status_code
 
         if resp.status_code == 200:
-            payload = resp.json()
-            undelivered = payload.get('errors') or []
+            try:
+                payload = resp.json()
+            except ValueError:
+                return _bad_payload(assignment_id)
+            undelivered = _undelivered_ids(payload.get('errors')) if isinstance(payload, dict) else None
+            if undelivered is None:
+                return _bad_payload(assignment_id)
             return {
                 'assignment_id': assignment_id,
                 'status': 'sent' if not undelivered else 'partially_sent',
@@ -70,3 +131,150 @@ def bot_send_assignment(assignment_id: int) -> dict:
             'error': str(e),
             'http_status': None,
         }
+
+
+def _batch_item_result(assignment_id: int, item: dict | None) -> dict:
+    if item is None:
+        return {
+            'assignment_id': assignment_id,
+            'status': 'failed',
+            'undelivered_tg': [],
+            'error': 'missing_in_batch_response',
+            'http_status': None,
+        }
+
+    http_status = item.get('http_status', 200)
+    if http_status == 200:
+        undelivered = _undelivered_ids(item.get('errors'))
+        if undelivered is None:
+            return _bad_payload(assignment_id)
+        return {
+            'assignment_id': assignment_id,
+            'status': 'sent' if not undelivered else 'partially_sent',
+            'undelivered_tg': undelivered,
+            'error': None,
+            'http_status': 200,
+        }
+
+    return {
+        'assignment_id': assignment_id,
+        'status': 'failed',
+        'undelivered_tg': [],
+        'error': item.get('detail') or 'unknown_error',
+        'http_status': http_status,
+    }
+
+
+def _send_batch(assignment_ids: list[int], tg_ids: dict[int, list[int]]) -> list[dict]:
+    import requests
+
+    body: dict = {'assignment_ids': assignment_ids}
+    only = {str(a_id): tg_ids[a_id] for a_id in assignment_ids if tg_ids.get(a_id)}
+    if only and BOT_PARTIAL_RESEND:
+        body['tg_ids'] = only
+    try:
+        with span('bot'), bot_call('send-assignments') as call:
+            resp = requests.post(
+                f'{BOT_BASE_URL}{BOT_BATCH_SEND_PATH}',
+                json=body,
+                timeout=15 + len(assignment_ids),
+            )
+            call.status = resp.status_code
+        if resp.status_code == 200:
+            try:
+                payload = resp.json()
+            except ValueError:
+                payload = None
+            results = payload.get('results') if isinstance(payload, dict) else None
+            if not isinstance(results, list):
+                return [_bad_payload(a_id) for a_id in assignment_ids]
+            items = {item.get('assignment_id'): item for item in results if isinstance(item, dict)}
+            return [_batch_item_result(a_id, items.get(a_id)) for a_id in assignment_ids]
+
+        try:
+            payload = resp.json()
+        except Exception:
+            payload = {'detail': resp.text}
+        error = (payload.get('detail') if isinstance(payload, dict) else str(payload)) or 'unknown_error'
+        http_status = resp.status_code
+    except Exception as e:
+        error, http_status = str(e), None
+
+    return [
+        {
+            'assignment_id': a_id,
+            'status': 'failed',
+            'undelivered_tg': [],
+            'error': error,
+            'http_status': http_status,
+        }
+        for a_id in assignment_ids
+    ]
+
+
+def bot_send_assignments(assignment_ids: list[int], tg_ids: dict[int, list[int]] | None = None) -> list[dict]:
+    if not assignment_ids:
+        return []
+    tg_ids = tg_ids or {}
+    if not BOT_BATCH_SEND:
+        return [bot_send_assignment(a_id, tg_ids.get(a_id)) for a_id in assignment_ids]
+
+    existing = set(Assignment.objects.filter(pk__in=assignment_ids).values_list('pk', flat=True))
+    results: dict[int, dict] = {
+        a_id: {
+            'assignment_id': a_id,
+            'status': 'failed',
+            'undelivered_tg': [],
+            'error': 'assignment_not_found',
+            'http_status': 404,
+        }
+        for a_id in assignment_ids if a_id not in existing
+    }
+
+    to_send = [a_id for a_id in assignment_ids if a_id in existing]
+    for i in range(0, len(to_send), BOT_BATCH_SIZE):
+        for r in _send_batch(to_send[i:i + BOT_BATCH_SIZE], tg_ids):
+            results[r['assignment_id']] = r
+
+    return [results[a_id] for a_id in assignment_ids]
+
+
+def _send_reminder_batch(reminders: list[dict]) -> list[dict]:
+    import requests
+
+    try:
+        with span('bot'), bot_call('send-reminders') as call:
+            resp = requests.post(
+                f'{BOT_BASE_URL}{BOT_REMINDERS_PATH}',
+                json={'reminders': reminders},
+                timeout=15 + len(reminders) // 10,
+            )
+            call.status = resp.status_code
+        if resp.status_code == 200:
+            # Бот перечисляет только недоставленные; остальные считаются отправленными
+            failed = {
+                (item.get('id_tg'), item.get('id_task')): item.get('detail') or 'undelivered'
+                for item in resp.json().get('errors') or []
+            }
+            return [
+                {'status': 'failed', 'error': failed[key]} if key in failed else {'status': 'sent', 'error': None}
+                for key in ((r['id_tg'], r['id_task']) for r in reminders)
+            ]
+
+        try:
+            payload = resp.json()
+        except Exception:
+            payload = {'detail': resp.text}
+        error = (payload.get('detail') if isinstance(payload, dict) else str(payload)) or 'unknown_error'
+    except Exception as e:
+        error = str(e)
+
+    return [{'status': 'failed', 'error': error} for _ in reminders]
+
+
+def bot_send_reminders(reminders: list[dict]) -> list[dict]:
+    # reminders: [{'id_tg', 'id_task', 'name', 'deadline', 'window'}], ответ — в том же порядке
+    results: list[dict] = []
+    for i in range(0, len(reminders), BOT_BATCH_SIZE):
+        results.extend(_send_reminder_batch(reminders[i:i + BOT_BATCH_SIZE]))
+    return results
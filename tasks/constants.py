@@ -6,3 +6,6 @@ ASSIGNMENT_ERROR_STATUS = 5
 
 COMPLETED_STATUSES = (COMPLETED_STATUS, COMPLETED_LATE_STATUS)
 EXCLUDE_FROM_TOTAL_STATUSES = (CANCELLED_STATUS, ASSIGNMENT_ERROR_STATUS)
+
+# ?scope=archived: список и детали задач из архивных таблиц (tasks.archive)
+ARCHIVED_SCOPE = 'archived'
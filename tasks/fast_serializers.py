@@ -0,0 +1,89 @@
+# Быстрый путь для больших списков: .values() только с нужными колонками и
+# простые функции, повторяющие JSON TaskCardSerializer / TaskDetailSerializer /
+# RecipientCuratorSerializer. Совпадение вывода проверяет manage.py bench_serializers.
+from datetime import datetime
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .serializers import STATUS_MAP
+
+
+def dt(value: datetime | None) -> str | None:
+    # Как serializers.DateTimeField.to_representation при USE_TZ
+    if value is None:
+        return None
+    value = timezone.localtime(value).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def _str(value) -> str | None:
+    return None if value is None else str(value)
+
+
+TASK_CARD_COLUMNS = (
+    'id_task', 'name', 'card_status', 'progress', 'completed', 'total', 'not_completed',
+    'deadline', 'created', 'description', 'sample_names', 'on_time',
+)
+
+
+def task_cards(qs: QuerySet) -> list[dict]:
+    return [
+        {
+            'id': _str(id_task),
+            'title': _str(name),
+            'status': _str(card_status),
+            'progress': int(progress),
+            'completed': int(completed),
+            'total': int(total),
+            'notCompleted': int(not_completed),
+            'deadline': dt(deadline),
+            'created': dt(created),
+            'description': _str(description),
+            'sampleCurators': (sample_names or [])[:3],
+            'on_time': int(on_time),
+        }
+        for (id_task, name, card_status, progress, completed, total, not_completed,
+             deadline, created, description, sample_names, on_time)
+        in qs.values_list(*TASK_CARD_COLUMNS)
+    ]
+
+
+TASK_DETAIL_COLUMNS = (
+    'curator__email', 'curator__name', 'curator__role__role', 'status_id',
+    'timestamp_end', 'report_url', 'report_text',
+)
+
+
+def task_details(qs: QuerySet) -> list[dict]:
+    return [
+        {
+            'email': _str(email),
+            'name': _str(name),
+            'role': _str(role),
+            'status': STATUS_MAP.get(status_id, 'not_completed'),
+            'completedAt': dt(timestamp_end),
+            'reportUrl': _str(report_url),
+            'reportText': _str(report_text),
+        }
+        for email, name, role, status_id, timestamp_end, report_url, report_text
+        in qs.values_list(*TASK_DETAIL_COLUMNS)
+    ]
+
+
+RECIPIENT_COLUMNS = ('email', 'name', 'role__role', 'subject__subject', 'department__department')
+
+
+def recipient_curators(qs: QuerySet) -> list[dict]:
+    return [
+        {
+            'email': _str(email),
+            'name': _str(name),
+            'role': _str(role),
+            'subject': _str(subject),
+            'department': _str(department),
+        }
+        for email, name, role, subject, department in qs.values_list(*RECIPIENT_COLUMNS)
+    ]
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+LOCK_POLL_INTERVAL = 0.1
+
+
+def _fingerprint(data) -> str:
+    raw = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _lock_id(*parts: str) -> int:
+    digest = hashlib.sha256('\x00'.join(parts).encode()).digest()
+    return int.from_bytes(digest[:8], 'big', signed=True)
+
+
+def _try_lock(lock_id: int, wait: float) -> bool:
+    # Сессионная advisory-блокировка: дубль ждёт, пока первый запрос не закончит работу
+    deadline = time.monotonic() + wait
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute('SELECT pg_try_advisory_lock(%s)', [lock_id])
+            if cursor.fetchone()[0]:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(LOCK_POLL_INTERVAL)
+
+
+def _unlock(lock_id: int):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_unlock(%s)', [lock_id])
+
+
+def idempotent(scope: str):
+    # Для методов APIView: с заголовком Idempotency-Key повтор запроса отдаёт
+    # сохранённый ответ первого, а не выполняет метод заново
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not key:
+                return method(view, request, *args, **kwargs)
+            if len(key) > 100:
+                return Response({'detail': f'{IDEMPOTENCY_HEADER} длиннее 100 символов'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            user = request.user
+            fingerprint = _fingerprint(request.data)
+            lock_id = _lock_id(user.email, scope, key)
+
+            if not _try_lock(lock_id, settings.IDEMPOTENCY_WAIT_S):
+                return Response({'detail': 'Запрос с этим ключом ещё выполняется'},
+                                status=status.HTTP_409_CONFLICT,
+                                headers={'Retry-After': '1'})
+            try:
+                fresh_after = timezone.now() - timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+                stored = (IdempotencyKey.objects
+                          .filter(curator=user, scope=scope, key=key, created_at__gte=fresh_after)
+                          .first())
+                if stored is not None:
+                    if stored.fingerprint != fingerprint:
+                        return Response({'detail': f'{IDEMPOTENCY_HEADER} уже использован с другим запросом'},
+                                        status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+                    return Response(stored.response, status=stored.status_code,
+                                    headers={REPLAYED_HEADER: 'true'})
+
+                response = method(view, request, *args, **kwargs)
+                # 5xx не сохраняем, кроме 503 «бот недоступен»: задача к этому моменту уже создана
+                if response.status_code < 500 or response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+                    IdempotencyKey.objects.update_or_create(
+                        curator=user, scope=scope, key=key,
+                        defaults={
+                            'fingerprint': fingerprint,
+                            'status_code': response.status_code,
+                            'response': response.data,
+                            'created_at': timezone.now(),
+                        },
+                    )
+                return response
+            finally:
+                _unlock(lock_id)
+
+        return wrapper
+    return decorator
+
+
+def purge_expired_keys() -> int:
+    fresh_after = timezone.now() - timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=fresh_after).delete()
+    return deleted
@@ -0,0 +1,80 @@
+import csv
+import io
+from collections import Counter
+
+from users.models import Curator
+from .serializers import TaskCreateSerializer
+from .services import AssignmentInput, BulkTaskSpec, create_tasks_bulk
+
+CSV_LIST_FIELDS = ('department_ids', 'role_ids', 'emails')
+CSV_LIST_SEPARATOR = ';'
+
+
+def parse_csv(text: str) -> list[dict]:
+    rows = []
+    for raw in csv.DictReader(io.StringIO(text)):
+        row = {}
+        for key, value in raw.items():
+            if key is None:
+                continue
+            key = key.strip()
+            value = (value or '').strip()
+            if not value:
+                continue
+            if key in CSV_LIST_FIELDS:
+                row[key] = [part.strip() for part in value.split(CSV_LIST_SEPARATOR) if part.strip()]
+            else:
+                row[key] = value
+        rows.append(row)
+    return rows
+
+
+def import_tasks(author: Curator, rows: list[dict]) -> dict:
+    errors: list[dict] = []
+    specs: list[BulkTaskSpec] = []
+    row_numbers: list[int] = []
+
+    for index, raw in enumerate(rows, start=1):
+        ser = TaskCreateSerializer(data=raw)
+        if not ser.is_valid():
+            errors.append({'row': index, 'errors': ser.errors})
+            continue
+
+        data = ser.validated_data
+        specs.append(BulkTaskSpec(
+            author=author,
+            deadline=data['deadline'],
+            name=data['name'],
+            description=data['description'],
+            report_template=data['report'],
+            recipients=AssignmentInput(
+                subject_id=data.get('subject_id'),
+                department_ids=data.get('department_ids'),
+                role_ids=data.get('role_ids'),
+                emails=data.get('emails'),
+                single_email=data.get('single_email'),
+            ),
+        ))
+        row_numbers.append(index)
+
+    result = create_tasks_bulk(specs)
+    per_task = Counter(a.task_id for a in result.assignments)
+
+    created: list[dict] = []
+    for index, task, error, reports in zip(row_numbers, result.tasks, result.errors, result.reports):
+        if error:
+            errors.append({'row': index, 'errors': {'non_field_errors': [error]}})
+        else:
+            created.append({
+                'row': index,
+                'id_task': task.id_task,
+                'assignments': per_task[task.id_task],
+                'reports': reports,
+            })
+    errors.sort(key=lambda e: e['row'])
+
+    return {
+        'created': created,
+        'errors': errors,
+        'delivery': result.delivery,
+    }
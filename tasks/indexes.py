@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+
+from django.db import connections
+
+
+@dataclass(frozen=True)
+class ExpectedIndex:
+    name: str
+    table: str
+    columns: tuple[str, ...]
+    migration: str
+    unique: bool = False
+
+
+# Индексы, которые поставляют миграции для unmanaged-таблиц.
+# При добавлении новой миграции с индексом — дописать сюда.
+EXPECTED_INDEXES: tuple[ExpectedIndex, ...] = (
+    ExpectedIndex('report_task_mail_status_idx', 'report', ('id_task', 'mail', 'id_status'),
+                  'tasks.0002_hot_path_indexes'),
+    ExpectedIndex('assignment_task_mail_idx', 'assignment', ('id_task', 'mail'),
+                  'tasks.0002_hot_path_indexes'),
+    ExpectedIndex('task_author_deadline_idx', 'task', ('mail_author', 'deadline'),
+                  'tasks.0002_hot_path_indexes'),
+    ExpectedIndex('task_deadline_idx', 'task', ('deadline',),
+                  'tasks.0004_task_deadline_idx'),
+    ExpectedIndex('report_task_mail_uniq', 'report', ('id_task', 'mail'),
+                  'tasks.0006_report_task_mail_uniq', unique=True),
+    ExpectedIndex('task_archive_author_deadline_idx', 'task_archive', ('mail_author', 'deadline'),
+                  'tasks.0010_task_archive'),
+    ExpectedIndex('assignment_archive_task_mail_idx', 'assignment_archive', ('id_task', 'mail'),
+                  'tasks.0010_task_archive'),
+    ExpectedIndex('report_archive_task_mail_status_idx', 'report_archive', ('id_task', 'mail', 'id_status'),
+                  'tasks.0010_task_archive'),
+    ExpectedIndex('report_archive_mail_idx', 'report_archive', ('mail',),
+                  'tasks.0010_task_archive'),
+    ExpectedIndex('curator_mail_mg_idx', 'curator', ('mail_mg',),
+                  'users.0002_curator_indexes'),
+    ExpectedIndex('curator_subject_department_role_idx', 'curator', ('id_subject', 'id_department', 'id_role'),
+                  'users.0002_curator_indexes'),
+    ExpectedIndex('curator_id_tg_idx', 'curator', ('id_tg',),
+                  'users.0002_curator_indexes'),
+    ExpectedIndex('curator_name_prefix_idx', 'curator', ('upper(name::text)',),
+                  'users.0004_curator_typeahead_indexes'),
+    ExpectedIndex('curator_mail_prefix_idx', 'curator', ('upper(mail::text)',),
+                  'users.0004_curator_typeahead_indexes'),
+    ExpectedIndex('curator_name_mail_idx', 'curator', ('name', 'mail'),
+                  'users.0004_curator_typeahead_indexes'),
+)
+
+INDEXES_SQL = '''
+SELECT t.relname, i.relname, ix.indisvalid, ix.indisunique,
+       pg_get_indexdef(ix.indexrelid),
+       ARRAY(
+           SELECT pg_get_indexdef(ix.indexrelid, k + 1, true)
+           FROM generate_subscripts(ix.indkey, 1) AS k
+           ORDER BY k
+       )
+FROM pg_index ix
+JOIN pg_class i ON i.oid = ix.indexrelid
+JOIN pg_class t ON t.oid = ix.indrelid
+JOIN pg_namespace n ON n.oid = t.relnamespace
+WHERE n.nspname = current_schema() AND t.relname = ANY(%s)
+'''
+
+
+@dataclass
+class IndexState:
+    expected: ExpectedIndex
+    status: str
+    detail: str = ''
+
+
+def check_indexes(using: str = 'default', expected: tuple[ExpectedIndex, ...] = EXPECTED_INDEXES) -> list[IndexState]:
+    tables = sorted({e.table for e in expected})
+    with connections[using].cursor() as cursor:
+        cursor.execute(INDEXES_SQL, [tables])
+        rows = cursor.fetchall()
+
+    by_name = {name: (table, valid, unique, definition, list(columns))
+               for table, name, valid, unique, definition, columns in rows}
+
+    states = []
+    for e in expected:
+        found = by_name.get(e.name)
+        if found is None:
+            # Индекс мог быть создан руками под другим именем
+            # Уникальный индекс покрывается только уникальным по тем же колонкам
+            twin = next((name for name, (table, valid, unique, _, columns) in by_name.items()
+                         if table == e.table and valid
+                         and (tuple(columns) == e.columns and unique if e.unique
+                              else tuple(columns[:len(e.columns)]) == e.columns)), None)
+            if twin:
+                states.append(IndexState(e, 'covered', f'покрыт индексом {twin}'))
+            else:
+                states.append(IndexState(e, 'missing', f'применить миграцию {e.migration}'))
+            continue
+
+        table, valid, unique, definition, columns = found
+        if not valid:
+            states.append(IndexState(
+                e, 'invalid',
+                f'прерванный CREATE INDEX CONCURRENTLY: DROP INDEX CONCURRENTLY {e.name}; и повторить миграцию'))
+        elif table != e.table or tuple(columns) != e.columns or unique != e.unique:
+            states.append(IndexState(e, 'mismatch', definition))
+        else:
+            states.append(IndexState(e, 'ok'))
+    return states
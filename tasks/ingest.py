@@ -0,0 +1,112 @@
+from django.db import connection
+
+from .constants import CANCELLED_STATUS
+from .serializers import STATUS_IDS, ReportSubmissionItemSerializer
+
+# Весь пакет — один оператор. Ключ, уже записанный в report_submission,
+# отсекается ON CONFLICT DO NOTHING, поэтому повтор пакета ничего не меняет.
+# Из нескольких свежих отправок одного куратора по задаче побеждает последняя.
+# Отправки по отменённым отчётам отклоняются, и их ключ не записывается.
+UPSERT_SQL = '''
+WITH input AS (
+    SELECT * FROM unnest(
+        %(keys)s::varchar[], %(tasks)s::varchar[], %(mails)s::varchar[], %(statuses)s::int[],
+        %(starts)s::timestamptz[], %(ends)s::timestamptz[], %(texts)s::text[], %(urls)s::text[]
+    ) WITH ORDINALITY AS i(key, id_task, mail, id_status, timestamp_start, timestamp_end, report_text, report_url, n)
+), valid AS (
+    SELECT i.* FROM input i
+    JOIN task t ON t.id_task = i.id_task
+    JOIN curator c ON c.mail = i.mail
+), cancelled AS (
+    SELECT v.key FROM valid v
+    WHERE EXISTS (SELECT 1 FROM report x
+                  WHERE x.id_task = v.id_task AND x.mail = v.mail AND x.id_status = %(cancelled)s)
+), fresh AS (
+    INSERT INTO report_submission (key, id_task, mail, received_at)
+    SELECT key, id_task, mail, now() FROM valid
+    WHERE key NOT IN (SELECT key FROM cancelled)
+    ON CONFLICT (key) DO NOTHING
+    RETURNING key
+), latest AS (
+    SELECT DISTINCT ON (v.id_task, v.mail) v.*
+    FROM valid v JOIN fresh f ON f.key = v.key
+    ORDER BY v.id_task, v.mail, v.n DESC
+), written AS (
+    INSERT INTO report AS r (id_task, mail, id_status, timestamp_start, timestamp_end, report_text, report_url)
+    SELECT id_task, mail, id_status, COALESCE(timestamp_start, now()), timestamp_end, report_text, report_url
+    FROM latest
+    ON CONFLICT (id_task, mail) DO UPDATE SET
+        id_status = EXCLUDED.id_status,
+        timestamp_end = EXCLUDED.timestamp_end,
+        report_text = COALESCE(EXCLUDED.report_text, r.report_text),
+        report_url = COALESCE(EXCLUDED.report_url, r.report_url)
+    WHERE r.id_status <> %(cancelled)s
+    RETURNING r.id_report
+)
+SELECT ARRAY(SELECT key FROM valid), ARRAY(SELECT key FROM cancelled), ARRAY(SELECT key FROM fresh),
+       (SELECT count(*) FROM written)
+'''
+
+
+def classify_results(results: list[dict], valid: set[str], cancelled: set[str], fresh: set[str]):
+    # Итог по ключам, которые вернул UPSERT_SQL; уже разобранные не трогаются
+    for r in results:
+        if r['result'] is not None:
+            continue
+        if r['key'] in cancelled:
+            r['result'] = 'rejected'
+            r['errors'] = {'non_field_errors': ['Отчёт отменён.']}
+        elif r['key'] in fresh:
+            r['result'] = 'applied'
+        elif r['key'] in valid:
+            r['result'] = 'duplicate'
+        else:
+            r['result'] = 'rejected'
+            r['errors'] = {'non_field_errors': ['Задача или куратор не найдены.']}
+
+
+def ingest_reports(items: list) -> dict:
+    results: list[dict] = []
+    accepted: list[dict] = []
+    seen: set[str] = set()
+
+    for raw in items:
+        ser = ReportSubmissionItemSerializer(data=raw)
+        if not ser.is_valid():
+            key = raw.get('key') if isinstance(raw, dict) else None
+            results.append({'key': key, 'result': 'rejected', 'errors': ser.errors})
+            continue
+        data = ser.validated_data
+        if data['key'] in seen:
+            results.append({'key': data['key'], 'result': 'duplicate'})
+            continue
+        seen.add(data['key'])
+        accepted.append(data)
+        results.append({'key': data['key'], 'result': None})
+
+    written = 0
+    if accepted:
+        with connection.cursor() as cursor:
+            cursor.execute(UPSERT_SQL, {
+                'keys': [d['key'] for d in accepted],
+                'tasks': [d['id_task'] for d in accepted],
+                'mails': [d['email'] for d in accepted],
+                'statuses': [STATUS_IDS[d['status']] for d in accepted],
+                'starts': [d.get('timestamp_start') for d in accepted],
+                'ends': [d.get('timestamp_end') for d in accepted],
+                'texts': [d.get('report_text') or None for d in accepted],
+                'urls': [d.get('report_url') or None for d in accepted],
+                'cancelled': CANCELLED_STATUS,
+            })
+            valid, cancelled, fresh, written = cursor.fetchone()
+        classify_results(results, set(valid), set(cancelled), set(fresh))
+
+    counts = {'applied': 0, 'duplicate': 0, 'rejected': 0}
+    for r in results:
+        counts[r['result']] += 1
+    return {
+        'received': len(items),
+        **counts,
+        'reports_written': written,
+        'results': results,
+    }
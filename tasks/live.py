@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import logging
+
+import psycopg2
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from users.models import Curator
+from .services import task_cards_queryset, visible_reports_for
+
+logger = logging.getLogger(__name__)
+
+# Канал, в который пишет триггер report_notify_changes (миграция 0008)
+CHANNEL = 'report_changes'
+RECONNECT_DELAY = 5.0
+
+
+def changed_cards(user: Curator, task_ids: set[str]) -> list[dict]:
+    close_old_connections()
+    try:
+        rows = (task_cards_queryset(user)
+                .filter(id_task__in=task_ids)
+                .values('id_task', 'completed', 'total', 'not_completed', 'progress', 'card_status'))
+        cards = [
+            {
+                'id': r['id_task'],
+                'completed': r['completed'],
+                'total': r['total'],
+                'notCompleted': r['not_completed'],
+                'progress': int(r['progress']),
+                'status': r['card_status'],
+            }
+            for r in rows
+        ]
+
+        # Карточка пропала из выборки (например, задачу отменили), но отчёты по ней видны
+        missing = task_ids - {c['id'] for c in cards}
+        if missing:
+            removed = (visible_reports_for(user)
+                       .filter(task_id__in=missing)
+                       .values_list('task_id', flat=True)
+                       .distinct())
+            cards.extend({'id': task_id, 'removed': True} for task_id in removed)
+        return cards
+    finally:
+        close_old_connections()
+
+
+class Subscriber:
+    def __init__(self, user: Curator):
+        self.user = user
+        self.queue: asyncio.Queue[list[dict]] = asyncio.Queue()
+        self.last: dict[str, dict] = {}
+
+    def offer(self, cards: list[dict]):
+        # Отдаём только то, что отличается от уже отправленного этому клиенту
+        fresh = [c for c in cards if self.last.get(c['id']) != c]
+        for c in fresh:
+            self.last[c['id']] = c
+        if fresh:
+            self.queue.put_nowait(fresh)
+
+
+# Одно LISTEN-соединение на процесс: уведомления копятся TASK_EVENTS_DEBOUNCE_MS,
+# затем карточки пересчитываются один раз на пользователя через общее соединение Django.
+class TaskEventsHub:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.subscribers: dict[str, set[Subscriber]] = {}
+        self.pending: set[str] = set()
+        self._conn = None
+        self._flush_scheduled = False
+
+    def subscribe(self, user: Curator) -> Subscriber:
+        sub = Subscriber(user)
+        self.subscribers.setdefault(user.email, set()).add(sub)
+        if self._conn is None:
+            self._listen()
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        subs = self.subscribers.get(sub.user.email)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self.subscribers[sub.user.email]
+        if not self.subscribers:
+            self._close()
+
+    def _listen(self):
+        try:
+            conn = psycopg2.connect(**connections['default'].get_connection_params())
+            conn.set_session(autocommit=True)
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN {CHANNEL}')
+        except psycopg2.Error:
+            logger.exception('LISTEN %s failed, retrying in %.0fs', CHANNEL, RECONNECT_DELAY)
+            self.loop.call_later(RECONNECT_DELAY, self._reconnect)
+            return
+        self._conn = conn
+        self.loop.add_reader(conn.fileno(), self._on_readable)
+
+    def _reconnect(self):
+        if self._conn is None and self.subscribers:
+            self._listen()
+
+    def _close(self):
+        if self._conn is None:
+            return
+        self.loop.remove_reader(self._conn.fileno())
+        self._conn.close()
+        self._conn = None
+
+    def _on_readable(self):
+        try:
+            self._conn.poll()
+        except psycopg2.Error:
+            logger.warning('LISTEN connection lost, reconnecting in %.0fs', RECONNECT_DELAY)
+            self._close()
+            self.loop.call_later(RECONNECT_DELAY, self._reconnect)
+            return
+
+        while self._conn.notifies:
+            self.pending.add(self._conn.notifies.pop().payload)
+        if self.pending and not self._flush_scheduled:
+            self._flush_scheduled = True
+            # Чистый контекст: reader зарегистрирован внутри запроса, а его
+            # executor для sync_to_async к моменту пересчёта уже закрыт
+            self.loop.call_later(settings.TASK_EVENTS_DEBOUNCE_MS / 1000,
+                                 lambda: self.loop.create_task(self._flush(), context=contextvars.Context()))
+
+    async def _flush(self):
+        task_ids, self.pending = self.pending, set()
+        self._flush_scheduled = False
+        for subs in list(self.subscribers.values()):
+            if not subs:
+                continue
+            user = next(iter(subs)).user
+            try:
+                cards = await sync_to_async(changed_cards)(user, task_ids)
+            except Exception:
+                logger.exception('Failed to recompute cards for %s', user.email)
+                continue
+            for sub in list(subs):
+                sub.offer(cards)
+
+
+_hub: TaskEventsHub | None = None
+
+
+def get_hub() -> TaskEventsHub:
+    global _hub
+    loop = asyncio.get_running_loop()
+    if _hub is None or _hub.loop is not loop:
+        _hub = TaskEventsHub(loop)
+    return _hub
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.archive import archivable_count, archive_tasks
+
+
+class Command(BaseCommand):
+    help = ('Переносит задачи с дедлайном старше TASK_ARCHIVE_AFTER_DAYS вместе с назначениями '
+            'и отчётами в архивные таблицы (запускать из cron раз в сутки)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=settings.TASK_ARCHIVE_AFTER_DAYS)
+        parser.add_argument('--chunk-size', type=int, default=settings.TASK_ARCHIVE_CHUNK_SIZE,
+                            help='Задач в одной транзакции')
+        parser.add_argument('--max-chunks', type=int, default=None)
+        parser.add_argument('--dry-run', action='store_true', help='Только посчитать задачи')
+
+    def handle(self, *args, **opts):
+        if opts['dry_run']:
+            self.stdout.write(f'К архивации задач: {archivable_count(opts["older_than_days"])}')
+            return
+
+        result = archive_tasks(
+            older_than_days=opts['older_than_days'],
+            chunk_size=opts['chunk_size'],
+            max_chunks=opts['max_chunks'],
+        )
+        self.stdout.write(
+            f'В архиве: задач {result.tasks}, назначений {result.assignments}, '
+            f'отчётов {result.reports} ({result.chunks} пачек)'
+        )
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from umtracker.schema import code_fingerprint, generate_schema, write_schema_file
+
+
+class Command(BaseCommand):
+    help = 'Генерирует OpenAPI-схему в OPENAPI_SCHEMA_FILE (запускать при сборке/деплое)'
+
+    def handle(self, *args, **opts):
+        fingerprint = code_fingerprint()
+        schema = generate_schema()
+        write_schema_file(schema, fingerprint)
+        self.stdout.write(f'Схема ({len(schema.get("paths", {}))} путей, {fingerprint}) '
+                          f'записана в {settings.OPENAPI_SCHEMA_FILE}')
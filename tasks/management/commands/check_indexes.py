@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from tasks.indexes import check_indexes
+
+
+class Command(BaseCommand):
+    help = 'Показывает, каких ожидаемых индексов на unmanaged-таблицах нет в БД'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--fail-on-missing', action='store_true',
+                            help='Завершиться с ошибкой, если что-то отсутствует или невалидно')
+
+    def handle(self, *args, **opts):
+        states = check_indexes(opts['database'])
+        problems = [s for s in states if s.status not in ('ok', 'covered')]
+
+        for s in states:
+            line = f'{s.status:<9} {s.expected.table}.{s.expected.name} ({", ".join(s.expected.columns)})'
+            if s.detail:
+                line += f' — {s.detail}'
+            style = self.style.ERROR if s in problems else self.style.SUCCESS
+            self.stdout.write(style(line))
+
+        if problems and opts['fail_on_missing']:
+            raise CommandError(f'Проблемных индексов: {len(problems)}')
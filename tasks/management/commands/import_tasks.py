@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.imports import import_tasks, parse_csv
+from users.models import Curator
+
+
+class Command(BaseCommand):
+    help = 'Импортирует задачи из CSV или JSON от имени автора одной транзакцией'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл .csv (списки через ";") или .json (список задач)')
+        parser.add_argument('--author', required=True, help='Почта автора задач')
+
+    def handle(self, *args, **opts):
+        author = (Curator.objects.select_related('role', 'subject', 'department')
+                  .filter(pk=opts['author']).first())
+        if author is None:
+            raise CommandError(f'Автор {opts["author"]} не найден')
+
+        path = Path(opts['path'])
+        text = path.read_text(encoding='utf-8-sig')
+        if path.suffix.lower() == '.csv':
+            rows = parse_csv(text)
+        else:
+            rows = json.loads(text)
+            if isinstance(rows, dict):
+                rows = rows.get('tasks')
+        if not isinstance(rows, list):
+            raise CommandError('Ожидается список задач')
+
+        result = import_tasks(author, rows)
+        for row in result['created']:
+            self.stdout.write(self.style.SUCCESS(
+                f'#{row["row"]}: {row["id_task"]} ({row["assignments"]} назначений)'))
+        for row in result['errors']:
+            self.stdout.write(self.style.ERROR(
+                f'#{row["row"]}: {json.dumps(row["errors"], ensure_ascii=False)}'))
+
+        summary = result['delivery'].get('summary')
+        if summary:
+            self.stdout.write(f'Доставка: {summary}')
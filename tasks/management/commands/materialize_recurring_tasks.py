@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from tasks.recurring import materialize_recurring_tasks
+
+
+class Command(BaseCommand):
+    help = 'Создаёт задачи по наступившим запускам повторяющихся шаблонов (запускать из cron раз в минуту)'
+
+    def handle(self, *args, **opts):
+        stats = materialize_recurring_tasks()
+        self.stdout.write(
+            f'Шаблонов: {stats["templates"]}, запусков: {stats["due"]}, '
+            f'взято в работу: {stats["claimed"]}, создано: {stats["created"]}, ошибок: {stats["failed"]}'
+        )
+        if stats.get('delivery'):
+            self.stdout.write(f'Доставка: {stats["delivery"]}')
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from tasks.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = 'Удаляет ключи идемпотентности старше IDEMPOTENCY_TTL_HOURS (запускать из cron раз в сутки)'
+
+    def handle(self, *args, **opts):
+        self.stdout.write(f'Удалено ключей: {purge_expired_keys()}')
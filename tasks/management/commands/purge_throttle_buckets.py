@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from umtracker.throttling import purge_idle_buckets
+
+
+class Command(BaseCommand):
+    help = 'Удаляет бакеты лимитов, простоявшие дольше полного пополнения (запускать из cron раз в час)'
+
+    def handle(self, *args, **opts):
+        self.stdout.write(f'Удалено бакетов: {purge_idle_buckets()}')
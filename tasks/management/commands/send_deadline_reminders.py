@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from tasks.reminders import send_deadline_reminders
+
+
+class Command(BaseCommand):
+    help = 'Рассылает напоминания о приближающихся дедлайнах (запускать из cron раз в несколько минут)'
+
+    def handle(self, *args, **opts):
+        stats = send_deadline_reminders()
+        if stats['disabled']:
+            self.stdout.write(self.style.WARNING('Напоминания выключены (TASK_BOT_REMINDERS=0)'))
+            return
+        if stats['bot_unavailable']:
+            self.stdout.write(self.style.WARNING('Бот недоступен, напоминания отложены'))
+            return
+        self.stdout.write(
+            f'Напоминаний: {stats["claimed"]}, отправлено: {stats["sent"]}, ошибок: {stats["failed"]}'
+        )
@@ -0,0 +1,32 @@
+# Таблицы task/assignment/report не управляются Django (managed = False),
+# поэтому индексы создаются обычным SQL. CONCURRENTLY не блокирует запись,
+# но не работает внутри транзакции — отсюда atomic = False.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS report_task_mail_status_idx '
+            'ON report (id_task, mail, id_status);',
+            'DROP INDEX CONCURRENTLY IF EXISTS report_task_mail_status_idx;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS assignment_task_mail_idx '
+            'ON assignment (id_task, mail);',
+            'DROP INDEX CONCURRENTLY IF EXISTS assignment_task_mail_idx;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS task_author_deadline_idx '
+            'ON task (mail_author, deadline);',
+            'DROP INDEX CONCURRENTLY IF EXISTS task_author_deadline_idx;',
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:25
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_hot_path_indexes'),
+        ('users', '0003_curator_primary_key_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurringTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('report', models.TextField()),
+                ('schedule', models.CharField(max_length=100)),
+                ('deadline_offset', models.DurationField()),
+                ('subject_id', models.IntegerField(blank=True, null=True)),
+                ('department_ids', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, size=None)),
+                ('role_ids', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, size=None)),
+                ('emails', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, size=None)),
+                ('active', models.BooleanField(default=True)),
+                ('starts_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_materialized_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('author', models.ForeignKey(db_column='mail_author', on_delete=django.db.models.deletion.CASCADE, related_name='recurring_tasks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Повторяющаяся задача',
+                'verbose_name_plural': 'Повторяющиеся задачи',
+                'db_table': 'recurring_task',
+            },
+        ),
+        migrations.CreateModel(
+            name='RecurringTaskOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scheduled_for', models.DateTimeField()),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('task', models.ForeignKey(blank=True, db_column='id_task', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tasks.task')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='tasks.recurringtask')),
+            ],
+            options={
+                'verbose_name': 'Запуск повторяющейся задачи',
+                'verbose_name_plural': 'Запуски повторяющихся задач',
+                'db_table': 'recurring_task_occurrence',
+                'constraints': [models.UniqueConstraint(fields=('template', 'scheduled_for'), name='recurring_occurrence_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Сканирование по диапазону дедлайнов для напоминаний (tasks.reminders):
+# task_author_deadline_idx начинается с автора и для него не подходит.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0003_recurring_tasks'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS task_deadline_idx '
+            'ON task (deadline);',
+            'DROP INDEX CONCURRENTLY IF EXISTS task_deadline_idx;',
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_deadline_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Отправляется'), ('sent', 'Отправлено'), ('failed', 'Ошибка')], default='pending', max_length=10)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('curator', models.ForeignKey(db_column='mail', on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(db_column='id_task', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tasks.task')),
+            ],
+            options={
+                'verbose_name': 'Напоминание о дедлайне',
+                'verbose_name_plural': 'Напоминания о дедлайнах',
+                'db_table': 'task_reminder',
+                'constraints': [models.UniqueConstraint(fields=('task', 'curator', 'window'), name='task_reminder_uniq')],
+            },
+        ),
+    ]
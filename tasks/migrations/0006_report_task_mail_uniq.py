@@ -0,0 +1,55 @@
+# Приём отчётов от бота (tasks.ingest) делает INSERT ... ON CONFLICT (id_task, mail),
+# для этого нужен уникальный индекс. Если в report уже есть дубли пары
+# (задача, куратор), миграция останавливается до построения индекса и
+# показывает примеры — их нужно свести вручную и запустить migrate снова.
+
+from django.db import migrations
+
+DUPLICATES_SQL = '''
+SELECT id_task, mail, count(*)
+FROM report
+GROUP BY id_task, mail
+HAVING count(*) > 1
+ORDER BY count(*) DESC
+LIMIT 5
+'''
+
+# Прерванный CREATE INDEX CONCURRENTLY оставляет невалидный индекс, и IF NOT EXISTS
+# его бы пропустил
+INVALID_INDEX_SQL = '''
+SELECT 1 FROM pg_index
+WHERE indexrelid = to_regclass('report_task_mail_uniq') AND NOT indisvalid
+'''
+
+
+def precheck(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(DUPLICATES_SQL)
+        duplicates = cursor.fetchall()
+        if duplicates:
+            examples = ', '.join(f'({id_task}, {mail}) x{count}' for id_task, mail, count in duplicates)
+            raise RuntimeError(
+                f'В report есть дубли пары (id_task, mail), уникальный индекс не построить. '
+                f'Примеры: {examples}. Оставьте по одной строке на пару и повторите migrate.'
+            )
+        cursor.execute(INVALID_INDEX_SQL)
+        if cursor.fetchone():
+            cursor.execute('DROP INDEX CONCURRENTLY report_task_mail_uniq')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0005_task_reminders'),
+    ]
+
+    operations = [
+        migrations.RunPython(precheck, migrations.RunPython.noop),
+        migrations.RunSQL(
+            'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS report_task_mail_uniq '
+            'ON report (id_task, mail);',
+            'DROP INDEX CONCURRENTLY IF EXISTS report_task_mail_uniq;',
+        ),
+    ]
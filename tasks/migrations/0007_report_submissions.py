@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_report_task_mail_uniq'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportSubmission',
+            fields=[
+                ('key', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('curator', models.ForeignKey(db_column='mail', on_delete=django.db.models.deletion.CASCADE, related_name='report_submissions', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(db_column='id_task', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tasks.task')),
+            ],
+            options={
+                'verbose_name': 'Приём отчёта от бота',
+                'verbose_name_plural': 'Приём отчётов от бота',
+                'db_table': 'report_submission',
+            },
+        ),
+    ]
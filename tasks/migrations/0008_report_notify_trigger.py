@@ -0,0 +1,46 @@
+# Уведомления об изменениях отчётов для SSE-потока (tasks.live).
+# Триггеры уровня оператора: массовый UPDATE даёт по одному NOTIFY на задачу,
+# а одинаковые уведомления внутри транзакции PostgreSQL склеивает сам.
+
+from django.db import migrations
+
+CREATE_SQL = '''
+CREATE OR REPLACE FUNCTION report_notify_changes() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('report_changes', id_task) FROM (SELECT DISTINCT id_task FROM old_rows) s;
+    ELSE
+        PERFORM pg_notify('report_changes', id_task) FROM (SELECT DISTINCT id_task FROM new_rows) s;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER report_notify_insert AFTER INSERT ON report
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION report_notify_changes();
+CREATE TRIGGER report_notify_update AFTER UPDATE ON report
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION report_notify_changes();
+CREATE TRIGGER report_notify_delete AFTER DELETE ON report
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION report_notify_changes();
+'''
+
+DROP_SQL = '''
+DROP TRIGGER IF EXISTS report_notify_insert ON report;
+DROP TRIGGER IF EXISTS report_notify_update ON report;
+DROP TRIGGER IF EXISTS report_notify_delete ON report;
+DROP FUNCTION IF EXISTS report_notify_changes();
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_report_submissions'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:44
+
+# Архивные таблицы для tasks.archive: колонки копируются из task/assignment/report
+# через LIKE, внешних ключей нет. Таблицы новые и пустые, поэтому индексы
+# создаются обычным CREATE INDEX в той же транзакции.
+
+from django.db import migrations, models
+
+CREATE_SQL = '''
+CREATE TABLE IF NOT EXISTS task_archive (
+    LIKE task,
+    archived_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (id_task)
+);
+CREATE TABLE IF NOT EXISTS assignment_archive (
+    LIKE assignment,
+    archived_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (id_assignment)
+);
+CREATE TABLE IF NOT EXISTS report_archive (
+    LIKE report,
+    archived_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (id_report)
+);
+CREATE INDEX IF NOT EXISTS task_archive_author_deadline_idx ON task_archive (mail_author, deadline);
+CREATE INDEX IF NOT EXISTS assignment_archive_task_mail_idx ON assignment_archive (id_task, mail);
+CREATE INDEX IF NOT EXISTS report_archive_task_mail_status_idx ON report_archive (id_task, mail, id_status);
+CREATE INDEX IF NOT EXISTS report_archive_mail_idx ON report_archive (mail);
+'''
+
+DROP_SQL = '''
+DROP TABLE IF EXISTS report_archive;
+DROP TABLE IF EXISTS assignment_archive;
+DROP TABLE IF EXISTS task_archive;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_idempotency_keys'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+        migrations.CreateModel(
+            name='ArchivedAssignment',
+            fields=[
+                ('id_assignment', models.IntegerField(db_column='id_assignment', primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField(db_column='archived_at')),
+            ],
+            options={
+                'verbose_name': 'Назначение (архив)',
+                'verbose_name_plural': 'Назначения (архив)',
+                'db_table': 'assignment_archive',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedReport',
+            fields=[
+                ('id_report', models.IntegerField(db_column='id_report', primary_key=True, serialize=False)),
+                ('timestamp_start', models.DateTimeField(db_column='timestamp_start')),
+                ('timestamp_end', models.DateTimeField(blank=True, db_column='timestamp_end', null=True)),
+                ('report_text', models.TextField(blank=True, db_column='report_text', null=True)),
+                ('report_url', models.TextField(blank=True, db_column='report_url', null=True)),
+                ('archived_at', models.DateTimeField(db_column='archived_at')),
+            ],
+            options={
+                'verbose_name': 'Отчёт (архив)',
+                'verbose_name_plural': 'Отчёты (архив)',
+                'db_table': 'report_archive',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id_task', models.CharField(db_column='id_task', max_length=100, primary_key=True, serialize=False)),
+                ('deadline', models.DateTimeField(db_column='deadline')),
+                ('name', models.CharField(db_column='name', max_length=200)),
+                ('description', models.TextField(db_column='description')),
+                ('report', models.TextField(db_column='report')),
+                ('archived_at', models.DateTimeField(db_column='archived_at')),
+            ],
+            options={
+                'verbose_name': 'Задача (архив)',
+                'verbose_name_plural': 'Задачи (архив)',
+                'db_table': 'task_archive',
+                'managed': False,
+            },
+        ),
+    ]
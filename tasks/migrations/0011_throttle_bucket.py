@@ -0,0 +1,23 @@
+from django.db import migrations
+
+# Бакеты umtracker.throttling. UNLOGGED: запись без WAL, после сбоя таблица
+# очищается — для лимитов это нормально, бакеты просто снова полные.
+CREATE_SQL = '''
+CREATE UNLOGGED TABLE IF NOT EXISTS throttle_bucket (
+    key varchar(200) PRIMARY KEY,
+    tokens double precision NOT NULL,
+    allowed boolean NOT NULL,
+    updated_at timestamptz NOT NULL
+)
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_task_archive'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, reverse_sql='DROP TABLE IF EXISTS throttle_bucket'),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-19 11:54
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_throttle_bucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignmentDelivery',
+            fields=[
+                ('assignment', models.OneToOneField(db_column='id_assignment', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='delivery', serialize=False, to='tasks.assignment')),
+                ('status', models.CharField(choices=[('sent', 'Доставлено'), ('partially_sent', 'Доставлено частично'), ('failed', 'Ошибка')], max_length=20)),
+                ('undelivered_tg', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, size=None)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('task', models.ForeignKey(db_column='id_task', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tasks.task')),
+            ],
+            options={
+                'verbose_name': 'Доставка назначения',
+                'verbose_name_plural': 'Доставки назначений',
+                'db_table': 'assignment_delivery',
+                'indexes': [models.Index(fields=['task', 'status'], name='assignment_delivery_task_idx')],
+            },
+        ),
+    ]
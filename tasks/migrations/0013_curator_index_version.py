@@ -0,0 +1,23 @@
+from django.db import migrations
+
+# Версия справочника кураторов для tasks.targeting: одна строка, её увеличивает
+# сигнал сохранения куратора в той же транзакции, а воркеры сверяют со своей
+# копией индекса. Кэш Django у каждого процесса свой, поэтому версия лежит в БД.
+CREATE_SQL = '''
+CREATE TABLE IF NOT EXISTS curator_index_version (
+    id boolean PRIMARY KEY DEFAULT true CHECK (id),
+    version bigint NOT NULL
+);
+INSERT INTO curator_index_version (id, version) VALUES (true, 0) ON CONFLICT (id) DO NOTHING;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_assignment_delivery'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, reverse_sql='DROP TABLE IF EXISTS curator_index_version'),
+    ]
@@ -1,4 +1,7 @@
+from django.contrib.postgres.fields import ArrayField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 from users.models import Curator
 
 
@@ -123,3 +126,314 @@ class Report(models.Model):
 
     def __str__(self):
         return f"Report #{self.id_report} (curator mail: {self.curator_id} -> task {self.task_id})"
+
+
+# Архив (tasks.archive): те же колонки, что у task/assignment/report, плюс archived_at.
+# Таблицы создаёт миграция 0010 без внешних ключей — архив не мешает удалять
+# кураторов и справочники. Модели повторяют имена полей горячих таблиц, чтобы
+# task_cards_queryset и быстрые сериализаторы работали с ними без изменений.
+class ArchivedTask(models.Model):
+    id_task = models.CharField(
+        primary_key=True, max_length=100, db_column="id_task")
+    deadline = models.DateTimeField(db_column="deadline")
+    name = models.CharField(max_length=200, db_column="name")
+    description = models.TextField(db_column="description")
+    report = models.TextField(db_column="report")
+    author = models.ForeignKey(
+        Curator,
+        to_field="email",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_column="mail_author",
+        related_name="+",
+    )
+    archived_at = models.DateTimeField(db_column="archived_at")
+
+    class Meta:
+        db_table = "task_archive"
+        managed = False
+        verbose_name = "Задача (архив)"
+        verbose_name_plural = "Задачи (архив)"
+
+    def __str__(self):
+        return f"{self.id_task}: {self.name}"
+
+
+class ArchivedAssignment(models.Model):
+    id_assignment = models.IntegerField(primary_key=True, db_column="id_assignment")
+    task = models.ForeignKey(
+        ArchivedTask, on_delete=models.DO_NOTHING, db_constraint=False,
+        db_column="id_task", related_name="assignments",
+    )
+    subject = models.ForeignKey(
+        'catalogs.Subject', on_delete=models.DO_NOTHING, db_constraint=False,
+        db_column="id_subject", related_name="+", null=True, blank=True,
+    )
+    department = models.ForeignKey(
+        'catalogs.Department', on_delete=models.DO_NOTHING, db_constraint=False,
+        db_column="id_department", related_name="+", null=True, blank=True,
+    )
+    role = models.ForeignKey(
+        'catalogs.Role', on_delete=models.DO_NOTHING, db_constraint=False,
+        db_column="id_role", related_name="+", null=True, blank=True,
+    )
+    curator = models.ForeignKey(
+        'users.Curator', to_field="email", on_delete=models.DO_NOTHING, db_constraint=False,
+        db_column="mail", related_name="+", null=True, blank=True,
+    )
+    author = models.ForeignKey(
+        'users.Curator', to_field="email", on_delete=models.DO_NOTHING, db_constraint=False,
+        db_column="mail_author", related_name="+",
+    )
+    archived_at = models.DateTimeField(db_column="archived_at")
+
+    class Meta:
+        db_table = "assignment_archive"
+        managed = False
+        verbose_name = "Назначение (архив)"
+        verbose_name_plural = "Назначения (архив)"
+
+    def __str__(self):
+        return f"Assignment #{self.id_assignment} for task {self.task_id}"
+
+
+class ArchivedReport(models.Model):
+    id_report = models.IntegerField(primary_key=True, db_column="id_report")
+    curator = models.ForeignKey(
+        'users.Curator', to_field="email", on_delete=models.DO_NOTHING, db_constraint=False,
+        db_column="mail", related_name="+",
+    )
+    task = models.ForeignKey(
+        ArchivedTask, on_delete=models.DO_NOTHING, db_constraint=False,
+        db_column="id_task", related_name="reports",
+    )
+    status = models.ForeignKey(
+        'catalogs.Status', on_delete=models.DO_NOTHING, db_constraint=False,
+        db_column="id_status", related_name="+",
+    )
+    timestamp_start = models.DateTimeField(db_column="timestamp_start")
+    timestamp_end = models.DateTimeField(db_column="timestamp_end", null=True, blank=True)
+    report_text = models.TextField(db_column="report_text", null=True, blank=True)
+    report_url = models.TextField(db_column="report_url", null=True, blank=True)
+    archived_at = models.DateTimeField(db_column="archived_at")
+
+    class Meta:
+        db_table = "report_archive"
+        managed = False
+        verbose_name = "Отчёт (архив)"
+        verbose_name_plural = "Отчёты (архив)"
+
+    def __str__(self):
+        return f"Report #{self.id_report} (curator mail: {self.curator_id} -> task {self.task_id})"
+
+
+class RecurringTask(models.Model):
+    author = models.ForeignKey(
+        'users.Curator',
+        to_field="email",
+        on_delete=models.CASCADE,
+        db_column="mail_author",
+        related_name="recurring_tasks",
+    )
+    name = models.CharField(max_length=200)
+    description = models.TextField()
+    report = models.TextField()
+
+    schedule = models.CharField(max_length=100)  # cron: "0 9 * * 1"
+    deadline_offset = models.DurationField()
+
+    # те же фильтры получателей, что и в AssignmentInput
+    subject_id = models.IntegerField(null=True, blank=True)
+    department_ids = ArrayField(models.IntegerField(), default=list, blank=True)
+    role_ids = ArrayField(models.IntegerField(), default=list, blank=True)
+    emails = ArrayField(models.CharField(max_length=100), default=list, blank=True)
+
+    active = models.BooleanField(default=True)
+    starts_at = models.DateTimeField(default=timezone.now)
+    last_materialized_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "recurring_task"
+        verbose_name = "Повторяющаяся задача"
+        verbose_name_plural = "Повторяющиеся задачи"
+
+    def __str__(self):
+        return f"{self.name} ({self.schedule})"
+
+
+class RecurringTaskOccurrence(models.Model):
+    template = models.ForeignKey(
+        RecurringTask, on_delete=models.CASCADE, related_name="occurrences"
+    )
+    scheduled_for = models.DateTimeField()
+    # task — unmanaged-таблица, жёсткий FK помешал бы её обслуживанию
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_column="id_task",
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "recurring_task_occurrence"
+        verbose_name = "Запуск повторяющейся задачи"
+        verbose_name_plural = "Запуски повторяющихся задач"
+        constraints = [
+            models.UniqueConstraint(
+                fields=("template", "scheduled_for"), name="recurring_occurrence_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.template_id} @ {self.scheduled_for:%Y-%m-%d %H:%M}"
+
+
+class TaskReminder(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Отправляется"),
+        (STATUS_SENT, "Отправлено"),
+        (STATUS_FAILED, "Ошибка"),
+    )
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_column="id_task",
+        related_name="+",
+    )
+    curator = models.ForeignKey(
+        'users.Curator',
+        to_field="email",
+        on_delete=models.CASCADE,
+        db_column="mail",
+        related_name="reminders",
+    )
+    window = models.CharField(max_length=20)  # "24h", "2h" — см. TASK_REMINDER_WINDOWS
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    error = models.TextField(null=True, blank=True)
+    # Сколько раз напоминание забиралось на отправку и когда в последний раз
+    attempts = models.PositiveSmallIntegerField(default=0)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "task_reminder"
+        verbose_name = "Напоминание о дедлайне"
+        verbose_name_plural = "Напоминания о дедлайнах"
+        constraints = [
+            models.UniqueConstraint(
+                fields=("task", "curator", "window"), name="task_reminder_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id} -> {self.curator_id} ({self.window}, {self.status})"
+
+
+class ReportSubmission(models.Model):
+    # Ключи идемпотентности пакетов от бота: повторно присланный ключ пропускается
+    key = models.CharField(primary_key=True, max_length=100)
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_column="id_task",
+        related_name="+",
+    )
+    curator = models.ForeignKey(
+        'users.Curator',
+        to_field="email",
+        on_delete=models.CASCADE,
+        db_column="mail",
+        related_name="report_submissions",
+    )
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "report_submission"
+        verbose_name = "Приём отчёта от бота"
+        verbose_name_plural = "Приём отчётов от бота"
+
+    def __str__(self):
+        return f"{self.key}: {self.curator_id} -> {self.task_id}"
+
+
+class IdempotencyKey(models.Model):
+    curator = models.ForeignKey(
+        'users.Curator',
+        to_field="email",
+        on_delete=models.CASCADE,
+        db_column="mail",
+        related_name="idempotency_keys",
+    )
+    scope = models.CharField(max_length=50)  # "tasks.create"
+    key = models.CharField(max_length=100)
+    fingerprint = models.CharField(max_length=64)  # sha256 тела запроса
+    status_code = models.PositiveSmallIntegerField()
+    response = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "idempotency_key"
+        verbose_name = "Ключ идемпотентности"
+        verbose_name_plural = "Ключи идемпотентности"
+        constraints = [
+            models.UniqueConstraint(
+                fields=("curator", "scope", "key"), name="idempotency_key_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.key} ({self.curator_id})"
+
+
+class AssignmentDelivery(models.Model):
+    # Итог последней отправки назначения ботом; /redeliver/ повторяет по нему
+    # только недошедшее
+    STATUS_SENT = "sent"
+    STATUS_PARTIAL = "partially_sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_SENT, "Доставлено"),
+        (STATUS_PARTIAL, "Доставлено частично"),
+        (STATUS_FAILED, "Ошибка"),
+    )
+
+    assignment = models.OneToOneField(
+        Assignment,
+        primary_key=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_column="id_assignment",
+        related_name="delivery",
+    )
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_column="id_task",
+        related_name="+",
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    undelivered_tg = ArrayField(models.BigIntegerField(), default=list, blank=True)
+    error = models.TextField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "assignment_delivery"
+        verbose_name = "Доставка назначения"
+        verbose_name_plural = "Доставки назначений"
+        indexes = [
+            models.Index(fields=("task", "status"), name="assignment_delivery_task_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.assignment_id} ({self.status})"
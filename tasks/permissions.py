@@ -0,0 +1,16 @@
+import hmac
+
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+BOT_AUTH_SCHEME = 'Bot'
+
+
+class IsBot(BasePermission):
+    # Внутренние эндпоинты для бота: общий токен вместо JWT пользователя
+    def has_permission(self, request, view):
+        token = settings.BOT_API_TOKEN
+        if not token:
+            return False
+        scheme, _, value = request.headers.get('Authorization', '').partition(' ')
+        return scheme == BOT_AUTH_SCHEME and hmac.compare_digest(value.strip(), token)
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import RecurringTask, RecurringTaskOccurrence
+from .schedules import CronSchedule
+from .services import AssignmentInput, BulkTaskSpec, create_tasks_bulk
+
+# Дальше этого окна пропущенные запуски не досчитываются
+MAX_LOOKBACK = timedelta(days=31)
+
+# Вставка «заявок» на запуски: строка появляется только у одного из
+# конкурирующих планировщиков, остальные получают DO NOTHING и пропускают её.
+CLAIM_SQL = '''
+INSERT INTO recurring_task_occurrence (template_id, scheduled_for, created_at)
+SELECT t, s, now() FROM unnest(%s::bigint[], %s::timestamptz[]) AS x(t, s)
+ON CONFLICT (template_id, scheduled_for) DO NOTHING
+RETURNING id, template_id, scheduled_for
+'''
+
+
+def recipients_of(template: RecurringTask) -> AssignmentInput:
+    return AssignmentInput(
+        subject_id=template.subject_id,
+        department_ids=template.department_ids,
+        role_ids=template.role_ids,
+        emails=template.emails,
+    )
+
+
+def due_occurrences(templates: list[RecurringTask], now: datetime) -> list[tuple[RecurringTask, datetime]]:
+    tz = timezone.get_default_timezone()
+    due = []
+    for t in templates:
+        after = t.last_materialized_at or (t.starts_at - timedelta(microseconds=1))
+        after = max(after, now - MAX_LOOKBACK)
+        moments = CronSchedule(t.schedule).between(after, now, tz)
+        for moment in moments[-settings.RECURRING_TASKS_MAX_CATCHUP:]:
+            due.append((t, moment))
+    return due
+
+
+def materialize_recurring_tasks(now: datetime | None = None) -> dict:
+    now = now or timezone.now()
+    templates = list(
+        RecurringTask.objects
+        .select_related('author', 'author__role')
+        .filter(active=True, starts_at__lte=now)
+        .filter(Q(last_materialized_at__isnull=True) | Q(last_materialized_at__lt=now))
+    )
+    due = due_occurrences(templates, now)
+    stats = {'templates': len(templates), 'due': len(due), 'claimed': 0, 'created': 0, 'failed': 0}
+    if not due:
+        return stats
+
+    by_key = {(t.pk, moment): t for t, moment in due}
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(CLAIM_SQL, [[t.pk for t, _ in due], [moment for _, moment in due]])
+            claimed = cursor.fetchall()
+        stats['claimed'] = len(claimed)
+
+        specs = []
+        for _, template_id, scheduled_for in claimed:
+            t = by_key[(template_id, scheduled_for)]
+            specs.append(BulkTaskSpec(
+                author=t.author,
+                deadline=scheduled_for + t.deadline_offset,
+                name=t.name,
+                description=t.description,
+                report_template=t.report,
+                recipients=recipients_of(t),
+            ))
+        result = create_tasks_bulk(specs)
+
+        occurrences = [
+            RecurringTaskOccurrence(id=occurrence_id, task=task, error=error)
+            for (occurrence_id, _, _), task, error in zip(claimed, result.tasks, result.errors)
+        ]
+        RecurringTaskOccurrence.objects.bulk_update(occurrences, ['task', 'error'])
+        stats['created'] = sum(1 for task in result.tasks if task is not None)
+        stats['failed'] = len(claimed) - stats['created']
+
+        (RecurringTask.objects
+         .filter(pk__in={t.pk for t, _ in due})
+         .update(last_materialized_at=Greatest('last_materialized_at', now)))
+
+    stats['delivery'] = result.delivery.get('summary', {})
+    return stats
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .bot_client import BOT_REMINDERS, bot_ping, bot_send_reminders
+from .constants import COMPLETED_STATUSES, EXCLUDE_FROM_TOTAL_STATUSES
+from .models import TaskReminder
+
+WINDOW_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+
+# Одним запросом: задачи, чей дедлайн попал в самое узкое из окон
+# (диапазон по task_deadline_idx), их получатели с Telegram без закрытого
+# отчёта — и сразу запись напоминаний. Уже записанные пары (задача,
+# куратор, окно) отсекает task_reminder_uniq; заново забираются только
+# неудачные с попытками в запасе и зависшие в pending (процесс рассылки упал
+# между записью и вызовом бота). Поэтому напоминание может прийти дважды,
+# но не теряется.
+CLAIM_SQL = '''
+WITH windows AS (
+    SELECT label, span FROM unnest(%(labels)s::text[], %(spans)s::interval[]) AS w(label, span)
+), due AS (
+    SELECT t.id_task,
+           (SELECT w.label FROM windows w WHERE t.deadline <= %(now)s + w.span ORDER BY w.span LIMIT 1) AS win
+    FROM task t
+    WHERE t.deadline > %(now)s AND t.deadline <= %(now)s + %(widest)s
+), targets AS (
+    SELECT d.id_task, d.win, c.mail
+    FROM due d
+    JOIN assignment a ON a.id_task = d.id_task AND a.mail IS NOT NULL
+    JOIN curator c ON c.mail = a.mail
+    WHERE c.id_tg IS NOT NULL
+    UNION
+    SELECT d.id_task, d.win, c.mail
+    FROM due d
+    JOIN assignment a ON a.id_task = d.id_task AND a.mail IS NULL
+    JOIN curator c ON c.id_subject = a.id_subject AND c.id_department = a.id_department AND c.id_role = a.id_role
+    WHERE c.id_tg IS NOT NULL
+), claimed AS (
+    INSERT INTO task_reminder AS tr (id_task, mail, "window", status, attempts, claimed_at, created_at)
+    SELECT tg.id_task, tg.mail, tg.win, %(pending)s, 1, %(now)s, %(now)s
+    FROM targets tg
+    WHERE NOT EXISTS (
+        SELECT 1 FROM report r
+        WHERE r.id_task = tg.id_task AND r.mail = tg.mail AND r.id_status = ANY(%(done)s)
+    )
+    ON CONFLICT (id_task, mail, "window") DO UPDATE SET
+        status = %(pending)s,
+        attempts = tr.attempts + 1,
+        claimed_at = %(now)s,
+        error = NULL
+    WHERE (tr.status = %(failed)s AND tr.attempts < %(max_attempts)s)
+       OR (tr.status = %(pending)s AND COALESCE(tr.claimed_at, tr.created_at) < %(stale_before)s)
+    RETURNING tr.id, tr.id_task, tr.mail, tr."window"
+)
+SELECT cl.id, c.id_tg, cl.id_task, t.name, t.deadline, cl."window"
+FROM claimed cl
+JOIN curator c ON c.mail = cl.mail
+JOIN task t ON t.id_task = cl.id_task
+ORDER BY cl.id
+'''
+
+
+def parse_window(value: str) -> timedelta:
+    value = value.strip()
+    unit = WINDOW_UNITS.get(value[-1:])
+    if unit is None or not value[:-1].isdigit():
+        raise ValueError(f'Окно напоминания должно быть вида 30m, 2h или 1d: "{value}"')
+    return timedelta(**{unit: int(value[:-1])})
+
+
+def reminder_windows() -> list[tuple[str, timedelta]]:
+    windows = [(w.strip(), parse_window(w)) for w in settings.TASK_REMINDER_WINDOWS if w.strip()]
+    return sorted(windows, key=lambda w: w[1])
+
+
+def claim_reminders(now: datetime, windows: list[tuple[str, timedelta]]) -> list[tuple]:
+    with connection.cursor() as cursor:
+        cursor.execute(CLAIM_SQL, {
+            'labels': [label for label, _ in windows],
+            'spans': [span for _, span in windows],
+            'widest': windows[-1][1],
+            'now': now,
+            'pending': TaskReminder.STATUS_PENDING,
+            'failed': TaskReminder.STATUS_FAILED,
+            'max_attempts': settings.TASK_REMINDER_MAX_ATTEMPTS,
+            'stale_before': now - timedelta(minutes=settings.TASK_REMINDER_CLAIM_TIMEOUT_MIN),
+            'done': list(COMPLETED_STATUSES + EXCLUDE_FROM_TOTAL_STATUSES),
+        })
+        return cursor.fetchall()
+
+
+def send_deadline_reminders(now: datetime | None = None) -> dict:
+    now = now or timezone.now()
+    windows = reminder_windows()
+    stats = {'claimed': 0, 'sent': 0, 'failed': 0, 'bot_unavailable': False, 'disabled': False}
+    # Без поддержки /send-reminders на стороне бота ничего не записываем
+    if not BOT_REMINDERS:
+        stats['disabled'] = True
+        return stats
+    if not windows:
+        return stats
+
+    # Пока бот недоступен, ничего не записываем — напоминания уйдут при следующем запуске
+    if not bot_ping():
+        stats['bot_unavailable'] = True
+        return stats
+
+    claimed = claim_reminders(now, windows)
+    stats['claimed'] = len(claimed)
+    if not claimed:
+        return stats
+
+    results = bot_send_reminders([
+        {'id_tg': id_tg, 'id_task': id_task, 'name': name, 'deadline': deadline.isoformat(), 'window': window}
+        for _, id_tg, id_task, name, deadline, window in claimed
+    ])
+
+    sent_at = timezone.now()
+    reminders = []
+    for (reminder_id, *_), r in zip(claimed, results):
+        sent = r['status'] == 'sent'
+        reminders.append(TaskReminder(
+            id=reminder_id,
+            status=TaskReminder.STATUS_SENT if sent else TaskReminder.STATUS_FAILED,
+            error=r['error'],
+            sent_at=sent_at if sent else None,
+        ))
+        stats['sent' if sent else 'failed'] += 1
+    TaskReminder.objects.bulk_update(reminders, ['status', 'error', 'sent_at'], batch_size=500)
+    return stats
@@ -0,0 +1,79 @@
+from datetime import date, datetime, time, timedelta, tzinfo
+
+# Минимальный разбор cron-выражений из 5 полей: минута, час, день месяца,
+# месяц, день недели (0 и 7 — воскресенье). Поддерживаются *, списки,
+# диапазоны и шаги: "0 9 * * 1", "*/30 8-20 * * 1-5", "0 10 1,15 * *".
+FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 7),
+)
+
+
+def _parse_field(expr: str, lo: int, hi: int) -> frozenset[int]:
+    values: set[int] = set()
+    for part in expr.split(','):
+        base, _, step_s = part.partition('/')
+        step = int(step_s) if step_s else 1
+        if step < 1:
+            raise ValueError(f'Неверный шаг в "{part}"')
+
+        if base == '*':
+            start, end = lo, hi
+        elif '-' in base:
+            a, b = base.split('-', 1)
+            start, end = int(a), int(b)
+        else:
+            start = int(base)
+            end = hi if step_s else start
+
+        if not (lo <= start <= hi and lo <= end <= hi and start <= end):
+            raise ValueError(f'Значение "{part}" вне диапазона {lo}-{hi}')
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    def __init__(self, expr: str):
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError('Расписание должно состоять из 5 полей: мин час день месяц день_недели')
+        try:
+            parsed = [_parse_field(p, lo, hi) for p, (_, lo, hi) in zip(parts, FIELDS)]
+        except ValueError as e:
+            raise ValueError(f'Неверное расписание "{expr}": {e}') from None
+
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = frozenset(0 if d == 7 else d for d in weekdays)
+        self._any_day = parts[2].startswith('*')
+        self._any_weekday = parts[4].startswith('*')
+
+    def _day_matches(self, d: date) -> bool:
+        if d.month not in self.months:
+            return False
+        in_days = d.day in self.days
+        in_weekdays = (d.isoweekday() % 7) in self.weekdays
+        # Как в cron: если ограничены оба поля, достаточно совпадения любого
+        if self._any_day:
+            return in_weekdays
+        if self._any_weekday:
+            return in_days
+        return in_days or in_weekdays
+
+    def between(self, after: datetime, until: datetime, tz: tzinfo) -> list[datetime]:
+        # Моменты срабатывания в полуинтервале (after, until]
+        local_after, local_until = after.astimezone(tz), until.astimezone(tz)
+        out: list[datetime] = []
+        day = local_after.date()
+        while day <= local_until.date():
+            if self._day_matches(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        moment = datetime.combine(day, time(hour, minute), tzinfo=tz)
+                        if local_after < moment <= local_until:
+                            out.append(moment)
+            day += timedelta(days=1)
+        return out
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Task, Report
+from .models import Task, Report, RecurringTask
+from .schedules import CronSchedule
 from .constants import COMPLETED_STATUS, COMPLETED_LATE_STATUS, NOT_COMPLETED_STATUS
 Curator = get_user_model()
 
@@ -43,6 +44,11 @@ class TaskCreateSerializer(serializers.Serializer):
         return attrs
 
 
+class ReportStatusUpdateSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=('completed', 'not_completed'))
+    emails = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+
+
 class RecipientCuratorSerializer(serializers.ModelSerializer):
     role = serializers.CharField(source='role.role', read_only=True)
     subject = serializers.CharField(source='subject.subject', read_only=True)
@@ -87,6 +93,19 @@ STATUS_MAP = {
     NOT_COMPLETED_STATUS:     'not_completed',
 }
 
+STATUS_IDS = {name: status_id for status_id, name in STATUS_MAP.items()}
+
+
+class ReportSubmissionItemSerializer(serializers.Serializer):
+    key = serializers.CharField(max_length=100)
+    id_task = serializers.CharField(max_length=100)
+    email = serializers.CharField(max_length=100)
+    status = serializers.ChoiceField(choices=tuple(STATUS_IDS))
+    timestamp_start = serializers.DateTimeField(required=False, allow_null=True)
+    timestamp_end = serializers.DateTimeField(required=False, allow_null=True)
+    report_text = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    report_url = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+
 
 class TaskDetailSerializer(serializers.ModelSerializer):
     email = serializers.CharField(source='curator.email', read_only=True)
@@ -132,3 +151,38 @@ class ReportDetailSerializer(serializers.ModelSerializer):
 
     def get_status(self, obj):
         return STATUS_MAP.get(getattr(obj, 'status_id', None), 'not_completed')
+
+
+class RecurringTaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RecurringTask
+        fields = ('id', 'name', 'description', 'report', 'schedule', 'deadline_offset',
+                  'subject_id', 'department_ids', 'role_ids', 'emails',
+                  'active', 'starts_at', 'last_materialized_at', 'created_at')
+        read_only_fields = ('last_materialized_at', 'created_at')
+
+    def validate_schedule(self, value):
+        try:
+            CronSchedule(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+    def validate_deadline_offset(self, value):
+        if value.total_seconds() <= 0:
+            raise serializers.ValidationError('Срок должен быть положительным.')
+        return value
+
+    def validate(self, attrs):
+        def get(key):
+            if key in attrs:
+                return attrs[key]
+            return getattr(self.instance, key, None)
+
+        if get('emails'):
+            return attrs
+        if not get('subject_id') or not get('department_ids') or not get('role_ids'):
+            raise serializers.ValidationError(
+                'Для группового назначения укажите subject_id, department_ids и role_ids.'
+            )
+        return attrs
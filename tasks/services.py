@@ -1,44 +1,72 @@
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Iterable, Optional
 from django.db import transaction, connection
+from django.utils import timezone
 from users.models import Curator
-from tasks.models import Task, Assignment, Report
+from tasks.models import (
+    Task, Assignment, Report, ArchivedTask, ArchivedAssignment, ArchivedReport, AssignmentDelivery
+)
 from catalogs.models import Subject
-from .policies import allowed_recipients_base_qs
+from users.policies import allowed_recipients_base_qs
+from umtracker.metrics import observe_deliveries, task_phase
 from django.db.models import (
     Q, Count, F, Case, When, Value, QuerySet, FloatField, CharField,
     Min, OuterRef, Subquery, Exists
 )
 from django.contrib.postgres.aggregates import ArrayAgg
-from .constants import EXCLUDE_FROM_TOTAL_STATUSES, COMPLETED_STATUSES
+from .constants import (
+    EXCLUDE_FROM_TOTAL_STATUSES, COMPLETED_STATUSES, COMPLETED_STATUS, COMPLETED_LATE_STATUS,
+    NOT_COMPLETED_STATUS, CANCELLED_STATUS, ARCHIVED_SCOPE
+)
 from .bot_client import (
+    BOT_PARTIAL_RESEND,
     bot_ping,
-    bot_send_assignment,
+    bot_send_assignments,
 )
 
 
-def _next_task_id_for_subject(subject_id: int | None) -> str:
-    lock_id = subject_id or 0
+def _task_id_prefixes(subject_ids: Iterable[int | None]) -> dict[int | None, str]:
+    prefixes: dict[int | None, str] = {sid: 'tsk' for sid in subject_ids}
+    wanted = [sid for sid in prefixes if sid]
+    if wanted:
+        for sid, name in Subject.objects.filter(pk__in=wanted).values_list('id_subject', 'subject'):
+            prefixes[sid] = (name or '').strip().lower()[:3] or 'tsk'
+    return prefixes
 
-    prefix = 'tsk'
-    if subject_id:
-        subj = Subject.objects.filter(pk=subject_id).only('subject').first()
-        if subj and getattr(subj, 'subject', None):
-            prefix = (subj.subject or '').strip().lower()[:3] or 'tsk'
-
-    with connection.cursor() as cursor:
-        cursor.execute('SELECT pg_advisory_xact_lock(%s);', [lock_id])
 
-        max_num = 0
-        for task_id in Task.objects.filter(id_task__startswith=f'{prefix}-').values_list('id_task', flat=True):
-            try:
-                suffix = str(task_id).split('-', 1)[1]
-                num = int(suffix)
-                if num > max_num:
-                    max_num = num
-            except Exception:
-                continue
+def allocate_task_ids(subject_ids: list[int | None]) -> list[str]:
+    # Вызывать внутри transaction.atomic(): xact-блокировки держатся до коммита
+    prefixes = _task_id_prefixes(subject_ids)
 
-        return f'{prefix}-{max_num + 1}'
+    with connection.cursor() as cursor:
+        for lock_id in sorted({sid or 0 for sid in subject_ids}):
+            cursor.execute('SELECT pg_advisory_xact_lock(%s);', [lock_id])
+
+    max_by_prefix = {prefix: 0 for prefix in prefixes.values()}
+    cond = Q()
+    for prefix in max_by_prefix:
+        cond |= Q(id_task__startswith=f'{prefix}-')
+
+    # Архивные номера тоже заняты: иначе новая задача получила бы id задачи из архива
+    existing = Task.objects.filter(cond).values_list('id_task', flat=True).union(
+        ArchivedTask.objects.filter(cond).values_list('id_task', flat=True))
+    for task_id in existing:
+        prefix, _, suffix = str(task_id).partition('-')
+        try:
+            num = int(suffix)
+        except ValueError:
+            continue
+        if prefix in max_by_prefix and num > max_by_prefix[prefix]:
+            max_by_prefix[prefix] = num
+
+    ids = []
+    for sid in subject_ids:
+        prefix = prefixes[sid]
+        max_by_prefix[prefix] += 1
+        ids.append(f'{prefix}-{max_by_prefix[prefix]}')
+    return ids
 
 
 class AssignmentInput:
@@ -78,6 +106,264 @@ def build_targets_qs(author: Curator, inp: AssignmentInput) -> QuerySet[Curator]
     return base
 
 
+def recipients_typeahead(
+    author: Curator,
+    inp: AssignmentInput,
+    *,
+    q: str = '',
+    after: tuple[str, str] | None = None,
+    limit: int,
+) -> QuerySet[Curator]:
+    # Префикс по имени/почте (curator_*_prefix_idx) и keyset по (name, mail)
+    qs = build_targets_qs(author, inp)
+    if q:
+        qs = qs.filter(Q(name__istartswith=q) | Q(email__istartswith=q))
+    if after:
+        name, email = after
+        # name >= ... отдельно, чтобы стать условием индекса, а не фильтром
+        qs = qs.filter(Q(name__gte=name), Q(name__gt=name) | Q(email__gt=email))
+    return qs.order_by('name', 'email')[:limit]
+
+
+def build_assignments(task: Task, author: Curator, recipients: AssignmentInput, curators) -> list[Assignment]:
+    if recipients.single_email or recipients.emails:
+        return [
+            Assignment(
+                task=task,
+                subject_id=curator.subject_id,
+                department_id=curator.department_id,
+                role_id=curator.role_id,
+                curator_id=curator.email,
+                author=author
+            )
+            for curator in curators
+        ]
+
+    if not (recipients.subject_id and recipients.department_ids and recipients.role_ids):
+        raise ValueError('Для группового назначения укажите subject_id, department_ids и role_ids.')
+    return [
+        Assignment(
+            task=task,
+            subject_id=recipients.subject_id,
+            department_id=department_id,
+            role_id=role_id,
+            curator=None,
+            author=author
+        )
+        for department_id in recipients.department_ids
+        for role_id in recipients.role_ids
+    ]
+
+
+def _save_delivery_outcomes(a_by_id: dict[int, Assignment], rows: list[dict], tg_ids: dict[int, list[int]]):
+    outcomes = []
+    for r in rows:
+        a_id, status, undelivered = r['assignment_id'], r['status'], r['undelivered_tg']
+        if status == AssignmentDelivery.STATUS_FAILED and not undelivered and tg_ids.get(a_id):
+            # Повтор по части получателей не прошёл: остальным сообщение уже доставлено,
+            # в следующий раз снова нужны только эти
+            status, undelivered = AssignmentDelivery.STATUS_PARTIAL, tg_ids[a_id]
+        outcomes.append(AssignmentDelivery(
+            assignment_id=a_id, task_id=a_by_id[a_id].task_id,
+            status=status, undelivered_tg=undelivered, error=r['error'],
+        ))
+    AssignmentDelivery.objects.bulk_create(
+        outcomes, update_conflicts=True, unique_fields=['assignment'],
+        update_fields=['status', 'undelivered_tg', 'error', 'updated_at'],
+    )
+
+
+def deliver_assignments(assignments: list[Assignment], tg_ids: dict[int, list[int]] | None = None) -> dict:
+    # tg_ids — повторная доставка только части получателей, см. redeliver_task
+    tg_ids = tg_ids or {}
+    assignment_ids = [a.id_assignment for a in assignments]
+    a_by_id = {a.id_assignment: a for a in assignments}
+    result: dict = {
+        'ok': None,
+        'bot_unavailable': False,
+        'assignments': [],
+        'summary': {
+            'total': 0,
+            'sent': 0,
+            'partial': 0,
+            'failed': 0,
+        },
+    }
+
+    if not bot_ping():
+        _save_delivery_outcomes(a_by_id, [
+            {'assignment_id': a_id, 'status': AssignmentDelivery.STATUS_FAILED,
+             'undelivered_tg': [], 'error': 'bot_unavailable'}
+            for a_id in assignment_ids
+        ], tg_ids)
+        result['ok'] = False
+        result['bot_unavailable'] = True
+        result['summary'] = {
+            'total': len(assignment_ids),
+            'sent': 0,
+            'partial': 0,
+            'failed': len(assignment_ids),
+        }
+        observe_deliveries(result['summary'])
+        return result
+
+    tg_by_email = dict(
+        Curator.objects
+        .filter(email__in={a.curator_id for a in assignments if a.curator_id})
+        .values_list('email', 'id_tg')
+    )
+
+    no_tg = {a_id for a_id in assignment_ids
+             if a_by_id[a_id].curator_id and not tg_by_email.get(a_by_id[a_id].curator_id)}
+    responses = {r['assignment_id']: r
+                 for r in bot_send_assignments([a_id for a_id in assignment_ids if a_id not in no_tg], tg_ids)}
+
+    total = len(assignment_ids)
+    sent = partial = failed = 0
+    detailed: list[dict] = []
+    all_undelivered_tg: list[int] = []
+
+    for a_id in assignment_ids:
+        if a_id in no_tg:
+            detailed.append({
+                'assignment_id': a_id,
+                'status': 'failed',
+                'undelivered_tg': [],
+                'error': 'no_id_tg',
+            })
+            failed += 1
+            continue
+
+        r = responses[a_id]
+
+        undelivered = (r.get('undelivered_tg') or r.get('undelivered') or [])
+        is_individual = bool(a_by_id[a_id].curator_id)
+        status = r.get('status')
+
+        if status != 'sent':
+            if is_individual and undelivered:
+                status = 'failed'
+            elif undelivered and status != 'failed':
+                status = 'partially_sent'
+            elif r.get('error'):
+                status = 'failed'
+
+        if status == 'sent':
+            sent += 1
+        elif status == 'partially_sent':
+            partial += 1
+        else:
+            failed += 1
+
+        all_undelivered_tg.extend(undelivered)
+        detailed.append({
+            'assignment_id': a_id,
+            'status': status,
+            'undelivered_tg': undelivered,
+            'error': r.get('error')
+        })
+
+    _save_delivery_outcomes(a_by_id, detailed, tg_ids)
+
+    id_to_name = dict(
+        Curator.objects
+        .filter(id_tg__in=all_undelivered_tg)
+        .values_list('id_tg', 'name')
+    ) if all_undelivered_tg else {}
+
+    for row in detailed:
+        names = [id_to_name.get(tg_id, str(tg_id)) for tg_id in row.pop('undelivered_tg', [])]
+        row['undelivered_names'] = names
+
+    result['assignments'] = detailed
+    result['summary'] = {
+        'total': total,
+        'sent': sent,
+        'partial': partial,
+        'failed': failed,
+    }
+    observe_deliveries(result['summary'])
+    result['ok'] = (failed == 0)
+    result['undelivered_names_all'] = [
+        id_to_name.get(tg_id, str(tg_id)) for tg_id in all_undelivered_tg
+    ]
+    return result
+
+
+def _deliver_created(assignments: list[Assignment]) -> dict:
+    with task_phase('deliver'):
+        return deliver_assignments(assignments)
+
+
+def redeliver_task(task: Task) -> dict | None:
+    # Повторяет только недошедшее: назначения с ошибкой — целиком, частично
+    # доставленные — лишь по недоставленным id_tg (если бот это умеет,
+    # TASK_BOT_PARTIAL_RESEND; иначе они пропускаются, чтобы не слать сообщение
+    # повторно тем, кто его уже получил). Назначения без сохранённого итога
+    # (созданные до assignment_delivery) не трогаются.
+    # None — по этой задаче уже идёт повторная отправка.
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(hashtext('redeliver:' || %s))", [task.id_task])
+        if not cursor.fetchone()[0]:
+            return None
+    try:
+        retry = [AssignmentDelivery.STATUS_FAILED]
+        if BOT_PARTIAL_RESEND:
+            retry.append(AssignmentDelivery.STATUS_PARTIAL)
+        pending = list(
+            AssignmentDelivery.objects
+            .filter(task=task, status__in=retry)
+            .select_related('assignment')
+        )
+        if not pending:
+            return {
+                'ok': True,
+                'bot_unavailable': False,
+                'assignments': [],
+                'summary': {'total': 0, 'sent': 0, 'partial': 0, 'failed': 0},
+            }
+        tg_ids = {
+            d.assignment_id: d.undelivered_tg
+            for d in pending if d.status == AssignmentDelivery.STATUS_PARTIAL and d.undelivered_tg
+        }
+        return deliver_assignments([d.assignment for d in pending], tg_ids)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(hashtext('redeliver:' || %s))", [task.id_task])
+
+
+# Один pending-отчёт на каждого куратора, до которого дошло назначение:
+# персональные — по mail, групповые — по ячейке предмет/отдел/роль.
+PENDING_REPORTS_SQL = '''
+INSERT INTO report (id_task, mail, id_status, timestamp_start)
+SELECT id_task, mail, %(status)s, now() FROM (
+    SELECT a.id_task, a.mail
+    FROM assignment a
+    WHERE a.id_task = ANY(%(task_ids)s) AND a.mail IS NOT NULL
+    UNION
+    SELECT a.id_task, c.mail
+    FROM assignment a
+    JOIN curator c ON c.id_subject = a.id_subject AND c.id_department = a.id_department AND c.id_role = a.id_role
+    WHERE a.id_task = ANY(%(task_ids)s) AND a.mail IS NULL
+) targets
+ON CONFLICT (id_task, mail) DO NOTHING
+RETURNING id_task
+'''
+
+
+def create_pending_reports(task_ids: list[str]) -> Counter[str]:
+    # Вызывается внутри транзакции создания задачи, сразу после вставки назначений.
+    # Число созданных отчётов по каждой задаче; задач без отчётов в ответе нет
+    if not task_ids:
+        return Counter()
+    with connection.cursor() as cursor:
+        cursor.execute(PENDING_REPORTS_SQL, {'status': NOT_COMPLETED_STATUS, 'task_ids': task_ids})
+        return Counter(id_task for id_task, in cursor.fetchall())
+
+
+NO_TARGETS_MESSAGE = 'Нет ни одного получателя по вашим правам/фильтрам.'
+
+
 def create_task_and_assign(
     *,
     author: Curator,
@@ -88,12 +374,11 @@ def create_task_and_assign(
     recipients: AssignmentInput
 ) -> tuple[Task, list[Assignment], dict]:
     qs_allowed = build_targets_qs(author, recipients)
-    if not qs_allowed.exists():
-        raise ValueError('Нет ни одного получателя по вашим правам/фильтрам.')
-
-    task_id = _next_task_id_for_subject(
-        recipients.subject_id or getattr(author, 'subject_id', None)
-    )
+    # Только БД: битовый индекс (tasks.targeting) может отставать и годится лишь для матрицы
+    with task_phase('targets'):
+        no_targets = not qs_allowed.exists()
+    if no_targets:
+        raise ValueError(NO_TARGETS_MESSAGE)
 
     delivery_result: dict = {
         'ok': None,
@@ -107,10 +392,11 @@ def create_task_and_assign(
         },
     }
 
-    assignments: list[Assignment] = []
-    assignment_ids: list[int] = []
-
-    with transaction.atomic():
+    # task_phase закрывается раньше atomic: доставка в on_commit — отдельная фаза
+    with transaction.atomic(), task_phase('insert'):
+        task_id, = allocate_task_ids(
+            [recipients.subject_id or getattr(author, 'subject_id', None)]
+        )
         task = Task.objects.create(
             id_task=task_id,
             deadline=deadline,
@@ -120,136 +406,199 @@ def create_task_and_assign(
             author=author
         )
 
-        is_individual = bool(recipients.single_email or recipients.emails)
-
-        if is_individual:
+        curators = None
+        if recipients.single_email or recipients.emails:
             curators = list(qs_allowed)
             if not curators:
                 raise ValueError('Получатель не найден или недоступен.')
-            for curator in curators:
-                a = Assignment.objects.create(
-                    task=task,
-                    subject=curator.subject,
-                    department=curator.department,
-                    role=curator.role,
-                    curator=curator,
-                    author=author
-                )
-                assignments.append(a)
-                assignment_ids.append(a.id_assignment)
 
-        else:
-            if not (recipients.subject_id and recipients.department_ids and recipients.role_ids):
-                raise ValueError('Для группового назначения укажите subject_id, department_ids и role_ids.')
-            for department_id in recipients.department_ids:
-                for role_id in recipients.role_ids:
-                    a = Assignment.objects.create(
-                        task=task,
-                        subject_id=recipients.subject_id,
-                        department_id=department_id,
-                        role_id=role_id,
-                        curator=None,
-                        author=author
-                    )
-                    assignments.append(a)
-                    assignment_ids.append(a.id_assignment)
-
-        def _after_commit():
-            if not bot_ping():
-                delivery_result['ok'] = False
-                delivery_result['bot_unavailable'] = True
-                delivery_result['summary'] = {
-                    'total': len(assignment_ids),
-                    'sent': 0,
-                    'partial': 0,
-                    'failed': len(assignment_ids),
-                }
-                return
-
-            a_by_id = {a.id_assignment: a for a in assignments}
-
-            total = len(assignment_ids)
-            sent = partial = failed = 0
-            detailed: list[dict] = []
-            all_undelivered_tg: list[int] = []
-
-            for a_id in assignment_ids:
-                a = a_by_id[a_id]
-                cur = a.curator
-
-                if cur and not cur.id_tg:
-                    detailed.append({
-                        'assignment_id': a_id,
-                        'status': 'failed',
-                        'undelivered_tg': [],
-                        'error': 'no_id_tg',
-                    })
-                    failed += 1
-                    continue
-
-                r = bot_send_assignment(a_id)
-
-                undelivered = (r.get('undelivered_tg') or r.get('undelivered') or [])
-                is_individual = bool(a_by_id.get(a_id) and a_by_id[a_id].curator_id)
-                status = r.get('status')
-
-                if status != 'sent':
-                    if is_individual and undelivered:
-                        status = 'failed'
-                    elif undelivered and status != 'failed':
-                        status = 'partially_sent'
-                    elif r.get('error'):
-                        status = 'failed'
-
-                if status == 'sent':
-                    sent += 1
-                elif status == 'partially_sent':
-                    partial += 1
-                else:
-                    failed += 1
-
-                all_undelivered_tg.extend(undelivered)
-                detailed.append({
-                    'assignment_id': a_id,
-                    'status': status,
-                    'undelivered_tg': undelivered,
-                    'error': r.get('error')
-                })
-
-            id_to_name = dict(
-                Curator.objects
-                .filter(id_tg__in=all_undelivered_tg)
-                .values_list('id_tg', 'name')
+        assignments = Assignment.objects.bulk_create(
+            build_assignments(task, author, recipients, curators))
+        # Получатели могли исчезнуть между проверкой и вставкой — тогда откатываем задачу
+        if not create_pending_reports([task.id_task])[task.id_task]:
+            raise ValueError(NO_TARGETS_MESSAGE)
+
+        transaction.on_commit(lambda: delivery_result.update(_deliver_created(assignments)))
+
+    return task, assignments, delivery_result
+
+
+@dataclass(frozen=True)
+class Recipient:
+    email: str
+    subject_id: int
+    department_id: int
+    role_id: int
+
+
+@dataclass
+class BulkTaskSpec:
+    author: Curator
+    deadline: datetime
+    name: str
+    description: str
+    report_template: str
+    recipients: AssignmentInput
+
+
+def _recipients_key(spec: BulkTaskSpec) -> tuple:
+    inp = spec.recipients
+    return (
+        spec.author.email, inp.single_email, tuple(inp.emails or ()), inp.subject_id,
+        tuple(inp.department_ids or ()), tuple(inp.role_ids or ()),
+    )
+
+
+def resolve_recipients(specs: list[BulkTaskSpec]) -> list[list[Recipient]]:
+    # Те же build_targets_qs, что и при создании одной задачи, — по одному на каждый
+    # различный набор фильтров, склеенные в один UNION ALL
+    first_spec: dict[tuple, BulkTaskSpec] = {}
+    for spec in specs:
+        first_spec.setdefault(_recipients_key(spec), spec)
+    if not first_spec:
+        return []
+    key_index = {key: k for k, key in enumerate(first_spec)}
+
+    parts = [
+        build_targets_qs(first_spec[key].author, first_spec[key].recipients)
+        .annotate(spec_key=Value(k))
+        .values_list('spec_key', 'email', 'subject_id', 'department_id', 'role_id')
+        for key, k in key_index.items()
+    ]
+    by_key: dict[int, list[Recipient]] = {k: [] for k in key_index.values()}
+    for k, *values in parts[0].union(*parts[1:], all=True):
+        by_key[k].append(Recipient(*values))
+    return [by_key[key_index[_recipients_key(spec)]] for spec in specs]
+
+
+@dataclass
+class BulkCreateResult:
+    tasks: list[Task | None]
+    errors: list[str | None]
+    # Число созданных pending-отчётов по каждой строке (0 — задача не создана)
+    reports: list[int]
+    assignments: list[Assignment]
+    delivery: dict
+
+
+def create_tasks_bulk(specs: list[BulkTaskSpec]) -> BulkCreateResult:
+    result = BulkCreateResult(
+        tasks=[None] * len(specs),
+        errors=[None] * len(specs),
+        reports=[0] * len(specs),
+        assignments=[],
+        delivery={},
+    )
+
+    accepted: list[tuple[int, list[Recipient]]] = []
+    with task_phase('targets'):
+        resolved = resolve_recipients(specs)
+    for i, (spec, recipients) in enumerate(zip(specs, resolved)):
+        if not recipients:
+            result.errors[i] = NO_TARGETS_MESSAGE
+            continue
+        inp = spec.recipients
+        if not (inp.single_email or inp.emails) and not (inp.subject_id and inp.department_ids and inp.role_ids):
+            result.errors[i] = 'Для группового назначения укажите subject_id, department_ids и role_ids.'
+            continue
+        accepted.append((i, recipients))
+
+    if not accepted:
+        return result
+
+    with transaction.atomic(), task_phase('insert'):
+        task_ids = allocate_task_ids([
+            specs[i].recipients.subject_id or getattr(specs[i].author, 'subject_id', None)
+            for i, _ in accepted
+        ])
+        created = [
+            Task(
+                id_task=task_id,
+                deadline=specs[i].deadline,
+                name=specs[i].name,
+                description=specs[i].description,
+                report=specs[i].report_template,
+                author=specs[i].author
             )
+            for task_id, (i, _) in zip(task_ids, accepted)
+        ]
+        Task.objects.bulk_create(created)
 
-            for row in detailed:
-                names = [id_to_name.get(tg_id, str(tg_id)) for tg_id in row.pop('undelivered_tg', [])]
-                row['undelivered_names'] = names
+        assignments = Assignment.objects.bulk_create([
+            a
+            for task, (i, recipients) in zip(created, accepted)
+            for a in build_assignments(task, specs[i].author, specs[i].recipients, recipients)
+        ])
+        reports = create_pending_reports([task.id_task for task in created])
+        # Получатели могли исчезнуть между выборкой и вставкой — такие задачи убираем
+        empty = {task.id_task for task in created if not reports[task.id_task]}
+        if empty:
+            Assignment.objects.filter(task_id__in=empty).delete()
+            Task.objects.filter(pk__in=empty).delete()
+        for task, (i, _) in zip(created, accepted):
+            if task.id_task in empty:
+                result.errors[i] = NO_TARGETS_MESSAGE
+            else:
+                result.tasks[i] = task
+                result.reports[i] = reports[task.id_task]
+        result.assignments = [a for a in assignments if a.task_id not in empty]
 
-            delivery_result['assignments'] = detailed
-            delivery_result['summary'] = {
-                'total': total,
-                'sent': sent,
-                'partial': partial,
-                'failed': failed,
-            }
-            delivery_result['ok'] = (failed == 0)
-            delivery_result['undelivered_names_all'] = [
-                id_to_name.get(tg_id, str(tg_id)) for tg_id in all_undelivered_tg
-            ]
+        if result.assignments:
+            transaction.on_commit(lambda: result.delivery.update(_deliver_created(result.assignments)))
 
-        transaction.on_commit(_after_commit)
+    return result
 
-    return task, assignments, delivery_result
+
+@dataclass(frozen=True)
+class TaskTables:
+    task: type[Task] | type[ArchivedTask]
+    assignment: type[Assignment] | type[ArchivedAssignment]
+    report: type[Report] | type[ArchivedReport]
+
+
+HOT_TABLES = TaskTables(Task, Assignment, Report)
+ARCHIVE_TABLES = TaskTables(ArchivedTask, ArchivedAssignment, ArchivedReport)
+
+
+def task_tables(scope: str | None) -> TaskTables:
+    # Архив читается только по явному ?scope=archived
+    return ARCHIVE_TABLES if scope == ARCHIVED_SCOPE else HOT_TABLES
 
 
-def visible_reports_for(user: Curator):
+def visible_reports_for(user: Curator, tables: TaskTables = HOT_TABLES):
     allowed_curators = allowed_recipients_base_qs(user).values('pk')
-    return (Report.objects
+    return (tables.report.objects
             .select_related('task', 'curator', 'curator__role', 'curator__department', 'curator__subject')
             .filter(curator_id__in=Subquery(allowed_curators)))
 
 
+def _visible_task_reports(user: Curator, task_id: str) -> QuerySet[Report]:
+    # Без select_related: дальше только UPDATE ... WHERE
+    allowed_curators = allowed_recipients_base_qs(user).values('pk')
+    return Report.objects.filter(task_id=task_id, curator_id__in=Subquery(allowed_curators))
+
+
+def cancel_task(user: Curator, task: Task) -> int:
+    # Отменяет отчёты видимых пользователю кураторов одним UPDATE
+    return (_visible_task_reports(user, task.id_task)
+            .exclude(status_id=CANCELLED_STATUS)
+            .update(status_id=CANCELLED_STATUS))
+
+
+def set_reports_status(user: Curator, task: Task, emails: list[str], completed: bool) -> int:
+    qs = (_visible_task_reports(user, task.id_task)
+          .filter(curator_id__in=emails)
+          .exclude(status_id=CANCELLED_STATUS))
+    if not completed:
+        return qs.update(status_id=NOT_COMPLETED_STATUS, timestamp_end=None)
+
+    now = timezone.now()
+    return qs.update(
+        status_id=COMPLETED_STATUS if now <= task.deadline else COMPLETED_LATE_STATUS,
+        timestamp_end=now,
+    )
+
+
 def task_cards_queryset(
     user: Curator, *,
     scope: str = 'all',
@@ -258,7 +607,8 @@ def task_cards_queryset(
     status: str | None = None,
     q: str | None = None,
 ):
-    rep_qs = visible_reports_for(user)
+    tables = task_tables(scope)
+    rep_qs = visible_reports_for(user, tables)
 
     rep_qs = rep_qs.filter(task__author__subject_id=user.subject_id)
 
@@ -270,16 +620,16 @@ def task_cards_queryset(
         rep_qs = rep_qs.filter(task__name__icontains=q)
 
     task_ids = rep_qs.values('task_id').distinct()
-    qs = Task.objects.filter(id_task__in=Subquery(task_ids))
+    qs = tables.task.objects.filter(id_task__in=Subquery(task_ids))
 
     visible_curators = allowed_recipients_base_qs(user).values('pk')
 
     personal_exists = Exists(
-        Assignment.objects
+        tables.assignment.objects
         .filter(task_id=OuterRef('id_task'), curator_id__in=Subquery(visible_curators))
     )
     group_exists = Exists(
-        Assignment.objects
+        tables.assignment.objects
         .filter(task_id=OuterRef('id_task'), curator_id__isnull=True)
     )
 
@@ -287,7 +637,7 @@ def task_cards_queryset(
                      _has_group=group_exists)
 
     cancelled_for_visible = rep_qs.filter(
-        task_id=OuterRef('id_task'), status_id=4)
+        task_id=OuterRef('id_task'), status_id=CANCELLED_STATUS)
     qs = qs.annotate(_has_cancelled=Exists(
         cancelled_for_visible)).filter(_has_cancelled=False)
 
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import Curator
+from .targeting import invalidate_curator_index
+
+
+@receiver(post_save, sender=Curator)
+@receiver(post_delete, sender=Curator)
+def curator_changed(sender, **kwargs):
+    invalidate_curator_index()
@@ -0,0 +1,141 @@
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+
+from umtracker.metrics import cache_lookup
+from users.models import Curator
+from users.policies import allowed_recipients_bits
+
+# Версия справочника кураторов — строка curator_index_version (миграция 0013).
+# Сигналы (tasks.signals) увеличивают её в транзакции, которая меняет куратора,
+# и индексы во всех воркерах перестраиваются при следующем обращении после коммита.
+VERSION_SQL = 'SELECT version FROM curator_index_version'
+BUMP_VERSION_SQL = 'UPDATE curator_index_version SET version = version + 1'
+
+
+def _bits(positions: list[int]) -> int:
+    if not positions:
+        return 0
+    buf = bytearray(max(positions) // 8 + 1)
+    for i in positions:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def _positions(bits: int):
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    for byte_i, byte in enumerate(raw):
+        while byte:
+            low = byte & -byte
+            yield (byte_i << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+class CuratorIndex:
+    # Кураторы пронумерованы, каждое множество — битовая маска в int
+    def __init__(self, rows: list[tuple[str, int, int, int, str | None]], version: int = 0):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.emails: list[str] = []
+        self.positions: dict[str, int] = {}
+
+        by_subject, by_department, by_role, by_mentor = (defaultdict(list) for _ in range(4))
+        for i, (email, subject_id, department_id, role_id, mail_mg) in enumerate(rows):
+            self.emails.append(email)
+            self.positions[email] = i
+            by_subject[subject_id].append(i)
+            by_department[department_id].append(i)
+            by_role[role_id].append(i)
+            if mail_mg:
+                by_mentor[mail_mg].append(i)
+
+        self.all = (1 << len(rows)) - 1
+        self.by_subject = {k: _bits(v) for k, v in by_subject.items()}
+        self.by_department = {k: _bits(v) for k, v in by_department.items()}
+        self.by_role = {k: _bits(v) for k, v in by_role.items()}
+        self.by_mentor = {k: _bits(v) for k, v in by_mentor.items()}
+
+    @classmethod
+    def build(cls, version: int = 0) -> 'CuratorIndex':
+        rows = list(Curator.objects.order_by('pk')
+                    .values_list('email', 'subject_id', 'department_id', 'role_id', 'mail_mg'))
+        return cls(rows, version)
+
+    def subject(self, subject_id) -> int:
+        return self.by_subject.get(subject_id, 0)
+
+    def department(self, department_id) -> int:
+        return self.by_department.get(department_id, 0)
+
+    def role(self, role_id) -> int:
+        return self.by_role.get(role_id, 0)
+
+    def mentor(self, email) -> int:
+        return self.by_mentor.get(email, 0)
+
+    def any_of(self, table: dict, keys) -> int:
+        bits = 0
+        for key in keys:
+            bits |= table.get(key, 0)
+        return bits
+
+    def of_emails(self, emails) -> int:
+        return _bits([self.positions[e] for e in emails if e in self.positions])
+
+    def to_emails(self, bits: int) -> list[str]:
+        return [self.emails[i] for i in _positions(bits)]
+
+    def matrix(self, bits: int) -> dict[tuple[int, int], int]:
+        # Отдел × роль: по одному пересечению масок на ячейку, без обхода кураторов
+        cells = {}
+        for department_id, dep_bits in self.by_department.items():
+            in_department = bits & dep_bits
+            if not in_department:
+                continue
+            for role_id, role_bits in self.by_role.items():
+                count = (in_department & role_bits).bit_count()
+                if count:
+                    cells[(department_id, role_id)] = count
+        return cells
+
+
+_index: CuratorIndex | None = None
+
+
+def get_curator_index() -> CuratorIndex:
+    global _index
+    with connection.cursor() as cursor:
+        cursor.execute(VERSION_SQL)
+        version = cursor.fetchone()[0]
+    stale = (_index is None or _index.version != version
+             or time.monotonic() - _index.built_at > settings.CURATOR_INDEX_TTL_S)
+    cache_lookup('curator_index', not stale)
+    if stale:
+        _index = CuratorIndex.build(version)
+    return _index
+
+
+def invalidate_curator_index():
+    with connection.cursor() as cursor:
+        cursor.execute(BUMP_VERSION_SQL)
+
+
+def target_bits(author: Curator, inp, index: CuratorIndex | None = None) -> int:
+    # Аналог build_targets_qs: inp — tasks.services.AssignmentInput
+    index = index or get_curator_index()
+    bits = allowed_recipients_bits(author, index)
+
+    if getattr(inp, 'single_email', None):
+        return bits & index.of_emails([inp.single_email])
+    if getattr(inp, 'emails', None):
+        return bits & index.of_emails(inp.emails)
+
+    if inp.subject_id:
+        bits &= index.subject(inp.subject_id)
+    if inp.department_ids:
+        bits &= index.any_of(index.by_department, inp.department_ids)
+    if inp.role_ids:
+        bits &= index.any_of(index.by_role, inp.role_ids)
+    return bits
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from catalogs.models import Department, Role, Status, Subject
+from tasks.models import Report, Task
+from users.models import Curator
+
+SUBJECT_IDS = (1, 2)
+DEPARTMENT_IDS = (1, 2, 3)
+
+
+def seed_catalogs():
+    # Справочники с теми же id, что в users.constants и tasks.constants
+    Role.objects.bulk_create([Role(id_role=i, role=f'role-{i}') for i in range(1, 10)])
+    Status.objects.bulk_create([Status(id_status=i, status=f'status-{i}') for i in range(1, 6)])
+    Subject.objects.bulk_create([Subject(id_subject=i, subject=f'subj-{i}') for i in SUBJECT_IDS])
+    Department.objects.bulk_create([Department(id_department=i, department=f'd{i}') for i in DEPARTMENT_IDS])
+
+
+def make_curator(email: str, role_id: int, subject_id: int = 1, department_id: int = 1, **extra) -> Curator:
+    extra.setdefault('confirm', True)
+    return Curator.objects.create(
+        email=email, name=email.split('@')[0], password='!',
+        subject_id=subject_id, department_id=department_id, role_id=role_id, **extra,
+    )
+
+
+def make_task(id_task: str, author: Curator, days: int = 7) -> Task:
+    return Task.objects.create(
+        id_task=id_task, deadline=timezone.now() + timedelta(days=days),
+        name=id_task, description='', report='', author=author,
+    )
+
+
+def make_report(task: Task, curator: Curator, status_id: int) -> Report:
+    return Report.objects.create(task=task, curator=curator, status_id=status_id, timestamp_start=timezone.now())
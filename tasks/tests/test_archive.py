@@ -0,0 +1,69 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from tasks.archive import archivable_count, archive_tasks
+from tasks.constants import COMPLETED_STATUS, NOT_COMPLETED_STATUS
+from tasks.models import (
+    ArchivedAssignment, ArchivedReport, ArchivedTask, Assignment, AssignmentDelivery, Report, Task,
+)
+from users.constants import ROLE_CURATOR_STANDARD, ROLE_LEADER
+
+from .fixtures import make_curator, make_report, make_task, seed_catalogs
+
+
+class ArchiveTasksTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        cls.author = make_curator('lead@test.local', ROLE_LEADER)
+        curators = [make_curator(f'c{i}@test.local', ROLE_CURATOR_STANDARD) for i in range(2)]
+        for id_task, days in (('old-1', -100), ('old-2', -60), ('fresh', 7)):
+            task = make_task(id_task, cls.author, days=days)
+            assignment = Assignment.objects.create(task=task, subject_id=1, department_id=1,
+                                                   role_id=ROLE_CURATOR_STANDARD, author=cls.author)
+            AssignmentDelivery.objects.create(assignment=assignment, task=task, status=AssignmentDelivery.STATUS_SENT)
+            make_report(task, curators[0], COMPLETED_STATUS)
+            make_report(task, curators[1], NOT_COMPLETED_STATUS)
+
+    def test_moves_rows_in_chunks(self):
+        hot_reports = {r.pk: (r.task_id, r.curator_id, r.status_id)
+                       for r in Report.objects.filter(task_id__in=['old-1', 'old-2'])}
+        self.assertEqual(archivable_count(30), 2)
+
+        result = archive_tasks(older_than_days=30, chunk_size=1)
+
+        self.assertEqual((result.tasks, result.assignments, result.reports, result.chunks), (2, 2, 4, 2))
+        self.assertEqual(list(Task.objects.values_list('pk', flat=True)), ['fresh'])
+        self.assertEqual(set(Assignment.objects.values_list('task_id', flat=True)), {'fresh'})
+        self.assertEqual(set(AssignmentDelivery.objects.values_list('task_id', flat=True)), {'fresh'})
+        self.assertEqual(Report.objects.count(), 2)
+
+        self.assertEqual(set(ArchivedTask.objects.values_list('pk', flat=True)), {'old-1', 'old-2'})
+        self.assertEqual(ArchivedAssignment.objects.count(), 2)
+        self.assertEqual({r.pk: (r.task_id, r.curator_id, r.status_id) for r in ArchivedReport.objects.all()},
+                         hot_reports)
+        self.assertTrue(all(t.archived_at for t in ArchivedTask.objects.all()))
+
+        self.assertEqual(archive_tasks(older_than_days=30, chunk_size=1).chunks, 0)
+
+    def test_max_chunks(self):
+        result = archive_tasks(older_than_days=30, chunk_size=1, max_chunks=1)
+        self.assertEqual((result.tasks, result.chunks), (1, 1))
+        # Первой уезжает задача с самым старым дедлайном
+        self.assertEqual(list(ArchivedTask.objects.values_list('pk', flat=True)), ['old-1'])
+
+    @override_settings(THROTTLE_ENABLED=False)
+    def test_archived_scope(self):
+        archive_tasks(older_than_days=30, chunk_size=10)
+        client = APIClient()
+        client.force_authenticate(self.author)
+
+        hot = client.get('/api/tasks/')
+        archived = client.get('/api/tasks/', {'scope': 'archived'})
+        self.assertEqual(hot.status_code, 200)
+        self.assertEqual([c['id'] for c in hot.data], ['fresh'])
+        self.assertEqual({c['id'] for c in archived.data}, {'old-1', 'old-2'})
+
+        self.assertEqual(client.get('/api/tasks/old-1/').status_code, 404)
+        self.assertEqual(client.get('/api/tasks/old-1/', {'scope': 'archived'}).status_code, 200)
+
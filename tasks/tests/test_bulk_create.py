@@ -0,0 +1,71 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks.models import Assignment, Report, Task
+from tasks.services import (
+    NO_TARGETS_MESSAGE, AssignmentInput, BulkTaskSpec, Recipient, create_tasks_bulk, resolve_recipients,
+)
+from users.constants import ROLE_CURATOR_STANDARD, ROLE_CURATOR_SENIOR, ROLE_LEADER
+
+from .fixtures import make_curator, seed_catalogs
+
+
+class CreateTasksBulkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        cls.author = make_curator('lead@test.local', ROLE_LEADER)
+        make_curator('c1@test.local', ROLE_CURATOR_STANDARD, department_id=1)
+        make_curator('c2@test.local', ROLE_CURATOR_STANDARD, department_id=2)
+        make_curator('c3@test.local', ROLE_CURATOR_SENIOR, department_id=2)
+
+    def _spec(self, **recipients):
+        return BulkTaskSpec(
+            author=self.author, deadline=timezone.now() + timedelta(days=3), name='Задача',
+            description='', report_template='', recipients=AssignmentInput(**recipients),
+        )
+
+    def test_counts_reports_per_task(self):
+        specs = [
+            self._spec(subject_id=1, department_ids=[1, 2], role_ids=[ROLE_CURATOR_STANDARD]),
+            self._spec(emails=['c3@test.local']),
+            self._spec(subject_id=2, department_ids=[1], role_ids=[ROLE_CURATOR_STANDARD]),
+        ]
+        result = create_tasks_bulk(specs)
+
+        self.assertEqual(result.errors, [None, None, NO_TARGETS_MESSAGE])
+        self.assertEqual(result.reports, [2, 1, 0])
+        for task, reports in zip(result.tasks[:2], result.reports):
+            self.assertEqual(Report.objects.filter(task=task).count(), reports)
+
+    def test_task_without_reports_is_rolled_back(self):
+        # Получатель пропал между выборкой и вставкой: ячейка назначения пуста
+        specs = [
+            self._spec(emails=['c1@test.local']),
+            self._spec(subject_id=2, department_ids=[3], role_ids=[ROLE_CURATOR_STANDARD]),
+        ]
+        ghost = [Recipient('gone@test.local', 2, 3, ROLE_CURATOR_STANDARD)]
+        with mock.patch('tasks.services.resolve_recipients',
+                        return_value=[resolve_recipients(specs[:1])[0], ghost]):
+            result = create_tasks_bulk(specs)
+
+        self.assertEqual(result.errors, [None, NO_TARGETS_MESSAGE])
+        self.assertIsNone(result.tasks[1])
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual({a.task_id for a in result.assignments}, {result.tasks[0].id_task})
+        self.assertEqual(Assignment.objects.exclude(task=result.tasks[0]).count(), 0)
+
+    def test_resolve_matches_build_targets_qs(self):
+        specs = [
+            self._spec(subject_id=1, department_ids=[2], role_ids=[ROLE_CURATOR_STANDARD, ROLE_CURATOR_SENIOR]),
+            self._spec(emails=['c1@test.local', 'nobody@test.local']),
+            self._spec(subject_id=1, department_ids=[2], role_ids=[ROLE_CURATOR_STANDARD, ROLE_CURATOR_SENIOR]),
+        ]
+        with self.assertNumQueries(1):
+            resolved = resolve_recipients(specs)
+        self.assertEqual([sorted(r.email for r in rs) for rs in resolved], [
+            ['c2@test.local', 'c3@test.local'], ['c1@test.local'], ['c2@test.local', 'c3@test.local'],
+        ])
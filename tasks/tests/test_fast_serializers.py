@@ -0,0 +1,60 @@
+import json
+
+from django.test import SimpleTestCase, TestCase
+from rest_framework.renderers import JSONRenderer
+
+from tasks.constants import (
+    CANCELLED_STATUS, COMPLETED_LATE_STATUS, COMPLETED_STATUS, EXCLUDE_FROM_TOTAL_STATUSES, NOT_COMPLETED_STATUS,
+)
+from tasks.fast_serializers import recipient_curators, task_cards, task_details
+from tasks.serializers import RecipientCuratorSerializer, TaskCardSerializer, TaskDetailSerializer
+from tasks.services import AssignmentInput, build_targets_qs, task_cards_queryset, visible_reports_for
+from umtracker.renderers import ORJSONRenderer
+from users.constants import ROLE_CURATOR_SENIOR, ROLE_CURATOR_STANDARD, ROLE_LEADER
+
+from .fixtures import make_curator, make_report, make_task, seed_catalogs
+
+
+class FastSerializersParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        cls.author = make_curator('lead@test.local', ROLE_LEADER)
+        curators = [
+            make_curator('a@test.local', ROLE_CURATOR_STANDARD, id_tg=1),
+            make_curator('b@test.local', ROLE_CURATOR_SENIOR, department_id=2),
+            make_curator('c@test.local', ROLE_CURATOR_STANDARD, department_id=3),
+        ]
+        statuses = (COMPLETED_STATUS, COMPLETED_LATE_STATUS, NOT_COMPLETED_STATUS)
+        for n, days in enumerate((5, -2, 1)):
+            task = make_task(f't-{n}', cls.author, days=days)
+            for curator, status_id in zip(curators, statuses[n:] + statuses[:n]):
+                make_report(task, curator, status_id)
+        make_report(make_task('t-cancelled', cls.author), curators[0], CANCELLED_STATUS)
+
+    def _assert_same(self, serializer_class, mapper, qs_factory):
+        drf = json.loads(JSONRenderer().render(serializer_class(qs_factory(), many=True).data))
+        fast = json.loads(ORJSONRenderer().render(mapper(qs_factory())))
+        self.assertTrue(drf)
+        self.assertEqual(fast, drf)
+
+    def test_task_cards(self):
+        self._assert_same(TaskCardSerializer, task_cards,
+                          lambda: task_cards_queryset(self.author).order_by('-deadline', '-id_task'))
+
+    def test_recipients(self):
+        self._assert_same(RecipientCuratorSerializer, recipient_curators,
+                          lambda: build_targets_qs(self.author, AssignmentInput())
+                          .select_related('role', 'subject', 'department').order_by('name'))
+
+    def test_task_details(self):
+        self._assert_same(TaskDetailSerializer, task_details,
+                          lambda: visible_reports_for(self.author).filter(task_id='t-0')
+                          .exclude(status_id__in=EXCLUDE_FROM_TOTAL_STATUSES)
+                          .select_related('curator', 'curator__role'))
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_matches_json_renderer(self):
+        data = {'name': 'строка\u2028с\u2029разделителями', 'n': 1, 'items': [None, True, 1.5]}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
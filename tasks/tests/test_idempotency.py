@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tasks.idempotency import IDEMPOTENCY_HEADER, REPLAYED_HEADER
+from tasks.models import IdempotencyKey, Task
+from users.constants import ROLE_CURATOR_STANDARD, ROLE_LEADER
+
+from .fixtures import make_curator, seed_catalogs
+
+
+@override_settings(THROTTLE_ENABLED=False)
+class IdempotencyKeyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        cls.author = make_curator('lead@test.local', ROLE_LEADER)
+        cls.other = make_curator('lead2@test.local', ROLE_LEADER)
+        make_curator('c1@test.local', ROLE_CURATOR_STANDARD)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def _body(self, name='Задача'):
+        return {
+            'deadline': (timezone.now() + timedelta(days=3)).isoformat(),
+            'name': name,
+            'description': 'Описание',
+            'report': 'Ссылка на результат',
+            'emails': ['c1@test.local'],
+        }
+
+    def _post(self, body, key='key-1'):
+        return self.client.post('/api/tasks/', body, format='json', headers={IDEMPOTENCY_HEADER: key})
+
+    def test_replay_returns_stored_response(self):
+        body = self._body()
+        first = self._post(body)
+        second = self._post(body)
+
+        self.assertNotIn(REPLAYED_HEADER, first)
+        self.assertEqual(second[REPLAYED_HEADER], 'true')
+        self.assertEqual(second.status_code, first.status_code)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_same_key_other_body_is_422(self):
+        self._post(self._body('Первая'))
+        response = self._post(self._body('Вторая'))
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_keys_are_per_user(self):
+        body = self._body()
+        self._post(body)
+        self.client.force_authenticate(self.other)
+        response = self._post(body)
+
+        self.assertNotIn(REPLAYED_HEADER, response)
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_expired_key_runs_again(self):
+        body = self._body()
+        self._post(body)
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(hours=25))
+        response = self._post(body)
+
+        self.assertNotIn(REPLAYED_HEADER, response)
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_without_key_not_deduplicated(self):
+        body = self._body()
+        self.client.post('/api/tasks/', body, format='json')
+        self.client.post('/api/tasks/', body, format='json')
+        self.assertEqual(Task.objects.count(), 2)
@@ -0,0 +1,64 @@
+from django.test import SimpleTestCase, TestCase
+
+from tasks.constants import CANCELLED_STATUS, COMPLETED_STATUS, NOT_COMPLETED_STATUS
+from tasks.ingest import classify_results, ingest_reports
+from tasks.models import Report, ReportSubmission
+from users.constants import ROLE_CURATOR_STANDARD, ROLE_LEADER
+
+from .fixtures import make_curator, make_report, make_task, seed_catalogs
+
+
+class ClassifyResultsTests(SimpleTestCase):
+    def test_classification(self):
+        results = [
+            {'key': 'bad', 'result': 'rejected', 'errors': {'email': ['x']}},
+            {'key': 'new', 'result': None},
+            {'key': 'seen', 'result': None},
+            {'key': 'cancelled', 'result': None},
+            {'key': 'unknown', 'result': None},
+        ]
+        classify_results(results, valid={'new', 'seen', 'cancelled'}, cancelled={'cancelled'}, fresh={'new'})
+        self.assertEqual([r['result'] for r in results], ['rejected', 'applied', 'duplicate', 'rejected', 'rejected'])
+        self.assertEqual(results[0]['errors'], {'email': ['x']})
+        self.assertEqual(results[3]['errors'], {'non_field_errors': ['Отчёт отменён.']})
+        self.assertEqual(results[4]['errors'], {'non_field_errors': ['Задача или куратор не найдены.']})
+
+
+class IngestReportsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        author = make_curator('lead@test.local', ROLE_LEADER)
+        cls.active = make_curator('a@test.local', ROLE_CURATOR_STANDARD)
+        cls.cancelled = make_curator('b@test.local', ROLE_CURATOR_STANDARD)
+        cls.task = make_task('t-1', author)
+        make_report(cls.task, cls.active, NOT_COMPLETED_STATUS)
+        make_report(cls.task, cls.cancelled, CANCELLED_STATUS)
+
+    def _item(self, key, email, status='completed', id_task='t-1'):
+        return {'key': key, 'id_task': id_task, 'email': email, 'status': status}
+
+    def test_batch_results(self):
+        out = ingest_reports([
+            self._item('k1', self.active.email),
+            self._item('k1', self.active.email),
+            self._item('k2', self.cancelled.email),
+            self._item('k3', self.active.email, id_task='missing'),
+            {'key': 'k4', 'id_task': 't-1'},
+        ])
+        self.assertEqual([r['result'] for r in out['results']],
+                         ['applied', 'duplicate', 'rejected', 'rejected', 'rejected'])
+        self.assertEqual(out['results'][2]['errors'], {'non_field_errors': ['Отчёт отменён.']})
+        self.assertEqual((out['applied'], out['duplicate'], out['rejected'], out['reports_written']), (1, 1, 3, 1))
+
+        self.assertEqual(Report.objects.get(task=self.task, curator=self.active).status_id, COMPLETED_STATUS)
+        self.assertEqual(Report.objects.get(task=self.task, curator=self.cancelled).status_id, CANCELLED_STATUS)
+        # Ключ отклонённой отправки не записывается — повтор получит тот же ответ
+        self.assertFalse(ReportSubmission.objects.filter(key='k2').exists())
+
+    def test_replay_is_duplicate(self):
+        batch = [self._item('k1', self.active.email), self._item('k2', self.cancelled.email)]
+        ingest_reports(batch)
+        out = ingest_reports(batch)
+        self.assertEqual([r['result'] for r in out['results']], ['duplicate', 'rejected'])
+        self.assertEqual(out['reports_written'], 0)
@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from tasks.constants import CANCELLED_STATUS, COMPLETED_STATUS, NOT_COMPLETED_STATUS
+from tasks.live import Subscriber, changed_cards
+from users.constants import ROLE_CURATOR_STANDARD, ROLE_MENTOR_STANDARD
+
+from .fixtures import make_curator, make_report, make_task, seed_catalogs
+
+
+# changed_cards закрывает соединения вокруг пересчёта (он идёт из потока
+# sync_to_async); внутри транзакции TestCase это оборвало бы тест
+@mock.patch('tasks.live.close_old_connections')
+class ChangedCardsVisibilityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        cls.mentor = make_curator('mentor@test.local', ROLE_MENTOR_STANDARD)
+        other = make_curator('mentor2@test.local', ROLE_MENTOR_STANDARD)
+        c0 = make_curator('c0@test.local', ROLE_CURATOR_STANDARD, mail_mg=cls.mentor.email)
+        c1 = make_curator('c1@test.local', ROLE_CURATOR_STANDARD, mail_mg=cls.mentor.email)
+        stranger = make_curator('x@test.local', ROLE_CURATOR_STANDARD, mail_mg=other.email)
+
+        visible = make_task('t-visible', cls.mentor)
+        make_report(visible, c0, COMPLETED_STATUS)
+        make_report(visible, c1, NOT_COMPLETED_STATUS)
+        make_report(visible, stranger, NOT_COMPLETED_STATUS)
+        make_report(make_task('t-foreign', other), stranger, NOT_COMPLETED_STATUS)
+        make_report(make_task('t-cancelled', cls.mentor), c0, CANCELLED_STATUS)
+
+    def test_cards_only_for_visible_reports(self, _close):
+        cards = {c['id']: c for c in changed_cards(self.mentor, {'t-visible', 't-foreign', 't-cancelled'})}
+
+        self.assertEqual(set(cards), {'t-visible', 't-cancelled'})
+        visible = cards['t-visible']
+        self.assertEqual((visible['completed'], visible['total'], visible['notCompleted']), (1, 2, 1))
+        self.assertEqual(cards['t-cancelled'], {'id': 't-cancelled', 'removed': True})
+
+    def test_foreign_task_is_silent(self, _close):
+        self.assertEqual(changed_cards(self.mentor, {'t-foreign'}), [])
+
+
+class SubscriberTests(SimpleTestCase):
+    def test_offer_skips_unchanged_cards(self):
+        sub = Subscriber(user=None)
+        card = {'id': 't-1', 'completed': 1, 'total': 2}
+        sub.offer([card])
+        sub.offer([dict(card)])
+        sub.offer([{**card, 'completed': 2}, {'id': 't-2', 'removed': True}])
+
+        batches = [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+        self.assertEqual([[c['id'] for c in batch] for batch in batches], [['t-1'], ['t-1', 't-2']])
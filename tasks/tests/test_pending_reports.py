@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from tasks.constants import NOT_COMPLETED_STATUS
+from tasks.models import Assignment, Report, Task
+from tasks.services import (
+    NO_TARGETS_MESSAGE, AssignmentInput, create_pending_reports, create_task_and_assign,
+)
+from users.constants import ROLE_CURATOR_SENIOR, ROLE_CURATOR_STANDARD, ROLE_LEADER
+
+from .fixtures import make_curator, make_task, seed_catalogs
+
+
+class PendingReportsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        cls.author = make_curator('lead@test.local', ROLE_LEADER)
+        make_curator('a1@test.local', ROLE_CURATOR_STANDARD, department_id=1)
+        make_curator('a2@test.local', ROLE_CURATOR_STANDARD, department_id=2)
+        make_curator('b1@test.local', ROLE_CURATOR_SENIOR, department_id=1)
+        make_curator('other-subject@test.local', ROLE_CURATOR_STANDARD, subject_id=2)
+
+    def _create(self, recipients):
+        task, _, _ = create_task_and_assign(
+            author=self.author, deadline=timezone.now() + timedelta(days=3), name='Задача',
+            description='', report_template='', recipients=recipients,
+        )
+        return task
+
+    def _reports(self, task):
+        return dict(Report.objects.filter(task=task).values_list('curator_id', 'status_id'))
+
+    def test_group_assignment_expands_to_cell_members(self):
+        task = self._create(AssignmentInput(
+            subject_id=1, department_ids=[1, 2], role_ids=[ROLE_CURATOR_STANDARD]))
+        self.assertEqual(self._reports(task), {
+            'a1@test.local': NOT_COMPLETED_STATUS,
+            'a2@test.local': NOT_COMPLETED_STATUS,
+        })
+
+    def test_personal_and_group_overlap_once(self):
+        task = make_task('t-1', self.author)
+        Assignment.objects.bulk_create([
+            Assignment(task=task, subject_id=1, department_id=1, role_id=ROLE_CURATOR_STANDARD, author=self.author),
+            Assignment(task=task, subject_id=1, department_id=1, role_id=ROLE_CURATOR_STANDARD,
+                       curator_id='a1@test.local', author=self.author),
+            Assignment(task=task, subject_id=1, department_id=1, role_id=ROLE_CURATOR_SENIOR,
+                       curator_id='b1@test.local', author=self.author),
+        ])
+        self.assertEqual(create_pending_reports([task.id_task]), {'t-1': 2})
+        # Повторный вызов ничего не дублирует
+        self.assertEqual(create_pending_reports([task.id_task]), {})
+        self.assertEqual(set(self._reports(task)), {'a1@test.local', 'b1@test.local'})
+
+    def test_empty_cell_rolls_back_task(self):
+        # Получатели есть, но ни один не попадает в ячейку предмет/отдел/роль
+        with self.assertRaisesMessage(ValueError, NO_TARGETS_MESSAGE):
+            self._create(AssignmentInput(subject_id=1, department_ids=[3], role_ids=[ROLE_CURATOR_STANDARD]))
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(Assignment.objects.exists())
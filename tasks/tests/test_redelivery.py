@@ -0,0 +1,123 @@
+from unittest import mock
+
+import psycopg2
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from tasks import bot_client
+from tasks.models import Assignment, AssignmentDelivery
+from tasks.services import redeliver_task
+from users.constants import ROLE_CURATOR_STANDARD, ROLE_LEADER
+
+from .fixtures import make_curator, make_task, seed_catalogs
+
+
+def _sent(assignment_ids, tg_ids=None):
+    return [{'assignment_id': a_id, 'status': 'sent', 'undelivered_tg': [], 'error': None, 'http_status': 200}
+            for a_id in assignment_ids]
+
+
+@override_settings(THROTTLE_ENABLED=False)
+class RedeliverTaskTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        cls.author = make_curator('lead@test.local', ROLE_LEADER)
+        for i in range(3):
+            make_curator(f'c{i}@test.local', ROLE_CURATOR_STANDARD, id_tg=100 + i)
+        cls.task = make_task('t-1', cls.author)
+        cls.assignments = {}
+        for label, delivery_status, undelivered in (
+            ('sent', AssignmentDelivery.STATUS_SENT, []),
+            ('partial', AssignmentDelivery.STATUS_PARTIAL, [101, 102]),
+            ('failed', AssignmentDelivery.STATUS_FAILED, []),
+        ):
+            a = Assignment.objects.create(task=cls.task, subject_id=1, department_id=1,
+                                          role_id=ROLE_CURATOR_STANDARD, author=cls.author)
+            AssignmentDelivery.objects.create(assignment=a, task=cls.task, status=delivery_status,
+                                              undelivered_tg=undelivered)
+            cls.assignments[label] = a.pk
+
+    def _redeliver(self, partial_resend: bool):
+        with mock.patch('tasks.services.BOT_PARTIAL_RESEND', partial_resend), \
+                mock.patch('tasks.services.bot_ping', return_value=True), \
+                mock.patch('tasks.services.bot_send_assignments', side_effect=_sent) as send:
+            result = redeliver_task(self.task)
+        (ids, tg_ids), = [c.args for c in send.call_args_list]
+        return result, sorted(ids), tg_ids
+
+    def test_partial_resend_sends_only_undelivered_ids(self):
+        result, ids, tg_ids = self._redeliver(partial_resend=True)
+        self.assertEqual(ids, sorted([self.assignments['partial'], self.assignments['failed']]))
+        self.assertEqual(tg_ids, {self.assignments['partial']: [101, 102]})
+        self.assertEqual(result['summary']['sent'], 2)
+        self.assertFalse(AssignmentDelivery.objects.exclude(status=AssignmentDelivery.STATUS_SENT).exists())
+
+    def test_without_flag_only_failed_are_retried(self):
+        _, ids, tg_ids = self._redeliver(partial_resend=False)
+        self.assertEqual((ids, tg_ids), ([self.assignments['failed']], {}))
+        self.assertEqual(AssignmentDelivery.objects.get(pk=self.assignments['partial']).status,
+                         AssignmentDelivery.STATUS_PARTIAL)
+
+    def test_failed_partial_retry_keeps_pending_ids(self):
+        def fail(assignment_ids, tg_ids=None):
+            return [{'assignment_id': a_id, 'status': 'failed', 'undelivered_tg': [], 'error': 'boom',
+                     'http_status': 500} for a_id in assignment_ids]
+
+        with mock.patch('tasks.services.BOT_PARTIAL_RESEND', True), \
+                mock.patch('tasks.services.bot_ping', return_value=True), \
+                mock.patch('tasks.services.bot_send_assignments', side_effect=fail):
+            redeliver_task(self.task)
+        partial = AssignmentDelivery.objects.get(pk=self.assignments['partial'])
+        self.assertEqual((partial.status, partial.undelivered_tg), (AssignmentDelivery.STATUS_PARTIAL, [101, 102]))
+
+    def test_concurrent_redeliver_gets_409(self):
+        # Блокировку держит другое соединение — как параллельный запрос
+        other = psycopg2.connect(**connection.get_connection_params())
+        try:
+            with other.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(hashtext('redeliver:' || %s))", [self.task.id_task])
+            client = APIClient()
+            client.force_authenticate(self.author)
+            with mock.patch('tasks.services.bot_send_assignments') as send:
+                resp = client.post('/api/tasks/t-1/redeliver/')
+            self.assertEqual(resp.status_code, 409)
+            send.assert_not_called()
+        finally:
+            other.close()
+
+
+class _Response:
+    def __init__(self, payload, status_code=200):
+        self.status_code = status_code
+        self.payload = payload
+        self.text = ''
+
+    def json(self):
+        if isinstance(self.payload, Exception):
+            raise self.payload
+        return self.payload
+
+
+@mock.patch('tasks.bot_client.Assignment.objects.filter')
+class BotSendAssignmentTests(SimpleTestCase):
+    def _send(self, payload, tg_ids=None, partial_resend=False):
+        with mock.patch('requests.post', return_value=_Response(payload)) as post, \
+                mock.patch('tasks.bot_client.BOT_PARTIAL_RESEND', partial_resend):
+            return bot_client.bot_send_assignment(7, tg_ids), post.call_args.kwargs['json']
+
+    def test_error_ids_are_converted(self, _filter):
+        result, _ = self._send({'errors': [101, '102']})
+        self.assertEqual((result['status'], result['undelivered_tg']), ('partially_sent', [101, 102]))
+
+    def test_bad_payload_is_bot_unavailable(self, _filter):
+        for payload in ({'errors': ['@user']}, {'errors': 'oops'}, {'errors': [True]}, [1], ValueError('not json')):
+            with self.subTest(payload=payload):
+                result, _ = self._send(payload)
+                self.assertEqual((result['status'], result['error'], result['undelivered_tg']),
+                                 ('failed', 'bot_unavailable', []))
+
+    def test_tg_ids_only_with_flag(self, _filter):
+        self.assertIsNone(self._send({}, tg_ids=[101])[1])
+        self.assertEqual(self._send({}, tg_ids=[101], partial_resend=True)[1], {'tg_ids': [101]})
@@ -0,0 +1,88 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from tasks.constants import COMPLETED_STATUS
+from tasks.models import Assignment, TaskReminder
+from tasks.reminders import claim_reminders, send_deadline_reminders
+from users.constants import ROLE_CURATOR_STANDARD, ROLE_LEADER
+
+from .fixtures import make_curator, make_report, make_task, seed_catalogs
+
+WINDOWS = [('2h', timedelta(hours=2)), ('24h', timedelta(hours=24))]
+
+
+@override_settings(TASK_REMINDER_MAX_ATTEMPTS=2, TASK_REMINDER_CLAIM_TIMEOUT_MIN=15)
+class ClaimRemindersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        author = make_curator('lead@test.local', ROLE_LEADER)
+        cls.c1 = make_curator('c1@test.local', ROLE_CURATOR_STANDARD, id_tg=101)
+        cls.c2 = make_curator('c2@test.local', ROLE_CURATOR_STANDARD, id_tg=102)
+        make_curator('no-tg@test.local', ROLE_CURATOR_STANDARD)
+        done = make_curator('done@test.local', ROLE_CURATOR_STANDARD, id_tg=104)
+        cls.task = make_task('t-1', author)
+        # Группа по ячейке и персональное назначение c1 — c1 должен прийти один раз
+        Assignment.objects.create(task=cls.task, subject_id=1, department_id=1,
+                                  role_id=ROLE_CURATOR_STANDARD, author=author)
+        Assignment.objects.create(task=cls.task, subject_id=1, department_id=1,
+                                  role_id=ROLE_CURATOR_STANDARD, curator=cls.c1, author=author)
+        make_report(cls.task, done, COMPLETED_STATUS)
+        cls.now = cls.task.deadline - timedelta(hours=1)
+
+    def _claimed(self, now=None):
+        return sorted((row[1], row[5]) for row in claim_reminders(now or self.now, WINDOWS))
+
+    def _mark(self, status, **extra):
+        TaskReminder.objects.filter(curator=self.c1).update(status=status, **extra)
+
+    def test_claims_narrowest_window_once(self):
+        self.assertEqual(self._claimed(), [(101, '2h'), (102, '2h')])
+        self.assertEqual(self._claimed(), [])
+        self.assertEqual(self._claimed(self.task.deadline - timedelta(hours=30)), [])
+
+    def test_failed_is_retried_up_to_max_attempts(self):
+        self._claimed()
+        self._mark(TaskReminder.STATUS_FAILED, error='boom')
+        self.assertEqual(self._claimed(), [(101, '2h')])
+        reminder = TaskReminder.objects.get(curator=self.c1)
+        self.assertEqual((reminder.status, reminder.attempts, reminder.error),
+                         (TaskReminder.STATUS_PENDING, 2, None))
+
+        self._mark(TaskReminder.STATUS_FAILED)
+        self.assertEqual(self._claimed(), [])
+
+    def test_stale_pending_is_reclaimed(self):
+        self._claimed()
+        self._mark(TaskReminder.STATUS_PENDING, claimed_at=self.now - timedelta(minutes=10))
+        self.assertEqual(self._claimed(), [])
+        self._mark(TaskReminder.STATUS_PENDING, claimed_at=self.now - timedelta(minutes=20))
+        self.assertEqual(self._claimed(), [(101, '2h')])
+
+    @override_settings(TASK_REMINDER_WINDOWS=['2h', '24h'])
+    def test_disabled_without_bot_support(self):
+        with mock.patch('tasks.reminders.BOT_REMINDERS', False), \
+                mock.patch('tasks.reminders.bot_ping') as ping:
+            stats = send_deadline_reminders(self.now)
+        self.assertTrue(stats['disabled'])
+        ping.assert_not_called()
+        self.assertFalse(TaskReminder.objects.exists())
+
+    @override_settings(TASK_REMINDER_WINDOWS=['2h', '24h'])
+    def test_send_records_outcomes(self):
+        def send(reminders):
+            return [{'status': 'sent', 'error': None} if r['id_tg'] == 101 else {'status': 'failed', 'error': 'blocked'}
+                    for r in reminders]
+
+        with mock.patch('tasks.reminders.BOT_REMINDERS', True), \
+                mock.patch('tasks.reminders.bot_ping', return_value=True), \
+                mock.patch('tasks.reminders.bot_send_reminders', side_effect=send):
+            stats = send_deadline_reminders(self.now)
+
+        self.assertEqual((stats['claimed'], stats['sent'], stats['failed']), (2, 1, 1))
+        self.assertEqual(dict(TaskReminder.objects.values_list('curator_id', 'status')), {
+            'c1@test.local': TaskReminder.STATUS_SENT,
+            'c2@test.local': TaskReminder.STATUS_FAILED,
+        })
@@ -0,0 +1,76 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from tasks.constants import CANCELLED_STATUS, COMPLETED_STATUS, NOT_COMPLETED_STATUS
+from tasks.models import Report
+from users.constants import ROLE_CURATOR_STANDARD, ROLE_LEADER, ROLE_MENTOR_STANDARD
+
+from .fixtures import make_curator, make_report, make_task, seed_catalogs
+
+
+@override_settings(THROTTLE_ENABLED=False)
+class ReportStatusBulkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        cls.author = make_curator('mentor@test.local', ROLE_MENTOR_STANDARD)
+        cls.other = make_curator('mentor2@test.local', ROLE_MENTOR_STANDARD)
+        cls.admin = make_curator('lead@test.local', ROLE_LEADER)
+        mentees = [make_curator(f'c{i}@test.local', ROLE_CURATOR_STANDARD, mail_mg=cls.author.email)
+                   for i in range(3)]
+        # Куратор чужого наставника: автор его отчёт не видит
+        cls.stranger = make_curator('x@test.local', ROLE_CURATOR_STANDARD, mail_mg=cls.other.email)
+        cls.task = make_task('t-1', cls.author)
+        make_report(cls.task, mentees[0], NOT_COMPLETED_STATUS)
+        make_report(cls.task, mentees[1], NOT_COMPLETED_STATUS)
+        make_report(cls.task, mentees[2], CANCELLED_STATUS)
+        make_report(cls.task, cls.stranger, NOT_COMPLETED_STATUS)
+
+    def _client(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def _statuses(self):
+        return dict(Report.objects.filter(task=self.task).values_list('curator_id', 'status_id'))
+
+    def test_set_status_skips_cancelled_and_invisible(self):
+        resp = self._client(self.author).post('/api/tasks/t-1/reports/status/', {
+            'status': 'completed',
+            'emails': ['c0@test.local', 'c2@test.local', 'x@test.local'],
+        }, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['updated'], 1)
+        self.assertEqual(self._statuses(), {
+            'c0@test.local': COMPLETED_STATUS,
+            'c1@test.local': NOT_COMPLETED_STATUS,
+            'c2@test.local': CANCELLED_STATUS,
+            'x@test.local': NOT_COMPLETED_STATUS,
+        })
+
+        resp = self._client(self.author).post('/api/tasks/t-1/reports/status/', {
+            'status': 'not_completed', 'emails': ['c0@test.local'],
+        }, format='json')
+        self.assertEqual(resp.data['updated'], 1)
+        report = Report.objects.get(task=self.task, curator_id='c0@test.local')
+        self.assertEqual((report.status_id, report.timestamp_end), (NOT_COMPLETED_STATUS, None))
+
+    def test_cancel_by_author_touches_only_visible_reports(self):
+        resp = self._client(self.author).post('/api/tasks/t-1/cancel/')
+        self.assertEqual((resp.status_code, resp.data['cancelled']), (200, 2))
+        self.assertEqual(self._statuses()['x@test.local'], NOT_COMPLETED_STATUS)
+
+    def test_admin_may_cancel_foreign_task(self):
+        resp = self._client(self.admin).post('/api/tasks/t-1/cancel/')
+        self.assertEqual((resp.status_code, resp.data['cancelled']), (200, 3))
+        self.assertEqual(set(self._statuses().values()), {CANCELLED_STATUS})
+
+    def test_other_user_gets_403(self):
+        client = self._client(self.other)
+        before = self._statuses()
+        self.assertEqual(client.post('/api/tasks/t-1/cancel/').status_code, 403)
+        resp = client.post('/api/tasks/t-1/reports/status/', {
+            'status': 'completed', 'emails': ['x@test.local'],
+        }, format='json')
+        self.assertEqual(resp.status_code, 403)
+        self.assertEqual(self._statuses(), before)
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+
+from tasks.schedules import CronSchedule
+
+MSK = ZoneInfo('Europe/Moscow')
+
+
+def _msk(*args) -> datetime:
+    return datetime(*args, tzinfo=MSK)
+
+
+class CronScheduleParseTests(SimpleTestCase):
+    def test_lists_ranges_and_steps(self):
+        s = CronSchedule('*/15 8-10 1,15 */3 1-5')
+        self.assertEqual(s.minutes, {0, 15, 30, 45})
+        self.assertEqual(s.hours, {8, 9, 10})
+        self.assertEqual(s.days, {1, 15})
+        self.assertEqual(s.months, {1, 4, 7, 10})
+        self.assertEqual(s.weekdays, {1, 2, 3, 4, 5})
+
+    def test_step_from_value_runs_to_field_end(self):
+        self.assertEqual(CronSchedule('50/5 * * * *').minutes, {50, 55})
+
+    def test_sunday_is_zero_and_seven(self):
+        self.assertEqual(CronSchedule('0 9 * * 7').weekdays, {0})
+        self.assertEqual(CronSchedule('0 9 * * 5-7').weekdays, {0, 5, 6})
+
+    def test_invalid_expressions(self):
+        for expr in ('0 9 * *', '60 * * * *', '0 24 * * *', '0 9 0 * *', '0 9 * 13 *',
+                     '0 9 * * 8', '*/0 * * * *', '10-5 * * * *', 'a * * * *'):
+            with self.subTest(expr=expr), self.assertRaises(ValueError):
+                CronSchedule(expr)
+
+
+class CronScheduleBetweenTests(SimpleTestCase):
+    def test_half_open_interval(self):
+        s = CronSchedule('0 9 * * *')
+        moments = s.between(_msk(2026, 10, 1, 9, 0), _msk(2026, 10, 3, 9, 0), MSK)
+        self.assertEqual(moments, [_msk(2026, 10, 2, 9, 0), _msk(2026, 10, 3, 9, 0)])
+
+    def test_weekdays_only(self):
+        # 2026-10-16 — пятница
+        s = CronSchedule('30 8 * * 1-5')
+        moments = s.between(_msk(2026, 10, 16), _msk(2026, 10, 20), MSK)
+        self.assertEqual(moments, [_msk(2026, 10, 16, 8, 30), _msk(2026, 10, 19, 8, 30)])
+
+    def test_day_or_weekday_when_both_restricted(self):
+        # 1-е число или понедельник, как в cron
+        s = CronSchedule('0 10 1 * 1')
+        moments = s.between(_msk(2026, 10, 30), _msk(2026, 11, 10), MSK)
+        self.assertEqual(moments, [_msk(2026, 11, 1, 10), _msk(2026, 11, 2, 10), _msk(2026, 11, 9, 10)])
+
+    def test_bounds_in_other_timezone(self):
+        s = CronSchedule('0 0 * * *')
+        after = datetime(2026, 10, 1, 20, 0, tzinfo=timezone.utc)   # 23:00 МСК
+        until = datetime(2026, 10, 1, 21, 30, tzinfo=timezone.utc)  # 00:30 МСК
+        self.assertEqual(s.between(after, until, MSK), [_msk(2026, 10, 2, 0, 0)])
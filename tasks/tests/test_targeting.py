@@ -0,0 +1,72 @@
+import random
+
+from django.test import TestCase
+
+from tasks import targeting
+from tasks.services import AssignmentInput, build_targets_qs
+from tasks.targeting import CuratorIndex, target_bits
+from users.constants import ROLE_MENTOR_PERSONAL, ROLE_MENTOR_STANDARD
+from users.models import Curator
+
+from .fixtures import DEPARTMENT_IDS, SUBJECT_IDS, make_curator, seed_catalogs
+
+INPUTS = (
+    AssignmentInput(),
+    AssignmentInput(subject_id=1),
+    AssignmentInput(subject_id=2, department_ids=[1, 3]),
+    AssignmentInput(subject_id=1, department_ids=[2], role_ids=[1, 2, 3]),
+    AssignmentInput(role_ids=[5, 6]),
+    AssignmentInput(subject_id=1, role_ids=[404]),
+)
+
+
+class CuratorIndexParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        rng = random.Random(7)
+        mentors = []
+        for i in range(120):
+            role_id = rng.randint(1, 9)
+            subject_id, department_id = rng.choice(SUBJECT_IDS), rng.choice(DEPARTMENT_IDS)
+            mail_mg = rng.choice(mentors) if mentors and rng.random() < 0.6 else None
+            c = make_curator(f'c{i:03}@test.local', role_id, subject_id, department_id, mail_mg=mail_mg)
+            if role_id in (ROLE_MENTOR_STANDARD, ROLE_MENTOR_PERSONAL):
+                mentors.append(c.email)
+
+    def test_bits_match_queryset(self):
+        index = CuratorIndex.build()
+        authors = {}
+        for c in Curator.objects.order_by('pk'):
+            authors.setdefault(c.role_id, c)
+        # Наставник со «своими» кураторами — чтобы OwnMentees не сравнивался на пустоте
+        authors['mentor'] = Curator.objects.get(pk=Curator.objects.filter(mail_mg__isnull=False)
+                                                .values('mail_mg').first()['mail_mg'])
+        emails = list(Curator.objects.order_by('pk').values_list('email', flat=True)[:5])
+        inputs = INPUTS + (AssignmentInput(emails=emails), AssignmentInput(single_email=emails[0]))
+
+        for label, author in authors.items():
+            for inp in inputs:
+                with self.subTest(author=label, inp=vars(inp)):
+                    expected = set(build_targets_qs(author, inp).values_list('email', flat=True))
+                    self.assertEqual(set(index.to_emails(target_bits(author, inp, index))), expected)
+
+    def test_matrix_counts(self):
+        index = CuratorIndex.build()
+        cells = index.matrix(index.subject(1))
+        for (department_id, role_id), count in cells.items():
+            self.assertEqual(count, Curator.objects.filter(
+                subject_id=1, department_id=department_id, role_id=role_id).count())
+        self.assertEqual(sum(cells.values()), Curator.objects.filter(subject_id=1).count())
+
+    def test_curator_change_rebuilds_index(self):
+        first = targeting.get_curator_index()
+        self.assertIs(targeting.get_curator_index(), first)
+
+        c = Curator.objects.order_by('pk').first()
+        c.subject_id = 2 if c.subject_id == 1 else 1
+        c.save()
+
+        rebuilt = targeting.get_curator_index()
+        self.assertIsNot(rebuilt, first)
+        self.assertTrue(rebuilt.subject(c.subject_id) & rebuilt.of_emails([c.email]))
@@ -0,0 +1,56 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from users.constants import ROLE_CURATOR_STANDARD, ROLE_LEADER
+from users.models import Curator
+
+from .fixtures import make_curator, seed_catalogs
+
+URL = '/api/tasks/recipients/'
+
+
+@override_settings(THROTTLE_ENABLED=False, RECIPIENTS_TYPEAHEAD_MAX_LIMIT=3)
+class RecipientsTypeaheadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        cls.author = make_curator('lead@test.local', ROLE_LEADER)
+        # Одинаковые имена — курсор должен различать их по почте
+        for email, name in (('k3', 'Ann'), ('k1', 'Ann'), ('k5', 'Bob'), ('k2', 'Ann'), ('k4', 'Bob'), ('zed', 'Zed')):
+            make_curator(f'{email}@test.local', ROLE_CURATOR_STANDARD)
+            Curator.objects.filter(email=f'{email}@test.local').update(name=name)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def _get(self, **params):
+        return self.client.get(URL, params)
+
+    def test_keyset_pages_cover_all_rows_once(self):
+        emails, cursor, pages = [], None, 0
+        while True:
+            params = {'q': 'k', 'limit': 2}
+            if cursor:
+                params['cursor'] = cursor
+            resp = self._get(**params)
+            self.assertEqual(resp.status_code, 200)
+            emails += [r['email'] for r in resp.data['results']]
+            cursor, pages = resp.data['next'], pages + 1
+            if cursor is None:
+                break
+        self.assertEqual(emails, [f'k{i}@test.local' for i in range(1, 6)])
+        self.assertEqual(pages, 3)
+
+    def test_prefix_matches_name_or_email_case_insensitive(self):
+        by_name = [r['email'] for r in self._get(q='zE').data['results']]
+        by_email = [r['email'] for r in self._get(q='K4').data['results']]
+        self.assertEqual((by_name, by_email), (['zed@test.local'], ['k4@test.local']))
+
+    def test_limit_is_clamped(self):
+        resp = self._get(q='k', limit=100)
+        self.assertEqual(len(resp.data['results']), 3)
+        self.assertIsNotNone(resp.data['next'])
+
+    def test_bad_cursor(self):
+        self.assertEqual(self._get(cursor='not-a-cursor').status_code, 400)
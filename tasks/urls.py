@@ -1,12 +1,24 @@
 from django.urls import path
 from .views import (
-    AssignmentPolicyView, AllowedRecipientsListView, TaskListCreateView, TaskDetailView, ReportDetailView
+    AssignmentPolicyView, AllowedRecipientsListView, TaskListCreateView, TaskDetailView, ReportDetailView,
+    TaskImportView, RecurringTaskListCreateView, RecurringTaskDetailView,
+    TaskCancelView, TaskRedeliverView, ReportStatusBulkView, ReportIngestView, task_events,
+    RecipientsMatrixView
 )
 
 urlpatterns = [
     path('assignment-policy/', AssignmentPolicyView.as_view(),
          name='assignment-policy-list'),
     path('recipients/', AllowedRecipientsListView.as_view(), name='tasks-recipients'),
+    path('recipients/matrix/', RecipientsMatrixView.as_view(), name='tasks-recipients-matrix'),
+    path('import/', TaskImportView.as_view(), name='tasks-import'),
+    path('events/', task_events, name='tasks-events'),
+    path('reports/ingest/', ReportIngestView.as_view(), name='reports-ingest'),
+    path('recurring/', RecurringTaskListCreateView.as_view(), name='recurring-tasks'),
+    path('recurring/<int:pk>/', RecurringTaskDetailView.as_view(), name='recurring-task-detail'),
+    path('<str:task_id>/cancel/', TaskCancelView.as_view(), name='task-cancel'),
+    path('<str:task_id>/redeliver/', TaskRedeliverView.as_view(), name='task-redeliver'),
+    path('<str:task_id>/reports/status/', ReportStatusBulkView.as_view(), name='task-reports-status'),
     path('<str:task_id>/', TaskDetailView.as_view(), name='task-detail'),
     path('reports/<str:task_id>/<str:email>/', ReportDetailView.as_view(), name='report-detail'),
     path('', TaskListCreateView.as_view(), name='tasks'),
@@ -1,22 +1,44 @@
+import asyncio
+import base64
+import binascii
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.shortcuts import get_object_or_404
-from tasks.serializers import RecipientCuratorSerializer
 from users.models import Curator
 from rest_framework import status
 from django.db.models import QuerySet
 from typing import Optional, List, Sequence
+from rest_framework import generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from users.permissions import IsConfirmedUser
-from users.constants import (
-    ADMIN_ROLE_IDS, ROLE_CURATOR_SENIOR, ROLE_CURATOR_PERSONAL,
-    ROLE_CURATOR_STANDARD, ROLE_MENTOR_PERSONAL, ROLE_MENTOR_STANDARD,
-    ROLE_CHAT_MANAGER, ROLE_OKK
+from umtracker.instrumentation import span
+from users.policies import assignment_policy_payload, policy_for
+from .services import (
+    AssignmentInput, create_task_and_assign, task_cards_queryset, visible_reports_for, build_targets_qs,
+    task_tables,
+    recipients_typeahead,
+    cancel_task, set_reports_status, redeliver_task
+)
+from .serializers import (
+    TaskCreateSerializer, ReportDetailSerializer, RecurringTaskSerializer,
+    ReportStatusUpdateSerializer
 )
-from .services import AssignmentInput, create_task_and_assign, task_cards_queryset, visible_reports_for, build_targets_qs
-from .serializers import TaskCreateSerializer, TaskCardSerializer, TaskDetailSerializer, ReportDetailSerializer
 from .constants import EXCLUDE_FROM_TOTAL_STATUSES
-from .models import Task, Report
+from .models import Task, RecurringTask
+from .imports import import_tasks, parse_csv
+from .ingest import ingest_reports
+from .live import get_hub
+from .permissions import IsBot
+from .idempotency import idempotent
+from .targeting import get_curator_index, target_bits
+from .fast_serializers import recipient_curators, task_cards, task_details
 
 
 class AssignmentPolicyView(APIView):
@@ -24,68 +46,50 @@ class AssignmentPolicyView(APIView):
 
     def get(self, request):
         u = request.user
-        role_id = getattr(getattr(u, 'role', None), 'id_role', None)
-
         if not getattr(u, 'confirm', False):
             return Response({
                 'can_assign': False,
                 'reason_if_denied': 'Ваш профиль не подтверждён, обратитесь к руководителю'
             })
+        return Response(assignment_policy_payload(u))
 
-        payload = {
-            'can_assign': True,
-            'reason_if_denied': None,
-            'can_pick_subject': False,
-            'can_pick_department': False,
-            'allowed_recipient_role_ids': [],
-            'defaults': {
-                'subject_id': u.subject_id,
-                'department_id': u.department_id,
-                'role_id': u.role_id
-            }
-        }
 
-        if role_id in ADMIN_ROLE_IDS:
-            payload.update({
-                'can_pick_subject': True,
-                'can_pick_department': True,
-                'allowed_recipient_role_ids': [1, 2, 3, 4, 5, 6],
-            })
-        elif role_id == ROLE_OKK:
-            payload.update({
-                'can_pick_subject': False,
-                'can_pick_department': False,
-                'allowed_recipient_role_ids': [ROLE_CURATOR_STANDARD, ROLE_CURATOR_SENIOR, ROLE_CURATOR_PERSONAL],
-            })
-        elif role_id == ROLE_MENTOR_STANDARD:
-            payload.update({
-                'can_pick_subject': False,
-                'can_pick_department': False,
-                'allowed_recipient_role_ids': [ROLE_CURATOR_STANDARD],
-            })
-        elif role_id == ROLE_MENTOR_PERSONAL:
-            payload.update({
-                'can_pick_subject': False,
-                'can_pick_department': False,
-                'allowed_recipient_role_ids': [ROLE_CURATOR_SENIOR, ROLE_CURATOR_PERSONAL],
-            })
-        elif role_id == ROLE_CHAT_MANAGER:
-            payload.update({
-                'can_pick_subject': False,
-                'can_pick_department': True,
-                'allowed_recipient_role_ids': [ROLE_CURATOR_STANDARD],
-            })
-        else:
-            payload.update({
-                'can_assign': False,
-                'reason_if_denied': 'Ваша роль не может назначать задачи'
-            })
+def _can_manage_task(user, task: Task) -> bool:
+    # Отменять, менять статусы отчётов и переотправлять — только автор задачи или админ
+    return task.author_id == user.pk or policy_for(user).is_admin
+
+
+def _delivery_http_status(delivery: dict, success: int = status.HTTP_201_CREATED) -> int:
+    if delivery.get('bot_unavailable'):
+        return status.HTTP_503_SERVICE_UNAVAILABLE
+    if not delivery.get('ok', False):
+        return status.HTTP_207_MULTI_STATUS
+    return success
 
-        return Response(payload)
+
+def _delivery_payload(delivery: dict) -> dict:
+    return {
+        'assignments': [
+            {
+                'assignment_id': r['assignment_id'],
+                'status': r['status'],
+                'undelivered': r.get('undelivered_names', []),
+                'error': r['error'],
+            }
+            for r in delivery.get('assignments', [])
+        ],
+        'summary': delivery.get('summary', {}),
+        'ok': delivery.get('ok'),
+        'undelivered_all': delivery.get('undelivered_names_all', []),
+        'bot_unavailable': delivery.get('bot_unavailable', False),
+    }
 
 
 class TaskListCreateView(APIView):
     permission_classes = (IsAuthenticated, IsConfirmedUser)
+    # Список — полная агрегация по отчётам, создание — рассылка по получателям
+    throttle_scope = 'heavy'
+    throttle_cost = {'GET': 10, 'POST': 5}
 
     def get(self, request):
         scope = request.query_params.get('scope', 'all')
@@ -107,8 +111,11 @@ class TaskListCreateView(APIView):
             q=q,
         ).order_by('-deadline', '-id_task')
 
-        return Response(TaskCardSerializer(qs, many=True).data, status=200)
+        with span('serialize'):
+            data = task_cards(qs)
+        return Response(data, status=200)
 
+    @idempotent('tasks.create')
     def post(self, request):
         ser = TaskCreateSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -140,33 +147,73 @@ class TaskListCreateView(APIView):
         except ValueError as e:
             return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        if delivery.get('bot_unavailable'):
-            http_status = status.HTTP_503_SERVICE_UNAVAILABLE
-        elif not delivery.get('ok', False):
-            http_status = status.HTTP_207_MULTI_STATUS
+        payload = {
+            'id_task': task.id_task,
+            **_delivery_payload(delivery),
+        }
+
+        return Response(payload, status=_delivery_http_status(delivery))
+
+
+class TaskImportView(APIView):
+    permission_classes = (IsAuthenticated, IsConfirmedUser)
+    throttle_scope = 'heavy'
+    throttle_cost = 20
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is not None:
+            try:
+                rows = parse_csv(upload.read().decode('utf-8-sig'))
+            except UnicodeDecodeError:
+                return Response({'detail': 'CSV должен быть в UTF-8'}, status=status.HTTP_400_BAD_REQUEST)
+        elif isinstance(request.data, list):
+            rows = request.data
         else:
-            http_status = status.HTTP_201_CREATED
+            rows = request.data.get('tasks')
+
+        if not isinstance(rows, list) or not rows:
+            return Response({'detail': 'Передайте список задач (JSON) или CSV-файл в поле file'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > settings.TASK_IMPORT_MAX_ROWS:
+            return Response({'detail': f'Не больше {settings.TASK_IMPORT_MAX_ROWS} задач за один импорт'},
+                            status=status.HTTP_400_BAD_REQUEST)
 
+        result = import_tasks(request.user, rows)
         payload = {
-            'id_task': task.id_task,
-            'assignments': [
-                {
-                    'assignment_id': r['assignment_id'],
-                    'status': r['status'],
-                    'undelivered': r.get('undelivered_names', []),
-                    'error': r['error'],
-                }
-                for r in delivery.get('assignments', [])
-            ],
-            'summary': delivery.get('summary', {}),
-            'ok': delivery.get('ok'),
-            'undelivered_all': delivery.get('undelivered_names_all', []),
-            'bot_unavailable': delivery.get('bot_unavailable', False),
+            'created': result['created'],
+            'errors': result['errors'],
+            **_delivery_payload(result['delivery']),
         }
 
+        if not result['created']:
+            http_status = status.HTTP_400_BAD_REQUEST
+        elif result['errors'] and not result['delivery'].get('bot_unavailable'):
+            http_status = status.HTTP_207_MULTI_STATUS
+        else:
+            http_status = _delivery_http_status(result['delivery'])
         return Response(payload, status=http_status)
 
 
+class RecurringTaskListCreateView(generics.ListCreateAPIView):
+    permission_classes = (IsAuthenticated, IsConfirmedUser)
+    serializer_class = RecurringTaskSerializer
+
+    def get_queryset(self):
+        return RecurringTask.objects.filter(author=self.request.user).order_by('-created_at')
+
+    def perform_create(self, serializer):
+        serializer.save(author=self.request.user)
+
+
+class RecurringTaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+    permission_classes = (IsAuthenticated, IsConfirmedUser)
+    serializer_class = RecurringTaskSerializer
+
+    def get_queryset(self):
+        return RecurringTask.objects.filter(author=self.request.user)
+
+
 def _to_int(val: Optional[str]) -> Optional[int]:
     if val is None or val == '':
         return None
@@ -202,6 +249,21 @@ def _to_str_list(val: Optional[str]) -> Optional[List[str]]:
     return out or None
 
 
+def _encode_cursor(row: dict) -> str:
+    raw = json.dumps([row['name'], row['email']], ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(val: str) -> Optional[tuple[str, str]]:
+    try:
+        name, email = json.loads(base64.urlsafe_b64decode(val.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+    if not isinstance(name, str) or not isinstance(email, str):
+        return None
+    return name, email
+
+
 class AllowedRecipientsListView(APIView):
     permission_classes = (IsAuthenticated, IsConfirmedUser)
 
@@ -226,41 +288,222 @@ class AllowedRecipientsListView(APIView):
             single_email=single_email,
         )
 
+        # Typeahead: ?q= (можно пустой) и/или ?cursor= — страница с продолжением вместо всего списка
+        if 'q' in request.query_params or 'cursor' in request.query_params:
+            return self._typeahead(request, author, inp)
+
         qs: QuerySet[Curator] = (
             build_targets_qs(author, inp)
             .select_related('role', 'subject', 'department')
             .order_by('name')
         )
 
-        data = RecipientCuratorSerializer(qs, many=True).data
+        with span('serialize'):
+            data = recipient_curators(qs)
         return Response(data, status=status.HTTP_200_OK)
 
+    def _typeahead(self, request, author: Curator, inp: AssignmentInput):
+        after = None
+        if request.query_params.get('cursor'):
+            after = _decode_cursor(request.query_params['cursor'])
+            if after is None:
+                return Response({'detail': 'Неверный cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+        limit = _to_int(request.query_params.get('limit')) or settings.RECIPIENTS_TYPEAHEAD_LIMIT
+        limit = max(1, min(limit, settings.RECIPIENTS_TYPEAHEAD_MAX_LIMIT))
+
+        # На одну строку больше, чтобы понять, есть ли продолжение
+        qs = recipients_typeahead(
+            author, inp,
+            q=(request.query_params.get('q') or '').strip(),
+            after=after,
+            limit=limit + 1,
+        )
+
+        with span('serialize'):
+            rows = recipient_curators(qs)
+        page = rows[:limit]
+        return Response({
+            'results': page,
+            'next': _encode_cursor(page[-1]) if len(rows) > limit else None,
+        }, status=status.HTTP_200_OK)
+
+
+class RecipientsMatrixView(APIView):
+    permission_classes = (IsAuthenticated, IsConfirmedUser)
+
+    def get(self, request):
+        author: Curator = request.user
+        subject_id = _to_int(request.query_params.get('subject_id')) or author.subject_id
+        inp = AssignmentInput(
+            subject_id=subject_id,
+            department_ids=_to_int_list(request.query_params.get('department_ids')),
+            role_ids=_to_int_list(request.query_params.get('role_ids')),
+        )
+
+        index = get_curator_index()
+        bits = target_bits(author, inp, index)
+        cells = [
+            {'department_id': department_id, 'role_id': role_id, 'count': count}
+            for (department_id, role_id), count in sorted(index.matrix(bits).items())
+        ]
+        return Response({
+            'subject_id': subject_id,
+            'total': bits.bit_count(),
+            'cells': cells,
+        }, status=status.HTTP_200_OK)
+
 
 class TaskDetailView(APIView):
     permission_classes = (IsAuthenticated, IsConfirmedUser)
 
     def get(self, request, task_id: str):
-        get_object_or_404(Task, pk=task_id)
+        tables = task_tables(request.query_params.get('scope'))
+        get_object_or_404(tables.task, pk=task_id)
 
         qs = (
-            visible_reports_for(request.user)
+            visible_reports_for(request.user, tables)
             .filter(task_id=task_id)
             .exclude(status_id__in=EXCLUDE_FROM_TOTAL_STATUSES)
             .select_related('curator', 'curator__role')
         )
 
-        data = TaskDetailSerializer(qs, many=True).data
+        with span('serialize'):
+            data = task_details(qs)
         return Response(data, status=200)
 
 
+class TaskCancelView(APIView):
+    permission_classes = (IsAuthenticated, IsConfirmedUser)
+
+    def post(self, request, task_id: str):
+        task = get_object_or_404(Task, pk=task_id)
+        if not _can_manage_task(request.user, task):
+            return Response({'detail': 'Отменить может только автор задачи'},
+                            status=status.HTTP_403_FORBIDDEN)
+        cancelled = cancel_task(request.user, task)
+        return Response({'id_task': task.id_task, 'cancelled': cancelled}, status=status.HTTP_200_OK)
+
+
+class TaskRedeliverView(APIView):
+    permission_classes = (IsAuthenticated, IsConfirmedUser)
+    throttle_scope = 'heavy'
+    throttle_cost = 5
+
+    def post(self, request, task_id: str):
+        task = get_object_or_404(Task, pk=task_id)
+        if not _can_manage_task(request.user, task):
+            return Response({'detail': 'Повторно отправить может только автор задачи'},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        delivery = redeliver_task(task)
+        if delivery is None:
+            return Response({'detail': 'Повторная отправка по этой задаче уже идёт'},
+                            status=status.HTTP_409_CONFLICT)
+        payload = {
+            'id_task': task.id_task,
+            **_delivery_payload(delivery),
+        }
+        return Response(payload, status=_delivery_http_status(delivery, success=status.HTTP_200_OK))
+
+
+class ReportStatusBulkView(APIView):
+    permission_classes = (IsAuthenticated, IsConfirmedUser)
+
+    def post(self, request, task_id: str):
+        task = get_object_or_404(Task, pk=task_id)
+        if not _can_manage_task(request.user, task):
+            return Response({'detail': 'Менять статусы отчётов может только автор задачи'},
+                            status=status.HTTP_403_FORBIDDEN)
+        ser = ReportStatusUpdateSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+
+        emails = list(dict.fromkeys(ser.validated_data['emails']))
+        updated = set_reports_status(
+            request.user, task, emails,
+            completed=ser.validated_data['status'] == 'completed',
+        )
+        return Response({
+            'id_task': task.id_task,
+            'status': ser.validated_data['status'],
+            'requested': len(emails),
+            'updated': updated,
+        }, status=status.HTTP_200_OK)
+
+
+class ReportIngestView(APIView):
+    # Вызывается ботом, а не пользователем: JWT не нужен
+    authentication_classes = ()
+    permission_classes = (IsBot,)
+    # Пакеты бота ограничены REPORT_INGEST_MAX_ITEMS; отказ терял бы отчёты
+    throttle_classes = ()
+
+    def post(self, request):
+        items = request.data if isinstance(request.data, list) else request.data.get('reports')
+        if not isinstance(items, list) or not items:
+            return Response({'detail': 'Передайте непустой список reports'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.REPORT_INGEST_MAX_ITEMS:
+            return Response({'detail': f'Не больше {settings.REPORT_INGEST_MAX_ITEMS} отчётов за пакет'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(ingest_reports(items), status=status.HTTP_200_OK)
+
+
 class ReportDetailView(APIView):
     permission_classes = (IsAuthenticated, IsConfirmedUser)
 
     def get(self, request, task_id, email):
+        tables = task_tables(request.query_params.get('scope'))
         report = get_object_or_404(
-            Report.objects.select_related('task', 'curator', 'curator__role'),
+            tables.report.objects.select_related('task', 'curator', 'curator__role'),
             task__id_task=task_id,
             curator__email=email
         )
         data = ReportDetailSerializer(report).data
         return Response(data, status=status.HTTP_200_OK)
+
+
+def _stream_user(request) -> Optional[Curator]:
+    # EventSource не умеет заголовки, поэтому токен можно передать и в ?token=
+    auth = JWTAuthentication()
+    raw = request.GET.get('token')
+    if not raw:
+        header = auth.get_header(request)
+        raw = auth.get_raw_token(header) if header else None
+    if not raw:
+        return None
+    try:
+        user = auth.get_user(auth.get_validated_token(raw))
+    except (InvalidToken, TokenError):
+        return None
+    if not getattr(user, 'confirm', False):
+        return None
+    return user
+
+
+async def task_events(request):
+    # Только под ASGI (uvicorn umtracker.asgi:application)
+    user = await sync_to_async(_stream_user)(request)
+    if user is None:
+        return JsonResponse({'detail': 'Учетные данные не были предоставлены.'}, status=401)
+
+    hub = get_hub()
+    sub = hub.subscribe(user)
+
+    async def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    cards = await asyncio.wait_for(sub.queue.get(), timeout=settings.TASK_EVENTS_HEARTBEAT_S)
+                except asyncio.TimeoutError:
+                    yield ': ping\n\n'
+                    continue
+                yield f'event: cards\ndata: {json.dumps(cards, ensure_ascii=False)}\n\n'
+        finally:
+            hub.unsubscribe(sub)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
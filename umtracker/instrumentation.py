@@ -0,0 +1,118 @@
+import json
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import observe_request
+
+logger = logging.getLogger('umtracker.requests')
+
+_current_metrics: ContextVar['RequestMetrics | None'] = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries: list[tuple[float, str, str]] = []
+        self.db_time = 0.0
+        self.spans: dict[str, float] = {}
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.db_time += duration
+            self.queries.append((duration, context['connection'].alias, sql))
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def slowest_queries(self, limit: int) -> list[tuple[float, str, str]]:
+        return sorted(self.queries, key=lambda q: q[0], reverse=True)[:limit]
+
+
+def current_metrics() -> RequestMetrics | None:
+    return _current_metrics.get()
+
+
+@contextmanager
+def span(name: str):
+    # Время участка без учёта SQL внутри него: запросы уже учтены в db
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    db_before = metrics.db_time
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start - (metrics.db_time - db_before)
+        metrics.spans[name] = metrics.spans.get(name, 0.0) + max(elapsed, 0.0)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def server_timing_header(metrics: RequestMetrics, total: float) -> str:
+    parts = [f'db;dur={_ms(metrics.db_time)};desc="{len(metrics.queries)} queries"']
+    for name, seconds in metrics.spans.items():
+        parts.append(f'{name};dur={_ms(seconds)}')
+    parts.append(f'total;dur={_ms(total)}')
+    return ', '.join(parts)
+
+
+class RequestTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(metrics.record_query))
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+
+        total = metrics.total
+        observe_request(request, response, metrics, total)
+        if settings.SERVER_TIMING_ENABLED:
+            response['Server-Timing'] = server_timing_header(metrics, total)
+        self._log(request, response, metrics, total)
+        return response
+
+    def _log(self, request, response, metrics: RequestMetrics, total: float):
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': _ms(total),
+            'db_ms': _ms(metrics.db_time),
+            'queries': len(metrics.queries),
+            **{f'{name}_ms': _ms(seconds) for name, seconds in metrics.spans.items()},
+        }
+
+        if total * 1000 < settings.SLOW_REQUEST_THRESHOLD_MS:
+            logger.info(json.dumps(record, ensure_ascii=False))
+            return
+
+        record['slow'] = True
+        record['slowest_queries'] = [
+            {'ms': _ms(duration), 'db': alias, 'sql': sql}
+            for duration, alias, sql in metrics.slowest_queries(settings.SLOW_REQUEST_LOG_QUERIES)
+        ]
+        logger.warning(json.dumps(record, ensure_ascii=False))
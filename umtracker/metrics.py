@@ -0,0 +1,121 @@
+import hmac
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+# Метрики Prometheus для GET /metrics. Под несколькими воркерами uvicorn каждый
+# процесс пишет значения в mmap-файлы каталога PROMETHEUS_MULTIPROC_DIR, а /metrics
+# любого воркера суммирует их все. Каталог задаётся переменной окружения до старта
+# и очищается перед запуском воркеров. Без неё — обычный реестр одного процесса.
+UNMATCHED_VIEW = '<unmatched>'
+
+REQUEST_SECONDS = Histogram(
+    'umtracker_http_request_duration_seconds', 'Время ответа по имени URL',
+    ('view', 'method', 'status'),
+)
+REQUEST_DB_QUERIES = Histogram(
+    'umtracker_http_request_db_queries', 'SQL-запросов на один HTTP-запрос',
+    ('view',), buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+DB_QUERY_SECONDS = Histogram(
+    'umtracker_db_query_duration_seconds', 'Время одного SQL-запроса',
+    ('view',), buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+BOT_CALL_SECONDS = Histogram(
+    'umtracker_bot_call_duration_seconds', 'Время вызова бота',
+    ('endpoint',),
+)
+BOT_CALLS = Counter(
+    'umtracker_bot_calls', 'Вызовы бота по исходу: 2xx, 4xx, 5xx или error (нет ответа)',
+    ('endpoint', 'outcome'),
+)
+BOT_DELIVERIES = Counter(
+    'umtracker_bot_deliveries', 'Итоги доставки назначений',
+    ('status',),
+)
+TASK_PHASE_SECONDS = Histogram(
+    'umtracker_task_phase_duration_seconds', 'Фазы создания задачи: targets, insert, deliver',
+    ('phase',),
+)
+CACHE_LOOKUPS = Counter(
+    'umtracker_cache_lookups', 'Обращения к кэшам процесса: hit или miss',
+    ('cache', 'result'),
+)
+
+
+def observe_request(request, response, request_metrics, total: float):
+    # Вызывается из RequestTimingMiddleware: запросы к БД он уже собрал
+    if not settings.METRICS_ENABLED:
+        return
+    match = getattr(request, 'resolver_match', None)
+    view = match.view_name if match else UNMATCHED_VIEW
+    REQUEST_SECONDS.labels(view, request.method, str(response.status_code)).observe(total)
+    REQUEST_DB_QUERIES.labels(view).observe(len(request_metrics.queries))
+    db_seconds = DB_QUERY_SECONDS.labels(view)
+    for duration, _, _ in request_metrics.queries:
+        db_seconds.observe(duration)
+
+
+class BotCall:
+    def __init__(self):
+        self.status: int | None = None
+
+
+@contextmanager
+def bot_call(endpoint: str):
+    # with bot_call('send-assignment') as call: resp = ...; call.status = resp.status_code
+    call = BotCall()
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        if settings.METRICS_ENABLED:
+            BOT_CALL_SECONDS.labels(endpoint).observe(time.perf_counter() - start)
+            outcome = f'{call.status // 100}xx' if call.status else 'error'
+            BOT_CALLS.labels(endpoint, outcome).inc()
+
+
+def observe_deliveries(summary: dict):
+    if not settings.METRICS_ENABLED:
+        return
+    for status, key in (('sent', 'sent'), ('partially_sent', 'partial'), ('failed', 'failed')):
+        if summary.get(key):
+            BOT_DELIVERIES.labels(status).inc(summary[key])
+
+
+@contextmanager
+def task_phase(phase: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if settings.METRICS_ENABLED:
+            TASK_PHASE_SECONDS.labels(phase).observe(time.perf_counter() - start)
+
+
+def cache_lookup(cache: str, hit: bool):
+    if settings.METRICS_ENABLED:
+        CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def _registry():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_view(request):
+    token = settings.METRICS_TOKEN
+    if token:
+        scheme, _, value = request.headers.get('Authorization', '').partition(' ')
+        if scheme != 'Bearer' or not hmac.compare_digest(value.strip(), token):
+            return HttpResponseForbidden()
+    return HttpResponse(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,28 @@
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Всё, что orjson не знает сам (Decimal, lazy-строки, QuerySet и т.п.), и
+# datetime — через кодировщик DRF, чтобы вывод совпадал с JSONRenderer
+_drf_default = JSONEncoder().default
+
+_LINE_SEPARATOR = '\u2028'.encode()
+_PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        ret = orjson.dumps(
+            data,
+            default=_drf_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+        # JSONRenderer экранирует U+2028/U+2029 (в JavaScript это переводы строки),
+        # orjson пишет их как есть
+        return ret.replace(_LINE_SEPARATOR, br'\u2028').replace(_PARAGRAPH_SEPARATOR, br'\u2029')
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from importlib.metadata import version
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import quote_etag
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+from .metrics import cache_lookup
+
+logger = logging.getLogger(__name__)
+
+# Схема зависит только от кода: urls, views, serializers этих пакетов
+SCHEMA_SOURCE_PACKAGES = ('umtracker', 'users', 'catalogs', 'tasks')
+
+_lock = threading.Lock()
+_fingerprint: str | None = None
+_schema: dict | None = None
+_rendered: dict[str, tuple[str, bytes]] = {}
+
+
+def code_fingerprint() -> str:
+    # Хэш исходников и версий библиотек: новый деплой с другими урлами или
+    # сериализаторами даёт другой отпечаток, и сохранённая схема не подходит
+    global _fingerprint
+    if _fingerprint is not None:
+        return _fingerprint
+
+    digest = hashlib.sha256()
+    for package in ('djangorestframework', 'drf-spectacular', 'Django'):
+        digest.update(f'{package}=={version(package)}\n'.encode())
+    digest.update(json.dumps(settings.SPECTACULAR_SETTINGS, sort_keys=True, default=str).encode())
+
+    for package in SCHEMA_SOURCE_PACKAGES:
+        root = settings.BASE_DIR / package
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in ('__pycache__', 'migrations'))
+            for name in sorted(filenames):
+                if name.endswith('.py'):
+                    path = os.path.join(dirpath, name)
+                    digest.update(os.path.relpath(path, settings.BASE_DIR).encode())
+                    with open(path, 'rb') as f:
+                        digest.update(f.read())
+
+    _fingerprint = digest.hexdigest()[:32]
+    return _fingerprint
+
+
+def generate_schema() -> dict:
+    generator = SchemaGenerator(urlconf=spectacular_settings.SERVE_URLCONF)
+    return generator.get_schema(request=None, public=True)
+
+
+def _read_schema_file(fingerprint: str) -> dict | None:
+    path = settings.OPENAPI_SCHEMA_FILE
+    try:
+        with open(path, 'rb') as f:
+            stored = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning('Не удалось прочитать %s, схема будет сгенерирована заново', path)
+        return None
+    if stored.get('fingerprint') != fingerprint:
+        return None
+    return stored.get('schema')
+
+
+def write_schema_file(schema: dict, fingerprint: str):
+    path = settings.OPENAPI_SCHEMA_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'fingerprint': fingerprint, 'schema': schema}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def get_cached_schema() -> dict:
+    # Память процесса -> файл, собранный build_openapi_schema -> генерация
+    global _schema
+    if _schema is not None:
+        cache_lookup('openapi_schema', True)
+        return _schema
+    with _lock:
+        if _schema is not None:
+            cache_lookup('openapi_schema', True)
+            return _schema
+        fingerprint = code_fingerprint()
+        schema = _read_schema_file(fingerprint)
+        # Файл, собранный build_openapi_schema, тоже считается попаданием
+        cache_lookup('openapi_schema', schema is not None)
+        if schema is None:
+            schema = generate_schema()
+            try:
+                write_schema_file(schema, fingerprint)
+            except OSError:
+                logger.warning('Не удалось сохранить схему в %s', settings.OPENAPI_SCHEMA_FILE)
+        _schema = schema
+        return _schema
+
+
+def reset_schema_cache():
+    global _fingerprint, _schema
+    with _lock:
+        _fingerprint = None
+        _schema = None
+        _rendered.clear()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    # Схема генерируется один раз на процесс (или берётся из файла), а отрендеренные
+    # JSON/YAML хранятся в памяти с ETag. ?lang= и ?version= меняют схему — их
+    # обслуживает обычный SpectacularAPIView.
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('lang') or request.GET.get('version'):
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        media_type = request.accepted_media_type
+        cached = _rendered.get(media_type)
+        if cached is None:
+            body = renderer.render(get_cached_schema(), media_type, self.get_renderer_context())
+            etag = quote_etag(f'{code_fingerprint()}-{renderer.format}')
+            cached = _rendered[media_type] = (etag, body)
+        etag, body = cached
+
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if etag in [t.strip() for t in request.headers.get('If-None-Match', '').split(',')]:
+            return HttpResponseNotModified(headers=headers)
+
+        content_type = f'{media_type}; charset={renderer.charset}' if renderer.charset else media_type
+        response = HttpResponse(body, content_type=content_type, headers=headers)
+        response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+        return response
@@ -23,11 +23,14 @@ INSTALLED_APPS = [
     "users",
     "catalogs",
     "tasks",
+    "perf",
     "drf_spectacular",
     "drf_spectacular_sidecar",
 ]
 
 MIDDLEWARE = [
+    "umtracker.instrumentation.RequestTimingMiddleware",
+    "umtracker.throttling.RateLimitHeadersMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     'corsheaders.middleware.CorsMiddleware',
@@ -74,6 +77,9 @@ DATABASES = {
 
 AUTH_USER_MODEL = 'users.Curator'
 
+# Тестовая БД: unmanaged-таблицы создаются из perf/sql/schema.sql до миграций
+TEST_RUNNER = "umtracker.test_runner.UnmanagedSchemaTestRunner"
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -91,12 +97,19 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": (
+        "umtracker.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
     ],
+    "DEFAULT_THROTTLE_CLASSES": (
+        "umtracker.throttling.TokenBucketThrottle",
+    ),
     "DEFAULT_PAGINATION_CLASS": None,
     "PAGE_SIZE": None,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
@@ -134,3 +147,80 @@ SIMPLE_JWT = {
 # ]
 
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_EXPOSE_HEADERS = ["Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Cost"]
+
+# Server-Timing и структурные логи запросов (umtracker.instrumentation)
+SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "1") == "1"
+SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get("SLOW_REQUEST_THRESHOLD_MS", "500"))
+SLOW_REQUEST_LOG_QUERIES = int(os.environ.get("SLOW_REQUEST_LOG_QUERIES", "5"))
+
+# Токен-бакеты (umtracker.throttling): ёмкость и пополнение в токенах/с на пользователя
+# и класс эндпоинтов. Ограничиваются только вью с throttle_scope; цену запроса задаёт
+# вью (throttle_cost), по умолчанию 1.
+THROTTLE_ENABLED = os.environ.get("THROTTLE_ENABLED", "1") == "1"
+THROTTLE_BUCKETS = {
+    "heavy": (int(os.environ.get("THROTTLE_HEAVY_CAPACITY", "100")),
+              float(os.environ.get("THROTTLE_HEAVY_REFILL_PER_S", "2"))),
+}
+
+# Prometheus (umtracker.metrics): GET /metrics. Под несколькими воркерами нужен
+# PROMETHEUS_MULTIPROC_DIR; при заданном METRICS_TOKEN — "Authorization: Bearer <токен>"
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+# Typeahead получателей: размер страницы по умолчанию и потолок для ?limit=
+RECIPIENTS_TYPEAHEAD_LIMIT = int(os.environ.get("RECIPIENTS_TYPEAHEAD_LIMIT", "20"))
+RECIPIENTS_TYPEAHEAD_MAX_LIMIT = int(os.environ.get("RECIPIENTS_TYPEAHEAD_MAX_LIMIT", "50"))
+
+# Битовый индекс кураторов (tasks.targeting): перестраивается по сигналам
+# сохранения куратора и не реже, чем раз в столько секунд
+CURATOR_INDEX_TTL_S = int(os.environ.get("CURATOR_INDEX_TTL_S", "300"))
+
+# Idempotency-Key для POST /api/tasks/ (tasks.idempotency)
+IDEMPOTENCY_TTL_HOURS = int(os.environ.get("IDEMPOTENCY_TTL_HOURS", "24"))
+IDEMPOTENCY_WAIT_S = float(os.environ.get("IDEMPOTENCY_WAIT_S", "30"))
+
+# Пакетный импорт задач (tasks.imports)
+TASK_IMPORT_MAX_ROWS = int(os.environ.get("TASK_IMPORT_MAX_ROWS", "500"))
+
+# Сколько пропущенных запусков повторяющейся задачи досоздавать за раз
+RECURRING_TASKS_MAX_CATCHUP = int(os.environ.get("RECURRING_TASKS_MAX_CATCHUP", "1"))
+
+# Архивация (tasks.archive): задачи с дедлайном старше стольких дней уходят
+# в *_archive пачками по TASK_ARCHIVE_CHUNK_SIZE задач на транзакцию
+TASK_ARCHIVE_AFTER_DAYS = int(os.environ.get("TASK_ARCHIVE_AFTER_DAYS", "180"))
+TASK_ARCHIVE_CHUNK_SIZE = int(os.environ.get("TASK_ARCHIVE_CHUNK_SIZE", "200"))
+
+# Окна напоминаний о дедлайне (tasks.reminders): "30m", "2h", "1d" через запятую
+TASK_REMINDER_WINDOWS = os.environ.get("TASK_REMINDER_WINDOWS", "24h,2h").split(",")
+# Неудачное напоминание повторяется, пока попыток меньше этого числа; забранное, но
+# не отмеченное за столько минут (упал процесс рассылки) — забирается заново
+TASK_REMINDER_MAX_ATTEMPTS = int(os.environ.get("TASK_REMINDER_MAX_ATTEMPTS", "3"))
+TASK_REMINDER_CLAIM_TIMEOUT_MIN = int(os.environ.get("TASK_REMINDER_CLAIM_TIMEOUT_MIN", "15"))
+
+# Приём отчётов от бота (tasks.ingest): заголовок "Authorization: Bot <токен>"
+BOT_API_TOKEN = os.environ.get("BOT_API_TOKEN")
+REPORT_INGEST_MAX_ITEMS = int(os.environ.get("REPORT_INGEST_MAX_ITEMS", "1000"))
+
+# SSE-поток изменений карточек (tasks.live), работает только под ASGI
+TASK_EVENTS_DEBOUNCE_MS = int(os.environ.get("TASK_EVENTS_DEBOUNCE_MS", "500"))
+TASK_EVENTS_HEARTBEAT_S = int(os.environ.get("TASK_EVENTS_HEARTBEAT_S", "15"))
+
+# Предсобранная OpenAPI-схема (umtracker.schema): build_openapi_schema пишет её при
+# деплое; если файла нет или код изменился — схема генерируется при первом запросе
+OPENAPI_SCHEMA_FILE = Path(os.environ.get("OPENAPI_SCHEMA_FILE", BASE_DIR / "var" / "openapi.json"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "umtracker.requests": {
+            "handlers": ["console"],
+            "level": os.environ.get("REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
@@ -0,0 +1,42 @@
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK, TEMPLATES
+
+# Профиль для воркеров: DJANGO_SETTINGS_MODULE=umtracker.settings_production.
+# API работает только на JWT, поэтому сессии, CSRF, сообщения и статика не нужны,
+# а Swagger/Redoc и так берут ассеты с CDN — sidecar не используется.
+# perf (нагрузочный стенд) в прод не ставится.
+UNUSED_APPS = (
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "drf_spectacular_sidecar",
+    "perf",
+)
+UNUSED_MIDDLEWARE = (
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    # Пользователя из JWT выставляет DRF, request.user на уровне Django не читается
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in UNUSED_APPS]
+MIDDLEWARE = [m for m in MIDDLEWARE if m not in UNUSED_MIDDLEWARE]
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+            ],
+        },
+    },
+]
+
+# Browsable API тянет формы и шаблоны на каждый ответ браузеру — в проде только JSON
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": ("umtracker.renderers.ORJSONRenderer",),
+}
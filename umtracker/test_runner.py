@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from django.db import connections
+from django.db.models.signals import pre_migrate
+from django.test.runner import DiscoverRunner
+
+# Основные таблицы (curator, task, report, ...) — unmanaged, миграции их не
+# создают, а индексы и триггеры на них ставят. Поэтому в тестовой БД схема
+# из perf/sql/schema.sql накатывается до миграций.
+SCHEMA_SQL = Path(__file__).resolve().parent.parent / 'perf' / 'sql' / 'schema.sql'
+
+
+def _create_unmanaged_schema(sender, using, **kwargs):
+    # pre_migrate приходит для каждого приложения; схема — CREATE TABLE IF NOT EXISTS
+    with connections[using].cursor() as cursor:
+        cursor.execute(SCHEMA_SQL.read_text(encoding='utf-8'))
+
+
+class UnmanagedSchemaTestRunner(DiscoverRunner):
+    def setup_databases(self, **kwargs):
+        pre_migrate.connect(_create_unmanaged_schema, dispatch_uid='unmanaged-schema')
+        try:
+            return super().setup_databases(**kwargs)
+        finally:
+            pre_migrate.disconnect(dispatch_uid='unmanaged-schema')
@@ -0,0 +1,109 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks.tests.fixtures import make_curator, seed_catalogs
+from umtracker.throttling import (
+    COST_HEADER, LIMIT_HEADER, REMAINING_HEADER, TokenBucketThrottle, purge_idle_buckets, view_cost,
+)
+from users.constants import ROLE_CURATOR_STANDARD
+
+CAPACITY, RATE = 10, 2.0
+
+
+class HeavyView:
+    throttle_scope = 'heavy'
+    throttle_cost = {'GET': 4, 'POST': 25}
+
+
+class CheapView:
+    pass
+
+
+def _buckets() -> dict[str, float]:
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT key, tokens FROM throttle_bucket')
+        return dict(cursor.fetchall())
+
+
+def _age_buckets(seconds: float):
+    with connection.cursor() as cursor:
+        cursor.execute("UPDATE throttle_bucket SET updated_at = updated_at - make_interval(secs => %s)", [seconds])
+
+
+class ViewCostTests(TestCase):
+    def test_cost_per_method(self):
+        self.assertEqual(view_cost(HeavyView(), 'GET'), 4)
+        self.assertEqual(view_cost(HeavyView(), 'DELETE'), 1)
+        self.assertEqual(view_cost(CheapView(), 'GET'), 1)
+
+
+@override_settings(THROTTLE_ENABLED=True, THROTTLE_BUCKETS={'heavy': (CAPACITY, RATE)})
+class TokenBucketThrottleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        cls.user = make_curator('a@test.local', ROLE_CURATOR_STANDARD)
+        cls.other = make_curator('b@test.local', ROLE_CURATOR_STANDARD)
+
+    def _take(self, method='GET', view=None, user=None):
+        request = Request(getattr(APIRequestFactory(), method.lower())('/'))
+        request.user = user or self.user
+        throttle = TokenBucketThrottle()
+        allowed = throttle.allow_request(request, view or HeavyView())
+        return allowed, throttle, getattr(request._request, 'rate_limit', None)
+
+    def test_spends_cost_and_sets_headers(self):
+        allowed, _, headers = self._take()
+        self.assertTrue(allowed)
+        self.assertEqual(headers, {LIMIT_HEADER: '10', REMAINING_HEADER: '6', COST_HEADER: '4'})
+
+    def test_denies_when_empty_without_spending(self):
+        self._take()
+        self._take()
+        allowed, throttle, headers = self._take()
+
+        self.assertFalse(allowed)
+        self.assertEqual(headers[REMAINING_HEADER], '2')
+        # Не хватает 2 токенов при пополнении 2/с
+        self.assertAlmostEqual(throttle.wait(), 1.0, delta=0.1)
+        self.assertAlmostEqual(_buckets()[f'heavy:u:{self.user.pk}'], 2, delta=0.2)
+
+    def test_refills_with_elapsed_time_up_to_capacity(self):
+        self._take()
+        self._take()
+        _age_buckets(1.5)
+        allowed, _, headers = self._take()
+        self.assertTrue(allowed)
+        self.assertEqual(headers[REMAINING_HEADER], '1')  # 2 + 1.5 * 2 - 4
+
+        _age_buckets(3600)
+        _, _, headers = self._take()
+        self.assertEqual(headers[REMAINING_HEADER], '6')
+
+    def test_cost_above_capacity_is_capped(self):
+        allowed, _, headers = self._take('POST')
+        self.assertTrue(allowed)
+        self.assertEqual((headers[COST_HEADER], headers[REMAINING_HEADER]), ('10', '0'))
+
+    def test_buckets_per_user(self):
+        self._take()
+        self._take(user=self.other)
+        self.assertEqual(set(_buckets()), {f'heavy:u:{self.user.pk}', f'heavy:u:{self.other.pk}'})
+
+    def test_unscoped_view_is_not_throttled(self):
+        allowed, _, headers = self._take(view=CheapView())
+        self.assertTrue(allowed)
+        self.assertIsNone(headers)
+        self.assertEqual(_buckets(), {})
+
+    def test_purge_removes_only_refilled_buckets(self):
+        self._take()
+        self._take(user=self.other)
+        with connection.cursor() as cursor:
+            # Полное пополнение — 10 / 2 = 5 с
+            cursor.execute("UPDATE throttle_bucket SET updated_at = updated_at - interval '6 seconds' "
+                           "WHERE key = %s", [f'heavy:u:{self.user.pk}'])
+        self.assertEqual(purge_idle_buckets(), 1)
+        self.assertEqual(set(_buckets()), {f'heavy:u:{self.other.pk}'})
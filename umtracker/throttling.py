@@ -0,0 +1,96 @@
+import math
+
+from django.conf import settings
+from django.db import connection
+from rest_framework.throttling import BaseThrottle
+
+# Токен-бакет на пользователя и класс эндпоинтов. Бакеты общие для всех воркеров:
+# лежат в UNLOGGED-таблице throttle_bucket (без WAL — как кэш, после сбоя просто
+# пустеет), а списание и пополнение делаются одним UPSERT, поэтому два воркера
+# не могут потратить один и тот же токен. Кэш Django по умолчанию локален для
+# процесса и атомарного «прочитать-изменить-записать» не даёт.
+#
+# Ограничиваются только дорогие вью — те, что задают класс, остальные проходят
+# без обращения к БД. Вью задаёт класс и цену запроса:
+#     throttle_scope = 'heavy'
+#     throttle_cost = {'GET': 10, 'POST': 5}   # или просто число, по умолчанию 1
+
+# Все выражения в SET видят строку до обновления, поэтому пополнение считается
+# одинаково и для проверки, и для списания
+_REFILLED = 'LEAST(%(capacity)s, b.tokens + EXTRACT(EPOCH FROM statement_timestamp() - b.updated_at) * %(rate)s)'
+TAKE_SQL = f'''
+INSERT INTO throttle_bucket AS b (key, tokens, allowed, updated_at)
+VALUES (%(key)s, %(capacity)s - %(cost)s, true, statement_timestamp())
+ON CONFLICT (key) DO UPDATE SET
+    allowed = {_REFILLED} >= %(cost)s,
+    tokens = {_REFILLED} - CASE WHEN {_REFILLED} >= %(cost)s THEN %(cost)s ELSE 0 END,
+    updated_at = statement_timestamp()
+RETURNING tokens, allowed
+'''
+
+# Бакет, не тронутый дольше полного пополнения, снова полон — удалить его то же,
+# что оставить
+PURGE_SQL = "DELETE FROM throttle_bucket WHERE updated_at < statement_timestamp() - make_interval(secs => %s)"
+
+LIMIT_HEADER = 'X-RateLimit-Limit'
+REMAINING_HEADER = 'X-RateLimit-Remaining'
+COST_HEADER = 'X-RateLimit-Cost'
+
+
+def view_cost(view, method: str) -> int:
+    cost = getattr(view, 'throttle_cost', 1)
+    if isinstance(cost, dict):
+        cost = cost.get(method, 1)
+    return cost
+
+
+class TokenBucketThrottle(BaseThrottle):
+    def allow_request(self, request, view):
+        if not settings.THROTTLE_ENABLED:
+            return True
+
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return True
+        capacity, rate = settings.THROTTLE_BUCKETS[scope]
+        # Цена выше ёмкости не прошла бы никогда
+        cost = min(view_cost(view, request.method), capacity)
+        if cost <= 0:
+            return True
+
+        user = request.user
+        ident = f'u:{user.pk}' if user and user.is_authenticated else f'ip:{self.get_ident(request)}'
+        with connection.cursor() as cursor:
+            cursor.execute(TAKE_SQL, {'key': f'{scope}:{ident}', 'capacity': capacity, 'rate': rate, 'cost': cost})
+            tokens, allowed = cursor.fetchone()
+
+        self.wait_s = None if allowed else (cost - tokens) / rate
+        # Заголовки ставит RateLimitHeadersMiddleware — у троттла нет доступа к ответу
+        request._request.rate_limit = {
+            LIMIT_HEADER: str(capacity),
+            REMAINING_HEADER: str(math.floor(tokens)),
+            COST_HEADER: str(cost),
+        }
+        return allowed
+
+    def wait(self):
+        # Retry-After из этого значения выставляет сам DRF при 429
+        return self.wait_s
+
+
+def purge_idle_buckets() -> int:
+    full_refill_s = max(capacity / rate for capacity, rate in settings.THROTTLE_BUCKETS.values())
+    with connection.cursor() as cursor:
+        cursor.execute(PURGE_SQL, [full_refill_s])
+        return cursor.rowcount
+
+
+class RateLimitHeadersMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        for name, value in getattr(request, 'rate_limit', {}).items():
+            response[name] = value
+        return response
@@ -1,15 +1,18 @@
 from django.urls import path, include
 from drf_spectacular.views import (
-    SpectacularAPIView,
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
 
+from .metrics import metrics_view
+from .schema import CachedSpectacularAPIView
+
 urlpatterns = [
+    path('metrics', metrics_view, name='metrics'),
     path('api/', include([
         path('catalogs/', include('catalogs.urls')),
         path('tasks/', include('tasks.urls')),
-        path('schema/', SpectacularAPIView.as_view(), name='schema'),
+        path('schema/', CachedSpectacularAPIView.as_view(), name='schema'),
         path('docs/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
         path('docs/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
         path('', include('users.urls'))
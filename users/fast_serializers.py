@@ -0,0 +1,46 @@
+# Быстрый путь для AdminUserSerializer (см. tasks/fast_serializers.py):
+# имена наставников — одним запросом на страницу, а не по запросу на строку.
+from django.db.models import QuerySet
+from django.db.models.functions import Lower
+
+from .policies import role_policy
+from .models import Curator
+
+ADMIN_USER_COLUMNS = (
+    'email', 'name', 'subject__subject', 'department__department', 'role__role',
+    'role_id', 'confirm', 'mail_mg',
+)
+
+
+def _str(value) -> str | None:
+    return None if value is None else str(value)
+
+
+def admin_users(qs: QuerySet) -> list[dict]:
+    rows = list(qs.values_list(*ADMIN_USER_COLUMNS))
+
+    mentor_emails = {(mail_mg or '').strip().lower() for *_, mail_mg in rows} - {''}
+    mentor_names: dict[str, str] = {}
+    if mentor_emails:
+        for email, name in (Curator.objects
+                            .annotate(email_lower=Lower('email'))
+                            .filter(email_lower__in=mentor_emails)
+                            .order_by('pk')
+                            .values_list('email_lower', 'name')):
+            # При дублях почты без учёта регистра — первый по pk, как .first() в AdminUserSerializer
+            mentor_names.setdefault(email, name)
+
+    return [
+        {
+            'email': _str(email),
+            'name': _str(name),
+            'subject': _str(subject),
+            'department': _str(department),
+            'role': _str(role),
+            'role_id': role_id,
+            'need_confirmation': not bool(confirm),
+            'mentor_name': mentor_names.get((mail_mg or '').strip().lower()),
+            'is_manager': role_policy(role_id).is_manager,
+        }
+        for email, name, subject, department, role, role_id, confirm, mail_mg in rows
+    ]
@@ -0,0 +1,31 @@
+# Таблица curator не управляется Django (managed = False), индексы
+# создаются SQL-ом без блокировки записи (см. tasks/migrations/0002).
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS curator_mail_mg_idx '
+            'ON curator (mail_mg);',
+            'DROP INDEX CONCURRENTLY IF EXISTS curator_mail_mg_idx;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS curator_subject_department_role_idx '
+            'ON curator (id_subject, id_department, id_role);',
+            'DROP INDEX CONCURRENTLY IF EXISTS curator_subject_department_role_idx;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS curator_id_tg_idx '
+            'ON curator (id_tg);',
+            'DROP INDEX CONCURRENTLY IF EXISTS curator_id_tg_idx;',
+        ),
+    ]
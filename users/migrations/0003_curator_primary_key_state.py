@@ -0,0 +1,30 @@
+# Состояние миграций расходилось с моделью: в 0001 первичным ключом был
+# id_tg, а в curator это mail. Для unmanaged-моделей autodetector изменения
+# полей не отслеживает, поэтому правим только состояние — без SQL. Нужно,
+# чтобы FK из управляемых таблиц на Curator ссылались на mail.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_curator_indexes'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='curator',
+                    name='id_tg',
+                    field=models.BigIntegerField(blank=True, db_column='id_tg', null=True),
+                ),
+                migrations.AlterField(
+                    model_name='curator',
+                    name='email',
+                    field=models.EmailField(db_column='mail', max_length=100, primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Typeahead получателей (tasks.services.recipients_typeahead): istartswith в
+# Django превращается в UPPER(col::text) LIKE UPPER('q%'), поэтому индексы —
+# по тому же выражению с text_pattern_ops (работает при любой локали БД).
+# (name, mail) — порядок выдачи и keyset-продолжение.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0003_curator_primary_key_state'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS curator_name_prefix_idx '
+            'ON curator (UPPER(name::text) text_pattern_ops);',
+            'DROP INDEX CONCURRENTLY IF EXISTS curator_name_prefix_idx;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS curator_mail_prefix_idx '
+            'ON curator (UPPER(mail::text) text_pattern_ops);',
+            'DROP INDEX CONCURRENTLY IF EXISTS curator_mail_prefix_idx;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS curator_name_mail_idx '
+            'ON curator (name, mail);',
+            'DROP INDEX CONCURRENTLY IF EXISTS curator_name_mail_idx;',
+        ),
+    ]
@@ -1,12 +1,11 @@
 from rest_framework.permissions import BasePermission
-from .constants import ADMIN_ROLE_IDS
+from .policies import policy_for
 
 
 class IsAdmin(BasePermission):
     def has_permission(self, request, view):
         user = getattr(request, 'user', None)
-        role_id = getattr(getattr(user, 'role', None), 'id_role', None)
-        return bool(user and role_id in ADMIN_ROLE_IDS)
+        return bool(user and policy_for(user).is_admin)
 
 
 class IsConfirmedUser(BasePermission):
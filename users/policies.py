@@ -0,0 +1,192 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
+from functools import reduce
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Q, QuerySet
+
+from .constants import (
+    ROLE_CHAT_MANAGER, ROLE_CURATOR_PERSONAL, ROLE_CURATOR_SENIOR, ROLE_CURATOR_STANDARD,
+    ROLE_LEADER, ROLE_MENTOR_PERSONAL, ROLE_MENTOR_STANDARD, ROLE_OKK, ROLE_SENIOR_MANAGER,
+)
+from .models import Curator
+
+# Права ролей в одной таблице POLICY_TABLE. При импорте она проверяется и
+# раскладывается в словарь role_id -> RolePolicy и производные множества, так что
+# вью, пермишены и выборки кураторов берут правило одним обращением по ключу
+# вместо цепочек if/elif.
+
+
+class RecipientScope(ABC):
+    # Кому роль назначает задачи и чьи отчёты видит: фильтр для ORM и та же
+    # выборка на масках CuratorIndex (tasks.targeting)
+    @abstractmethod
+    def q(self, author: Curator) -> Q | None:
+        # None — никого
+        ...
+
+    @abstractmethod
+    def bits(self, author: Curator, index) -> int:
+        ...
+
+
+class Everyone(RecipientScope):
+    def q(self, author):
+        return Q()
+
+    def bits(self, author, index):
+        return index.all
+
+
+class Nobody(RecipientScope):
+    def q(self, author):
+        return None
+
+    def bits(self, author, index):
+        return 0
+
+
+class OwnMentees(RecipientScope):
+    # «Свои» кураторы наставника. Роль подопечного при привязке уже проверена
+    # (mentor_role_ids), поэтому здесь только предмет, направление и связь mail_mg.
+    def q(self, author):
+        return Q(subject_id=author.subject_id, department_id=author.department_id, mail_mg=author.email)
+
+    def bits(self, author, index):
+        return index.subject(author.subject_id) & index.department(author.department_id) & index.mentor(author.email)
+
+
+@dataclass(frozen=True)
+class SubjectRoles(RecipientScope):
+    role_ids: frozenset[int]
+
+    def q(self, author):
+        return Q(subject_id=author.subject_id, role_id__in=self.role_ids)
+
+    def bits(self, author, index):
+        roles = reduce(lambda acc, role_id: acc | index.role(role_id), self.role_ids, 0)
+        return index.subject(author.subject_id) & roles
+
+
+EVERYONE = Everyone()
+NOBODY = Nobody()
+OWN_MENTEES = OwnMentees()
+
+CANNOT_ASSIGN_REASON = 'Ваша роль не может назначать задачи'
+
+
+@dataclass(frozen=True)
+class RolePolicy:
+    recipients: RecipientScope = NOBODY
+    # Роли получателей, которые форма назначения предлагает выбрать
+    recipient_role_ids: tuple[int, ...] = ()
+    can_pick_subject: bool = False
+    can_pick_department: bool = False
+    is_admin: bool = False
+    is_manager: bool = False
+    # Роли, которые могут быть наставником у этой роли
+    mentor_role_ids: frozenset[int] = frozenset()
+    # Готовая статическая часть ответа AssignmentPolicyView, заполняется при компиляции
+    assignment_payload: dict = field(default_factory=dict, compare=False)
+
+    @property
+    def can_assign(self) -> bool:
+        return bool(self.recipient_role_ids)
+
+
+_ADMIN = RolePolicy(
+    recipients=EVERYONE,
+    recipient_role_ids=(ROLE_CURATOR_STANDARD, ROLE_CURATOR_SENIOR, ROLE_CURATOR_PERSONAL,
+                        ROLE_CHAT_MANAGER, ROLE_MENTOR_STANDARD, ROLE_MENTOR_PERSONAL),
+    can_pick_subject=True,
+    can_pick_department=True,
+    is_admin=True,
+    is_manager=True,
+)
+
+POLICY_TABLE: dict[int, RolePolicy] = {
+    ROLE_LEADER: _ADMIN,
+    ROLE_SENIOR_MANAGER: _ADMIN,
+    ROLE_OKK: RolePolicy(
+        recipients=EVERYONE,
+        recipient_role_ids=(ROLE_CURATOR_STANDARD, ROLE_CURATOR_SENIOR, ROLE_CURATOR_PERSONAL),
+        is_manager=True,
+    ),
+    ROLE_MENTOR_STANDARD: RolePolicy(
+        recipients=OWN_MENTEES,
+        recipient_role_ids=(ROLE_CURATOR_STANDARD,),
+        is_manager=True,
+    ),
+    ROLE_MENTOR_PERSONAL: RolePolicy(
+        recipients=OWN_MENTEES,
+        recipient_role_ids=(ROLE_CURATOR_SENIOR, ROLE_CURATOR_PERSONAL),
+        is_manager=True,
+    ),
+    ROLE_CHAT_MANAGER: RolePolicy(
+        recipients=SubjectRoles(frozenset({ROLE_CURATOR_STANDARD})),
+        recipient_role_ids=(ROLE_CURATOR_STANDARD,),
+        can_pick_department=True,
+        is_manager=True,
+    ),
+    ROLE_CURATOR_STANDARD: RolePolicy(mentor_role_ids=frozenset({ROLE_MENTOR_STANDARD})),
+    ROLE_CURATOR_SENIOR: RolePolicy(mentor_role_ids=frozenset({ROLE_MENTOR_PERSONAL})),
+    ROLE_CURATOR_PERSONAL: RolePolicy(mentor_role_ids=frozenset({ROLE_MENTOR_PERSONAL})),
+}
+
+
+def _assignment_payload(policy: RolePolicy) -> dict:
+    return {
+        'can_assign': policy.can_assign,
+        'reason_if_denied': None if policy.can_assign else CANNOT_ASSIGN_REASON,
+        'can_pick_subject': policy.can_pick_subject,
+        'can_pick_department': policy.can_pick_department,
+        'allowed_recipient_role_ids': list(policy.recipient_role_ids),
+    }
+
+
+def compile_policies(table: dict[int, RolePolicy]) -> dict[int, RolePolicy]:
+    compiled = {}
+    for role_id, policy in table.items():
+        unknown = (set(policy.recipient_role_ids) | policy.mentor_role_ids) - table.keys()
+        if unknown:
+            raise ImproperlyConfigured(f'Политика роли {role_id} ссылается на неизвестные роли {sorted(unknown)}')
+        if policy.can_assign and policy.recipients is NOBODY:
+            raise ImproperlyConfigured(f'Роль {role_id} назначает задачи, но не видит ни одного получателя')
+        compiled[role_id] = replace(policy, assignment_payload=_assignment_payload(policy))
+    return compiled
+
+
+DENY = RolePolicy(assignment_payload=_assignment_payload(RolePolicy()))
+POLICIES = compile_policies(POLICY_TABLE)
+
+ADMIN_ROLE_IDS = frozenset(role_id for role_id, p in POLICIES.items() if p.is_admin)
+MANAGER_ROLE_IDS = frozenset(role_id for role_id, p in POLICIES.items() if p.is_manager)
+
+
+def role_policy(role_id: int | None) -> RolePolicy:
+    return POLICIES.get(role_id, DENY)
+
+
+def policy_for(user) -> RolePolicy:
+    # role_id — колонка самого куратора: роль из БД не подгружается
+    return role_policy(getattr(user, 'role_id', None))
+
+
+def allowed_recipients_base_qs(author: Curator) -> QuerySet[Curator]:
+    q = policy_for(author).recipients.q(author)
+    return Curator.objects.none() if q is None else Curator.objects.filter(q)
+
+
+def allowed_recipients_bits(author: Curator, index) -> int:
+    return policy_for(author).recipients.bits(author, index)
+
+
+def assignment_policy_payload(user: Curator) -> dict:
+    return {
+        **policy_for(user).assignment_payload,
+        'defaults': {
+            'subject_id': user.subject_id,
+            'department_id': user.department_id,
+            'role_id': user.role_id,
+        },
+    }
@@ -4,7 +4,7 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from catalogs.models import Subject, Department, Role
 from django.contrib.auth.password_validation import validate_password
-from .constants import ADMIN_ROLE_IDS, MANAGER_ROLE_IDS
+from .policies import policy_for
 
 Curator = get_user_model()
 
@@ -125,8 +125,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return parts[-1] if len(parts) > 1 else ''
 
     def get_is_admin(self, obj) -> bool:
-        role_id = getattr(getattr(obj, 'role', None), 'id_role', None)
-        return role_id in ADMIN_ROLE_IDS
+        return policy_for(obj).is_admin
 
 
 class UserProfileUpdateSerializer(serializers.ModelSerializer):
@@ -211,8 +210,7 @@ class AdminUserSerializer(serializers.ModelSerializer):
         return mentor.name if mentor else None
 
     def get_is_manager(self, obj):
-        role_id = getattr(getattr(obj, 'role', None), 'id_role', None)
-        return bool(role_id in MANAGER_ROLE_IDS)
+        return policy_for(obj).is_manager
 
 
 class ConfirmPayloadSerializer(serializers.Serializer):
@@ -0,0 +1,35 @@
+import json
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from tasks.tests.fixtures import make_curator, seed_catalogs
+from umtracker.renderers import ORJSONRenderer
+from users.constants import ROLE_CURATOR_STANDARD, ROLE_MENTOR_STANDARD
+from users.fast_serializers import admin_users
+from users.models import Curator
+from users.serializers import AdminUserSerializer
+
+
+class AdminUsersParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        # Две почты наставника, совпадающие без учёта регистра: имя берётся по первому pk.
+        # UPDATE переносит первую по pk строку в конец таблицы — без ORDER BY она бы проиграла
+        make_curator('Mentor@test.local', ROLE_MENTOR_STANDARD)
+        make_curator('mentor@test.local', ROLE_MENTOR_STANDARD)
+        first = Curator.objects.filter(email__iexact='mentor@test.local').order_by('pk').first()
+        Curator.objects.filter(pk=first.pk).update(name='первый')
+        make_curator('a@test.local', ROLE_CURATOR_STANDARD, mail_mg=' MENTOR@test.local ')
+        make_curator('b@test.local', ROLE_CURATOR_STANDARD, department_id=2, confirm=False)
+        make_curator('c@test.local', ROLE_CURATOR_STANDARD, mail_mg='gone@test.local')
+
+    def test_matches_drf(self):
+        def qs():
+            return Curator.objects.select_related('subject', 'department', 'role').order_by('confirm', 'name')
+
+        drf = json.loads(JSONRenderer().render(AdminUserSerializer(qs(), many=True).data))
+        fast = json.loads(ORJSONRenderer().render(admin_users(qs())))
+        self.assertEqual(fast, drf)
+        self.assertEqual({row['email']: row['mentor_name'] for row in fast}['a@test.local'], 'первый')
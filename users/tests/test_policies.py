@@ -0,0 +1,120 @@
+import random
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase
+
+from tasks.targeting import CuratorIndex
+from tasks.tests.fixtures import DEPARTMENT_IDS, SUBJECT_IDS, make_curator, seed_catalogs
+from users.constants import (
+    ROLE_CHAT_MANAGER, ROLE_CURATOR_PERSONAL, ROLE_CURATOR_SENIOR, ROLE_CURATOR_STANDARD,
+    ROLE_LEADER, ROLE_MENTOR_PERSONAL, ROLE_MENTOR_STANDARD, ROLE_OKK, ROLE_SENIOR_MANAGER,
+)
+from users.models import Curator
+from users.policies import (
+    ADMIN_ROLE_IDS, MANAGER_ROLE_IDS, NOBODY, POLICIES, RecipientScope, RolePolicy,
+    allowed_recipients_base_qs, allowed_recipients_bits, assignment_policy_payload, compile_policies, role_policy,
+)
+
+ALL_ROLES = (1, 2, 3, 4, 5, 6, 7, 8, 9)
+
+# Права ролей до POLICY_TABLE: множества из users.constants, ветки if/elif из
+# AssignmentPolicyView и tasks/policies.py. Таблица должна давать то же самое.
+LEGACY_ADMIN = {ROLE_LEADER, ROLE_SENIOR_MANAGER}
+LEGACY_MANAGER = {ROLE_CHAT_MANAGER, ROLE_MENTOR_STANDARD, ROLE_MENTOR_PERSONAL,
+                  ROLE_LEADER, ROLE_OKK, ROLE_SENIOR_MANAGER}
+LEGACY_MENTOR = {ROLE_MENTOR_STANDARD, ROLE_MENTOR_PERSONAL}
+LEGACY_ALLOWED_MENTORS = {
+    ROLE_CURATOR_STANDARD: {ROLE_MENTOR_STANDARD},
+    ROLE_CURATOR_SENIOR: {ROLE_MENTOR_PERSONAL},
+    ROLE_CURATOR_PERSONAL: {ROLE_MENTOR_PERSONAL},
+}
+
+
+def legacy_assignment_payload(role_id):
+    payload = {'can_assign': True, 'reason_if_denied': None, 'can_pick_subject': False,
+               'can_pick_department': False, 'allowed_recipient_role_ids': []}
+    if role_id in LEGACY_ADMIN:
+        payload.update(can_pick_subject=True, can_pick_department=True,
+                       allowed_recipient_role_ids=[1, 2, 3, 4, 5, 6])
+    elif role_id == ROLE_OKK:
+        payload.update(allowed_recipient_role_ids=[ROLE_CURATOR_STANDARD, ROLE_CURATOR_SENIOR, ROLE_CURATOR_PERSONAL])
+    elif role_id == ROLE_MENTOR_STANDARD:
+        payload.update(allowed_recipient_role_ids=[ROLE_CURATOR_STANDARD])
+    elif role_id == ROLE_MENTOR_PERSONAL:
+        payload.update(allowed_recipient_role_ids=[ROLE_CURATOR_SENIOR, ROLE_CURATOR_PERSONAL])
+    elif role_id == ROLE_CHAT_MANAGER:
+        payload.update(can_pick_department=True, allowed_recipient_role_ids=[ROLE_CURATOR_STANDARD])
+    else:
+        payload.update(can_assign=False, reason_if_denied='Ваша роль не может назначать задачи')
+    return payload
+
+
+def legacy_recipients_qs(author):
+    role_id = author.role_id
+    if role_id in LEGACY_ADMIN or role_id == ROLE_OKK:
+        return Curator.objects.all()
+    if role_id in LEGACY_MENTOR:
+        return Curator.objects.filter(subject_id=author.subject_id, department_id=author.department_id,
+                                      mail_mg=author.email)
+    if role_id == ROLE_CHAT_MANAGER:
+        return Curator.objects.filter(subject_id=author.subject_id, role_id__in=[ROLE_CURATOR_STANDARD])
+    return Curator.objects.none()
+
+
+class PolicyTableTests(SimpleTestCase):
+    def test_flags_match_legacy_sets(self):
+        self.assertEqual(ADMIN_ROLE_IDS, LEGACY_ADMIN)
+        self.assertEqual(MANAGER_ROLE_IDS, LEGACY_MANAGER)
+        for role_id in ALL_ROLES + (None, 99):
+            with self.subTest(role_id=role_id):
+                policy = role_policy(role_id)
+                self.assertEqual(policy.is_admin, role_id in LEGACY_ADMIN)
+                self.assertEqual(policy.is_manager, role_id in LEGACY_MANAGER)
+                self.assertEqual(policy.mentor_role_ids, LEGACY_ALLOWED_MENTORS.get(role_id, set()))
+
+    def test_assignment_payload_matches_legacy(self):
+        for role_id in ALL_ROLES + (None, 99):
+            with self.subTest(role_id=role_id):
+                user = Curator(email='u@test.local', subject_id=1, department_id=2, role_id=role_id)
+                self.assertEqual(assignment_policy_payload(user), {
+                    **legacy_assignment_payload(role_id),
+                    'defaults': {'subject_id': 1, 'department_id': 2, 'role_id': role_id},
+                })
+
+    def test_every_role_has_a_policy(self):
+        self.assertEqual(set(POLICIES), set(ALL_ROLES))
+
+    def test_compile_rejects_unknown_roles(self):
+        with self.assertRaises(ImproperlyConfigured):
+            compile_policies({1: RolePolicy(mentor_role_ids=frozenset({42}))})
+
+    def test_compile_rejects_assigning_without_recipients(self):
+        with self.assertRaises(ImproperlyConfigured):
+            compile_policies({1: RolePolicy(recipients=NOBODY, recipient_role_ids=(1,))})
+
+    def test_scope_is_abstract(self):
+        with self.assertRaises(TypeError):
+            RecipientScope()
+
+
+class RecipientScopeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_catalogs()
+        rng = random.Random(11)
+        mentors = []
+        for i in range(90):
+            role_id = rng.choice(ALL_ROLES)
+            mail_mg = rng.choice(mentors) if mentors and rng.random() < 0.7 else None
+            c = make_curator(f'c{i:03}@test.local', role_id, rng.choice(SUBJECT_IDS),
+                             rng.choice(DEPARTMENT_IDS), mail_mg=mail_mg)
+            if role_id in LEGACY_MENTOR:
+                mentors.append(c.email)
+
+    def test_recipients_match_legacy(self):
+        index = CuratorIndex.build()
+        for author in Curator.objects.order_by('pk'):
+            with self.subTest(author=author.email, role_id=author.role_id):
+                expected = set(legacy_recipients_qs(author).values_list('email', flat=True))
+                self.assertEqual(set(allowed_recipients_base_qs(author).values_list('email', flat=True)), expected)
+                self.assertEqual(set(index.to_emails(allowed_recipients_bits(author, index))), expected)
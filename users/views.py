@@ -3,8 +3,10 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from .models import Curator
-from .constants import ROLE_TO_ALLOWED_MENTOR_ROLE_IDS
+from .policies import role_policy
 from .permissions import IsAdmin, IsConfirmedUser
+from umtracker.instrumentation import span
+from .fast_serializers import admin_users
 from rest_framework.generics import ListAPIView
 from rest_framework import generics
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -49,6 +51,8 @@ class UserProfileUpdateView(generics.RetrieveUpdateAPIView):
 class AdminUserListView(ListAPIView):
     serializer_class = AdminUserSerializer
     permission_classes = (IsAuthenticated, IsAdmin, IsConfirmedUser)
+    throttle_scope = 'heavy'
+    throttle_cost = 5
 
     def get_queryset(self):
         qs = Curator.objects.select_related('subject', 'department', 'role').all()
@@ -58,6 +62,11 @@ class AdminUserListView(ListAPIView):
         qs = qs.order_by('confirm', 'name')
         return qs
 
+    def list(self, request, *args, **kwargs):
+        with span('serialize'):
+            data = admin_users(self.filter_queryset(self.get_queryset()))
+        return Response(data)
+
 
 class ConfirmUserView(APIView):
     permission_classes = (IsAuthenticated, IsAdmin, IsConfirmedUser)
@@ -96,16 +105,14 @@ class MentorListForAssignmentView(APIView):
             Curator.objects.select_related('role', 'department', 'subject'),
             pk=target_email
         )
-        target_role_id = getattr(
-            getattr(target, 'role', None), 'id_role', None)
+        target_role_id = target.role_id
         target_dept_id = getattr(
             getattr(target, 'department', None), 'id_department', None)
         target_subject_id = getattr(target, 'subject_id', None)
         if target_role_id is None:
             return Response({'detail': 'У целевого куратора не задана роль.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        allowed_roles = ROLE_TO_ALLOWED_MENTOR_ROLE_IDS.get(
-            target_role_id, set())
+        allowed_roles = role_policy(target_role_id).mentor_role_ids
         if not allowed_roles:
             return Response([], status=status.HTTP_200_OK)
 
@@ -142,12 +149,7 @@ class AssignMentorView(APIView):
             pk=mentor_email
         )
 
-        curator_role_id = getattr(
-            getattr(curator, 'role', None), 'id_role', None)
-        mentor_role_id = getattr(
-            getattr(mentor,  'role', None), 'id_role', None)
-        allowed = ROLE_TO_ALLOWED_MENTOR_ROLE_IDS.get(curator_role_id, set())
-        if mentor_role_id not in allowed:
+        if mentor.role_id not in role_policy(curator.role_id).mentor_role_ids:
             return Response({'detail': 'Этот наставник не подходит по роли.'}, status=status.HTTP_400_BAD_REQUEST)
 
         curator_dept_id = getattr(